@@ -0,0 +1,132 @@
+from __future__ import annotations
+import sys
+import tracemalloc
+import weakref
+from collections import Counter
+from contextlib import contextmanager
+from Plox.Environment import Environment
+from Plox.LoxFunction import LoxFunction
+from Plox.LoxInstance import LoxInstance
+from Plox.Natives import LoxArray
+from Plox.Observer import Observer
+
+BACKENDS = ('ast',)
+"""the backends telling their observer the line of the statement running, the tree-walk interpreter"""
+
+OWNED = {Environment: ('values', 'slots'), LoxFunction: (), LoxInstance: ('values',), LoxArray: ('values', 'elements')}
+"""containers created with each kind of object, their bytes are counted with it"""
+KINDS = {
+	Environment: lambda environment : 'Environment',
+	LoxFunction: lambda function : 'LoxFunction' if function.receiver is None else 'LoxFunction (bound)',
+	LoxInstance: lambda instance : f"LoxInstance {instance.klass.name}",
+	LoxArray: lambda array : f"LoxArray[{len(array.elements)}]",
+}
+"""class of the objects accounted -> the kind of an object, the site of its line is by kind"""
+
+
+class MemoryLimitError(Exception) :
+	"""Raised at the first statement run once the interpreter holds more than its limit"""
+
+
+def size(object) -> int :
+	"""bytes of the object and of the containers it was created with"""
+	bytes = sys.getsizeof(object)
+	for name in OWNED[type(object)] :
+		value = getattr(object, name)
+		if value is not None :
+			bytes += sys.getsizeof(value)
+	return bytes
+
+
+class Allocations(Observer) :
+	"""
+	Allocation accounting of the runtime objects, for plox.py --allocations and --memory-limit :
+	how many Environment, LoxFunction (bound methods apart), LoxInstance (by class) and LoxArray (by size) each line made,
+	how many of them are still alive and their bytes, as the observer of the backend
+	A weakref.finalize on each object tells when it dies
+	The memory limit is checked at each statement against the bytes traced by tracemalloc, which sees the strings too
+	"""
+	nodes = True
+
+	def __init__(self, limit: int = None, account: bool = True) -> None:
+		self.limit = limit
+		"""bytes traced since the tracking started the program may hold before it is aborted, None for no limit"""
+		self.account = account
+		"""whether the objects made are accounted by site, for the report (plox.py --allocations), else only the limit is checked"""
+		self.sites: dict[tuple[str, int | None], list[int]] = dict()
+		"""(kind, line) -> [total, live, total bytes, live bytes]"""
+		self.current: int = None
+		"""line of the statement running"""
+		self.baseline = 0
+		"""bytes traced when the tracking started"""
+		self.traced: tuple[int, int] = (0, 0)
+		"""current and peak bytes traced since the baseline, when the tracking stopped"""
+
+	def line(self, line: int | None) -> None :
+		# the memory was taken by the statement running until now
+		running = self.current if self.current != None else line
+		self.current = line
+		if self.limit != None :
+			used = tracemalloc.get_traced_memory()[0] - self.baseline
+			if used > self.limit :
+				raise MemoryLimitError(f"[line {running}] Error: memory limit of {self.limit} bytes exceeded, {used} bytes traced.")
+
+	def allocated(self, object) -> None :
+		kind = KINDS.get(type(object), None)
+		if kind == None or not self.account :
+			return
+		key = (kind(object), self.current)
+		site = self.sites.get(key, None)
+		if site == None :
+			site = self.sites[key] = [0, 0, 0, 0]
+		bytes = size(object)
+		site[0] += 1
+		site[1] += 1
+		site[2] += bytes
+		site[3] += bytes
+		weakref.finalize(object, self.released, site, bytes).atexit = False
+
+	def released(self, site: list[int], bytes: int) -> None :
+		site[1] -= 1
+		site[3] -= bytes
+
+	@contextmanager
+	def tracking(self) :
+		"""Trace the memory while in this context"""
+		started = not tracemalloc.is_tracing()
+		if started :
+			tracemalloc.start()
+		else :
+			tracemalloc.reset_peak()
+		self.baseline = tracemalloc.get_traced_memory()[0]
+		try :
+			yield
+		finally :
+			current, peak = tracemalloc.get_traced_memory()
+			self.traced = (current - self.baseline, peak - self.baseline)
+			if started :
+				tracemalloc.stop()
+
+	def report(self) -> str :
+		"""The sites, the most bytes still alive first"""
+		lines = [f"traced {self.traced[0]} bytes, peak {self.traced[1]} bytes", f"{'total':>10}{'live':>10}{'bytes':>12}{'live bytes':>12}  line  kind"]
+		for (kind, line), (total, live, bytes, liveBytes) in sorted(self.sites.items(), key=lambda item: (item[1][3], item[1][2]), reverse=True) :
+			lines.append(f"{total:>10}{live:>10}{bytes:>12}{liveBytes:>12}  {'-' if line == None else line:>4}  {kind}")
+		return '\n'.join(lines)
+
+	def heapSummary(self, top: int = 10) -> str :
+		"""The objects alive by kind, and while tracing the Python lines holding the most memory"""
+		live = Counter()
+		liveBytes = Counter()
+		for (kind, _), site in self.sites.items() :
+			live[kind] += site[1]
+			liveBytes[kind] += site[3]
+		lines = [f"{'live':>10}{'live bytes':>12}  kind"]
+		lines.extend(f"{live[kind]:>10}{bytes:>12}  {kind}" for kind, bytes in liveBytes.most_common() if live[kind])
+		if tracemalloc.is_tracing() :
+			current, peak = tracemalloc.get_traced_memory()
+			lines.append(f"traced {current - self.baseline} bytes, peak {peak - self.baseline} bytes")
+			# without the memory of the accounting itself
+			snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, __file__)])
+			lines.extend(f"  {statistic}" for statistic in snapshot.statistics('lineno')[:top])
+		return '\n'.join(lines)
\ No newline at end of file
@@ -0,0 +1,73 @@
+from __future__ import annotations
+import hashlib
+import os
+import pickle
+import sys
+import Plox.Stmt as Stmt
+
+MAGIC = b'PLOX'
+
+FRONT_END = ('Token.py', 'TokenBuffer.py', 'Scanner.py', 'Parser.py', 'Expr.py', 'Stmt.py', 'AstResolver.py')
+"""modules whose code decides what the resolved trees are, a change in any of them invalidates the cache"""
+
+
+def interpreterVersion(modules: tuple[str, ...] = FRONT_END) -> bytes :
+	"""Digest of the Python version and of the code of the modules (file names in the Plox package)"""
+	digest = hashlib.blake2b(repr(sys.version_info[:2]).encode(), digest_size=16)
+	directory = os.path.dirname(__file__)
+	for name in modules :
+		with open(os.path.join(directory, name), 'rb') as file :
+			digest.update(file.read())
+	return digest.digest()
+
+
+class AstCache :
+	"""
+	Cache of the resolved syntax trees of the source files, like the .pyc files of Python :
+	__loxcache__/<name>.pickle next to the source holds a header (MAGIC, the interpreter version, the digest of the source)
+	followed by the pickled statements, later runs with the same source and interpreter skip scanning, parsing and resolving
+	Unpickling runs code, so the cache is only used when asked for (plox.py --cache), for files whose directory is trusted
+	"""
+	def __init__(self) -> None:
+		self.version: bytes = None
+		"""interpreterVersion(), computed at the first use"""
+		self.hits = 0
+		self.misses = 0
+
+	def path(self, filename: str) -> str :
+		directory, name = os.path.split(os.path.abspath(filename))
+		return os.path.join(directory, '__loxcache__', name + '.pickle')
+
+	def header(self, source: str) -> bytes :
+		if self.version == None :
+			self.version = interpreterVersion()
+		return MAGIC + self.version + hashlib.blake2b(source.encode(), digest_size=16).digest()
+
+	def load(self, filename: str, source: str) -> list[Stmt.Stmt] | None :
+		"""The cached statements of the file, None when there are none for this source and this interpreter"""
+		header = self.header(source)
+		try :
+			with open(self.path(filename), 'rb') as file :
+				if file.read(len(header)) == header :
+					statements = pickle.load(file)
+					self.hits += 1
+					return statements
+		except Exception :
+			# any file which can't be unpickled is a miss, the source is parsed again
+			pass
+		self.misses += 1
+		return None
+
+	def store(self, filename: str, source: str, statements: list[Stmt.Stmt]) -> None :
+		"""Write the resolved statements of the file, a cache which can't be written is not an error"""
+		path = self.path(filename)
+		try :
+			data = self.header(source) + pickle.dumps(statements, pickle.HIGHEST_PROTOCOL)
+			os.makedirs(os.path.dirname(path), exist_ok=True)
+			# written aside then renamed, so a concurrent run never reads half a file
+			temporary = f"{path}.{os.getpid()}"
+			with open(temporary, 'wb') as file :
+				file.write(data)
+			os.replace(temporary, path)
+		except (OSError, pickle.PicklingError, RecursionError) :
+			pass
\ No newline at end of file
@@ -1,253 +1,452 @@
-from __future__ import annotations
-import Plox.Expr as Expr 
-import Plox.Stmt as Stmt
-from Plox.Environment import Environment
-from Plox.Natives import globals
-from Plox.LoxCallable import LoxCallable
-from Plox.LoxFunction import LoxFunction
-from Plox.LoxClass import LoxClass 
-from Plox.LoxInstance import LoxInstance
-from Plox.Return import Return
-from Plox.Token import Token
-
-from Plox.ErrorHandling import ErrorHandling
-
-class AstInterpreter(Expr.Visitor, Stmt.Visitor) :
-	"""
- 	Walk the tree to interpret each node
-  	"""
-	def __init__(self, error_handler :ErrorHandling, locals: dict[Expr.Expr, int], env=Environment(), is_a_test=False) -> None:
-		self.env = env
-		self.error_handler = error_handler
-		self.locals = locals
-		self.is_a_test = is_a_test
-		self.printed : list[str] = []
-		
-	def interpret(self, statements: list[Stmt.Stmt] | Expr.Expr) :
-		try :
-			if type(statements) == list :
-					for statement in statements :
-						self.execute(statement)
-			else :
-				return self.evaluate(statements)
-		except Exception as e :
-			self.error_handler.error(ori='astInterpreter', message=e)
-						
-	def executeBlock(self, statements: list[Stmt.Stmt], env: Environment) :
-		previous = self.env
-		try :
-			self.env = env
-			
-			for statement in statements :
-				self.execute(statement)
-		finally :
-			self.env = previous
-	
-	def execute(self, stmt: Stmt.Expression) :
-		return stmt.accept(self)
-	
-	def evaluate(self, expr: Expr.Expr | Stmt.Expression) -> object:
-		tmp = expr.accept(self)
-		return tmp
-	# Expressions
-	
-	def visitBinary(self, expr : Expr.Binary) :
-		left = self.evaluate(expr.left)
-		right = self.evaluate(expr.right)
-		if expr.operator.type == 'PLUS' :
-			return left + right
-		if expr.operator.type == 'MINUS' :
-			return left - right
-		if expr.operator.type == 'STAR' :
-			return left * right
-		if expr.operator.type == 'SLASH' :
-			return left / right
-		if expr.operator.type == 'GREATER' :
-			return left > right
-		if expr.operator.type == 'GREATER_EQUAL' :
-			return left >= right
-		if expr.operator.type == 'LESS' :
-			return left < right
-		if expr.operator.type == 'LESS_EQUAL' :
-			return left <= right
-		if expr.operator.type == 'EQUAL_EQUAL' :
-			return left == right
-		if expr.operator.type == 'BANG_EQUAL' :
-			return left != right
-		return None
-	
-	def visitLogicalExpr(self, expr : Expr.Logical) :
-		"""With a dimnamiccaly typed language , we just return the object 
-		, then their truthiness will be evaluated"""
-		left = self.evaluate(expr.left)
-		if expr.operator.type == 'OR' and self.isTruthy(left) :
-			return left
-		if expr.operator.type == 'AND' and not self.isTruthy(left) :
-			return left
-
-		return self.evaluate(expr.right) 
-	
-	def visitLiteral(self, expr : Expr.Literal) :
-		return expr.value 
-	
-	def visitUnary(self, expr : Expr.Unary) :
-		right = self.evaluate(expr.right)
-		if expr.operator.type == 'MINUS' :
-			return -right
-		if expr.operator.type == 'BANG' :
-			return -self.isTruthy(right)
-		return None
-	
-	def isTruthy(self, object: any) -> bool:
-		if object == None :
-			return False
-		if type(object) == type(True) :
-			return object
-		return True
-	
-	def visitCall(self, expr : Expr.Call) :  
-		callee: LoxCallable = self.evaluate(expr.callee)
-		arguments = []
-		for argument in expr.arguments :      
-			arguments.append(self.evaluate(argument))
-			
-		function : LoxCallable  = callee
-
-		if len(arguments) != function.arity() :
-			raise RuntimeError(expr.paren, f"Expected \
-					{function.arity()} arguments but got \
-					{len(arguments)} .")
-
-		return function.call(self, arguments)
-	
-	def visitSuper(self, expr: Expr.Super):
-		distance = self.locals[expr]
-		superclass: LoxClass = self.env.getAt(distance, "super")
-		obj: LoxInstance = self.env.getAt(distance - 1, "this")
-		method = superclass.findMethod(expr.method.lexeme)  
-		
-		if method == None :
-			raise RuntimeError(expr.method, "Undefined property '" + expr.method.lexeme + "'.")
-		
-		return method.bind(obj)
-		
-	def visitThis(self, expr: Expr.This) :
-		return self.lookUpVariable(expr.keyword, expr)
-	
-	def visitGet(self, expr : Expr.Get) :
-		object = self.evaluate(expr.object)
-		
-		if isinstance(object, LoxInstance) :
-			return object.get(expr.token)
-		
-		raise RuntimeError(expr.token, "Only intances have properties.")
-			
-	def visitSet(self, expr : Expr.Set) :
-		object = self.evaluate(expr.object)
-		
-		if not isinstance(object, LoxInstance) :
-			raise RuntimeError(expr.token, "Only intances have fields.")
-		value = self.evaluate(expr.value)
-		object.set(expr.token, value)
-		return value
-			
-	def visitGrouping(self, expr : Expr.Grouping) :
-		return self.evaluate(expr.expression)
-	
-	def visitVariableExpr(self, expr : Expr.Variable) :
-		tmp = self.lookUpVariable(expr.token, expr)
-		return tmp
-	
-	def lookUpVariable(self, token : Token, expr: Expr.Expr) :
-		distance = self.locals.get(expr, None)
-		if distance != None :
-			return self.env.getAt(distance, token.lexeme)
-		else :
-			return globals.get(token)
-		
-	def visitAssignExpr(self, expr: Expr.Assign) :
-		value = self.evaluate(expr.expr)
-		distance = self.locals.get(expr, None)
-		if distance != None :
-			self.env.assignAt(distance, expr.token, value)
-		else :
-			self.env.assign(expr.token, value)
-		return value
-	
-	
-	# Statements
-	
-	def visitFunctionStmt(self, stmt: Stmt.Function) :
-		function = LoxFunction(stmt, self.env)
-		self.env.define(stmt.token.lexeme, function)
-		
-		return None
-	
-	def visitExpressionStmt(self, stmt : Stmt.Expression) :
-		self.evaluate(stmt.expression)
-		return None
-	
-	def visitIfStmt(self, stmt: Stmt.If):
-		if self.isTruthy(self.evaluate(stmt.condition)) :
-			self.execute(stmt.thenBranch)
-		elif stmt.elseBranch != None :
-			self.execute(stmt.elseBranch)
-		return None
-	
-	def visitWhileStmt(self, stmt: Stmt.While) :
-		while self.isTruthy(self.evaluate(stmt.condition)) :
-			self.execute(stmt.body)
-		return None
-	
-	def visitReturnStmt(self, stmt: Stmt.Return) :
-		value = None
-		if stmt.value != None:
-			value = self.evaluate(stmt.value)
-		
-		# raise to return stuff wherever in a function
-		raise Return(value)
-	
-	def visitPrintStmt(self, stmt : Stmt.Print) :
-		if self.is_a_test :
-			self.printed.append(self.evaluate(stmt.expression))
-		else :
-			print(self.evaluate(stmt.expression))
-		return None
-	
-	def visitBlockStmt(self, stmt: Stmt.Block):
-		self.executeBlock(stmt.statements, Environment(enclosing=self.env))
-		return None
-	
-	def visitClassStmt(self, stmt : Stmt.Class) :
-		superClass = None
-		
-		if stmt.superClass != None :
-			superClass = self.evaluate(stmt.superClass)
-			if not isinstance(superClass, LoxClass) :
-				raise RuntimeError("SuperClass must be a class")
-		
-		self.env.define(stmt.token.lexeme, None)
-		
-		if stmt.superClass != None :
-			self.env = Environment(self.env)
-			self.env.define("super", superClass)
-		 
-		methods : dict[str, LoxFunction] = dict()
-		for method in stmt.methods :
-			isInitializer = method.token.lexeme == 'this'
-			methods[method.token.lexeme] = LoxFunction(method, self.env, isInitializer) 
-			
-		klass = LoxClass(stmt.token.lexeme, superClass, methods)
-		
-		if stmt.superClass != None :
-			self.env = self.env.enclosing
-			
-		self.env.assign(stmt.token, klass)
-			
-		return None
-		
-	def visitVarStmt(self, stmt: Stmt.Var) :
-		value = None
-		if stmt.initializer != None :
-			value = self.evaluate(stmt.initializer)
+from __future__ import annotations
+import Plox.Expr as Expr 
+import Plox.Stmt as Stmt
+from Plox.Environment import Environment
+from Plox.Natives import globals
+from Plox.LoxCallable import LoxCallable
+from Plox.LoxFunction import LoxFunction
+from Plox.LoxClass import LoxClass 
+from Plox.LoxInstance import LoxInstance
+from Plox.Return import Return
+from Plox.Token import Token
+
+from Plox.ErrorHandling import ErrorHandling
+from Plox.Observer import Observer
+
+MAX_POLYMORPHIC = 4
+"""number of classes an inline cache holds before the site is megamorphic and stops caching"""
+MISSING = object()
+
+class AstInterpreter(Expr.Visitor, Stmt.Visitor) :
+	"""
+ 	Walk the tree to interpret each node
+  	"""
+	def __init__(self, error_handler :ErrorHandling, env=Environment(), is_a_test=False) -> None:
+		self.env = env
+		self.error_handler = error_handler
+		self.is_a_test = is_a_test
+		self.printed : list[str] = []
+		self.specializationStats = {'specialized': 0, 'deoptimized': 0, 'generic': 0}
+		"""number of Binary sites which specialized, fell back from a specialization, or saw operands with no specialization"""
+		self.inlineCacheStats = {'monomorphic': 0, 'polymorphic': 0, 'megamorphic': 0}
+		"""number of Get and Call sites whose inline cache saw one class, up to MAX_POLYMORPHIC classes, or more"""
+		self.observer: Observer = None
+		"""told the calls and the runtime objects made, by an instrumentation (plox.py --stats, --profile...), None when off"""
+		self.line: int = None
+		"""line of the statement running, kept only for an observer of the nodes"""
+	
+	def observeNodes(self) -> None :
+		"""
+		Tell the observer the statements, expressions and property receivers too, for the observers wanting the nodes
+		The observed visitors are set on this instance only, the methods of the class stay bare for the interpreters without one
+		"""
+		self.execute = self.observedExecute
+		self.evaluate = self.observedEvaluate
+		self.visitSpecializedBinary = self.observedSpecializedBinary
+		self.getProperty = self.observedGetProperty
+		self.findMethod = self.observedFindMethod
+		
+	def interpret(self, statements: list[Stmt.Stmt] | Expr.Expr) :
+		try :
+			if type(statements) == list :
+					for statement in statements :
+						if self.execute(statement) != None :
+							# a return at the top level ends the program
+							break
+			else :
+				return self.evaluate(statements)
+		except Exception as e :
+			self.error_handler.error(ori='astInterpreter', message=e)
+						
+	def executeBlock(self, statements: list[Stmt.Stmt], env: Environment) :
+		previous = self.env
+		try :
+			self.env = env
+			
+			for statement in statements :
+				completion = self.execute(statement)
+				if completion is not None :
+					return completion
+			return None
+		finally :
+			self.env = previous
+	
+	def execute(self, stmt: Stmt.Expression) :
+		return stmt.accept(self)
+	
+	def observedExecute(self, stmt: Stmt.Stmt) :
+		"""execute(), telling the observer the statement and its line"""
+		observer = self.observer
+		line = getattr(stmt, 'line', None)
+		if line == None :
+			observer.visit(stmt)
+			return stmt.accept(self)
+		previous = self.line
+		self.line = line
+		observer.line(line)
+		try :
+			observer.visit(stmt)
+			return stmt.accept(self)
+		finally :
+			self.line = previous
+			observer.line(previous)
+	
+	def evaluate(self, expr: Expr.Expr | Stmt.Expression) -> object:
+		return expr.accept(self)
+	
+	def observedEvaluate(self, expr: Expr.Expr | Stmt.Expression) -> object:
+		self.observer.visit(expr)
+		return expr.accept(self)
+	# Expressions
+	
+	def visitBinary(self, expr : Expr.Binary) :
+		left = self.evaluate(expr.left)
+		right = self.evaluate(expr.right)
+		if expr.specializable :
+			self.specialize(expr, left, right)
+		return self.binaryOperation(expr.operator.type, left, right)
+	
+	def specialize(self, expr : Expr.Binary, left, right) :
+		"""Rewrite the node for the type of its operands, if they share one with a specialization"""
+		specialization = None
+		if type(left) == type(right) :
+			specialization = Expr.SPECIALIZED_BINARIES.get((expr.operator.type, type(left)), None)
+		if specialization == None :
+			expr.specializable = False
+			self.specializationStats['generic'] += 1
+			return
+		expr.__class__ = specialization
+		self.specializationStats['specialized'] += 1
+	
+	def visitSpecializedBinary(self, expr : Expr.SpecializedBinary) :
+		left = expr.left.accept(self)
+		right = expr.right.accept(self)
+		if type(left) is expr.operandType and type(right) is expr.operandType :
+			return expr.operation(left, right)
+		return self.deoptimize(expr, left, right)
+	
+	def observedSpecializedBinary(self, expr : Expr.SpecializedBinary) :
+		# the operands are told to the observer, as any expression
+		left = self.evaluate(expr.left)
+		right = self.evaluate(expr.right)
+		if type(left) is expr.operandType and type(right) is expr.operandType :
+			return expr.operation(left, right)
+		return self.deoptimize(expr, left, right)
+	
+	def deoptimize(self, expr : Expr.SpecializedBinary, left, right) :
+		"""The guard failed : back to the generic node, for good"""
+		expr.__class__ = Expr.Binary
+		expr.specializable = False
+		self.specializationStats['deoptimized'] += 1
+		return self.binaryOperation(expr.operator.type, left, right)
+	
+	def binaryOperation(self, operatorType : str, left, right) :
+		if operatorType == 'PLUS' :
+			return left + right
+		if operatorType == 'MINUS' :
+			return left - right
+		if operatorType == 'STAR' :
+			return left * right
+		if operatorType == 'SLASH' :
+			return left / right
+		if operatorType == 'GREATER' :
+			return left > right
+		if operatorType == 'GREATER_EQUAL' :
+			return left >= right
+		if operatorType == 'LESS' :
+			return left < right
+		if operatorType == 'LESS_EQUAL' :
+			return left <= right
+		if operatorType == 'EQUAL_EQUAL' :
+			return left == right
+		if operatorType == 'BANG_EQUAL' :
+			return left != right
+		return None
+	
+	def visitLogicalExpr(self, expr : Expr.Logical) :
+		"""With a dimnamiccaly typed language , we just return the object 
+		, then their truthiness will be evaluated"""
+		left = self.evaluate(expr.left)
+		if expr.operator.type == 'OR' and self.isTruthy(left) :
+			return left
+		if expr.operator.type == 'AND' and not self.isTruthy(left) :
+			return left
+
+		return self.evaluate(expr.right) 
+	
+	def visitLiteral(self, expr : Expr.Literal) :
+		return expr.value 
+	
+	def visitUnary(self, expr : Expr.Unary) :
+		right = self.evaluate(expr.right)
+		if expr.operator.type == 'MINUS' :
+			return -right
+		if expr.operator.type == 'BANG' :
+			return -self.isTruthy(right)
+		return None
+	
+	def isTruthy(self, object: any) -> bool:
+		if object == None :
+			return False
+		if type(object) == type(True) :
+			return object
+		return True
+	
+	def visitCall(self, expr : Expr.Call) :  
+		callee: LoxCallable = self.evaluate(expr.callee)
+		arguments = []
+		for argument in expr.arguments :      
+			arguments.append(self.evaluate(argument))
+		return self.callValue(expr, callee, arguments)
+	
+	def callValue(self, expr : Expr.Call, callee : LoxCallable, arguments : list) :
+		if type(callee) == LoxClass :
+			# LoxClass.call, with the initializer lookup going through the inline cache
+			initializer = self.findMethod(expr, callee, "init")
+			if len(arguments) == (initializer.arity() if initializer != None else 0) :
+				instance = LoxInstance(callee)
+				if self.observer is not None :
+					self.observer.allocated(instance)
+				if initializer != None :
+					initializer.callMethod(self, instance, arguments)
+				return instance
+
+		function : LoxCallable  = callee
+
+		if len(arguments) != function.arity() :
+			raise RuntimeError(expr.paren, f"Expected \
+					{function.arity()} arguments but got \
+					{len(arguments)} .")
+
+		return function.call(self, arguments)
+	
+	def visitInvoke(self, expr : Expr.Invoke) :
+		get: Expr.Get = expr.callee
+		object = self.evaluate(get.object)
+		if type(object) != LoxInstance or get.token.lexeme in object.shape.indices :
+			# a native instance, or a field holding a function : call the value of the property
+			callee = self.getProperty(get, object)
+			return self.callValue(expr, callee, [self.evaluate(argument) for argument in expr.arguments])
+		
+		method = self.findMethod(get, object.klass, get.token.lexeme)
+		if method == None :
+			raise RuntimeError(get.token, f"Undefined Property '{get.token.lexeme}'")
+		arguments = [self.evaluate(argument) for argument in expr.arguments]
+		if len(arguments) != len(method.declaration.params) :
+			return self.callValue(expr, method, arguments)
+		return method.callMethod(self, object, arguments)
+	
+	def visitSuper(self, expr: Expr.Super):
+		superclass: LoxClass = self.env.getAt(expr.depth, expr.slot)
+		# 'this' is the first variable of the method scope, just inside the 'super' one
+		obj: LoxInstance = self.env.getAt(expr.depth - 1, 0)
+		method = superclass.findMethod(expr.method.lexeme)  
+		
+		if method == None :
+			raise RuntimeError(expr.method, "Undefined property '" + expr.method.lexeme + "'.")
+		
+		method = method.bind(obj)
+		if self.observer is not None :
+			self.observer.allocated(method)
+		return method
+		
+	def visitThis(self, expr: Expr.This) :
+		return self.lookUpVariable(expr.keyword, expr)
+	
+	def visitGet(self, expr : Expr.Get) :
+		return self.getProperty(expr, self.evaluate(expr.object))
+	
+	def observedGetProperty(self, expr : Expr.Get, object) :
+		self.observer.receiver(expr, type(object) if type(object) != LoxInstance else object.klass)
+		return AstInterpreter.getProperty(self, expr, object)
+	
+	def getProperty(self, expr : Expr.Get, object) :
+		if type(object) == LoxInstance :
+			# LoxInstance.get, with the field index and the method lookup going through the inline caches
+			shape = object.shape
+			if shape is expr.shape :
+				return object.values[expr.index]
+			index = shape.indices.get(expr.token.lexeme, None)
+			if index != None :
+				expr.shape = shape
+				expr.index = index
+				return object.values[index]
+			method = self.findMethod(expr, object.klass, expr.token.lexeme)
+			if method != None :
+				method = method.bind(object)
+				if self.observer is not None :
+					self.observer.allocated(method)
+				return method
+			raise RuntimeError(expr.token, f"Undefined Property '{expr.token.lexeme}'")
+		if isinstance(object, LoxInstance) :
+			return object.get(expr.token)
+		
+		raise RuntimeError(expr.token, "Only intances have properties.")
+			
+	def observedFindMethod(self, expr : Expr.Get | Expr.Call, klass : LoxClass, name : str) :
+		# a method called on an instance (Expr.Invoke) is looked up without reading the property
+		if type(expr) == Expr.Get :
+			self.observer.receiver(expr, klass)
+		return AstInterpreter.findMethod(self, expr, klass, name)
+	
+	def findMethod(self, expr : Expr.Get | Expr.Call, klass : LoxClass, name : str) :
+		"""
+		klass.findMethod(name), cached on the node by class identity
+		A class never changes once created, so the entries are never invalidated
+		"""
+		cache = expr.cache
+		if cache != None :
+			method = cache.get(klass, MISSING)
+			if method is not MISSING :
+				return method
+		method = klass.findMethod(name)
+		if cache != None :
+			stats = self.inlineCacheStats
+			if len(cache) == 0 :
+				stats['monomorphic'] += 1
+			elif len(cache) == 1 :
+				stats['monomorphic'] -= 1
+				stats['polymorphic'] += 1
+			elif len(cache) == MAX_POLYMORPHIC :
+				stats['polymorphic'] -= 1
+				stats['megamorphic'] += 1
+				expr.cache = None
+				return method
+			cache[klass] = method
+		return method
+	
+	def visitSet(self, expr : Expr.Set) :
+		object = self.evaluate(expr.object)
+		
+		if not isinstance(object, LoxInstance) :
+			raise RuntimeError(expr.token, "Only intances have fields.")
+		value = self.evaluate(expr.value)
+		if type(object) != LoxInstance :
+			object.set(expr.token, value)
+			return value
+		# the shape is read once the value is evaluated, which may have added fields
+		shape = object.shape
+		if shape is expr.shape :
+			if expr.transition is None :
+				object.values[expr.index] = value
+			else :
+				object.shape = expr.transition
+				object.values.append(value)
+			return value
+		object.set(expr.token, value)
+		expr.shape = shape
+		expr.index = object.shape.indices[expr.token.lexeme]
+		expr.transition = object.shape if object.shape is not shape else None
+		return value
+			
+	def visitGrouping(self, expr : Expr.Grouping) :
+		return self.evaluate(expr.expression)
+	
+	def visitVariableExpr(self, expr : Expr.Variable) :
+		return self.lookUpVariable(expr.token, expr)
+	
+	def lookUpVariable(self, token : Token, expr: Expr.Variable | Expr.This) :
+		if expr.depth is not None :
+			return self.env.getAt(expr.depth, expr.slot)
+		else :
+			return globals.get(token)
+		
+	def visitAssignExpr(self, expr: Expr.Assign) :
+		value = self.evaluate(expr.expr)
+		if expr.depth is not None :
+			self.env.assignAt(expr.depth, expr.slot, value)
+		else :
+			globals.assign(expr.token, value)
+		return value
+	
+	
+	# Statements
+	
+	def visitFunctionStmt(self, stmt: Stmt.Function) :
+		function = LoxFunction(stmt, self.env)
+		if self.observer is not None :
+			self.observer.allocated(function)
+		self.env.define(stmt.token.lexeme, function)
+		
+		return None
+	
+	def visitExpressionStmt(self, stmt : Stmt.Expression) :
+		self.evaluate(stmt.expression)
+		return None
+	
+	def visitIfStmt(self, stmt: Stmt.If):
+		if self.isTruthy(self.evaluate(stmt.condition)) :
+			return self.execute(stmt.thenBranch)
+		elif stmt.elseBranch != None :
+			return self.execute(stmt.elseBranch)
+		return None
+	
+	def visitWhileStmt(self, stmt: Stmt.While) :
+		while self.isTruthy(self.evaluate(stmt.condition)) :
+			completion = self.execute(stmt.body)
+			if completion is not None :
+				return completion
+		return None
+	
+	def visitReturnStmt(self, stmt: Stmt.Return) :
+		value = None
+		if stmt.value != None:
+			value = self.evaluate(stmt.value)
+		
+		# handed back by the enclosing statements up to the function call
+		return Return(value)
+	
+	def visitPrintStmt(self, stmt : Stmt.Print) :
+		if self.is_a_test :
+			self.printed.append(self.evaluate(stmt.expression))
+		else :
+			print(self.evaluate(stmt.expression))
+		return None
+	
+	def visitBlockStmt(self, stmt: Stmt.Block):
+		environment = Environment(enclosing=self.env)
+		if self.observer is not None :
+			self.observer.allocated(environment)
+		return self.executeBlock(stmt.statements, environment)
+	
+	def visitClassStmt(self, stmt : Stmt.Class) :
+		superClass = None
+		
+		if stmt.superClass != None :
+			superClass = self.evaluate(stmt.superClass)
+			if not isinstance(superClass, LoxClass) :
+				raise RuntimeError("SuperClass must be a class")
+		
+		self.env.define(stmt.token.lexeme, None)
+		slot = len(self.env.slots) - 1
+		
+		if stmt.superClass != None :
+			self.env = Environment(self.env)
+			if self.observer is not None :
+				self.observer.allocated(self.env)
+			self.env.define("super", superClass)
+		 
+		methods : dict[str, LoxFunction] = dict()
+		for method in stmt.methods :
+			isInitializer = method.token.lexeme == 'init'
+			methods[method.token.lexeme] = LoxFunction(method, self.env, isInitializer) 
+			if self.observer is not None :
+				self.observer.allocated(methods[method.token.lexeme])
+			
+		klass = LoxClass(stmt.token.lexeme, superClass, methods)
+		
+		if stmt.superClass != None :
+			self.env = self.env.enclosing
+			
+		if self.env.enclosing == None :
+			self.env.values[stmt.token.lexeme] = klass
+		else :
+			self.env.slots[slot] = klass
+			
+		return None
+		
+	def visitVarStmt(self, stmt: Stmt.Var) :
+		value = None
+		if stmt.initializer != None :
+			value = self.evaluate(stmt.initializer)
 		self.env.define(stmt.token.lexeme, value)
\ No newline at end of file
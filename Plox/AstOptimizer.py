@@ -0,0 +1,180 @@
+from __future__ import annotations
+import Plox.Expr as Expr
+import Plox.Stmt as Stmt
+
+def isTruthy(value: object) -> bool :
+	return value is not None and value is not False
+
+BINARY_OPERATIONS = {
+	'PLUS': lambda left, right: left + right,
+	'MINUS': lambda left, right: left - right,
+	'STAR': lambda left, right: left * right,
+	'SLASH': lambda left, right: left / right,
+	'GREATER': lambda left, right: left > right,
+	'GREATER_EQUAL': lambda left, right: left >= right,
+	'LESS': lambda left, right: left < right,
+	'LESS_EQUAL': lambda left, right: left <= right,
+	'EQUAL_EQUAL': lambda left, right: left == right,
+	'BANG_EQUAL': lambda left, right: left != right,
+}
+
+
+class AstOptimizer(Expr.Visitor, Stmt.Visitor) :
+	"""
+	Pass run on resolved trees : fold the constant expressions into literals,
+	and remove the if branches and the loops which can never run
+	No declaration of a kept scope is removed, so the depths and slots set by the resolver stay valid
+	"""
+	def __init__(self) -> None:
+		self.folded = 0
+		"""number of expressions replaced by a literal"""
+		self.pruned = 0
+		"""number of statements removed"""
+
+	def optimize(self, statements: list[Stmt.Stmt] | Expr.Expr) -> list[Stmt.Stmt] | Expr.Expr :
+		if isinstance(statements, Expr.Expr) :
+			return self.fold(statements)
+		return self.optimizeStatements(statements)
+
+	def optimizeStatements(self, statements: list[Stmt.Stmt]) -> list[Stmt.Stmt] :
+		optimized = []
+		for statement in statements :
+			statement = statement.accept(self)
+			if statement != None :
+				optimized.append(statement)
+		return optimized
+
+	def optimizeBranch(self, statement: Stmt.Stmt) -> Stmt.Stmt :
+		"""Optimize a statement which can not be removed, as the body of a loop or a branch"""
+		statement = statement.accept(self)
+		return statement if statement != None else Stmt.Block([])
+
+	def fold(self, expr: Expr.Expr) -> Expr.Expr :
+		return expr.accept(self)
+
+	def literal(self, value: object) -> Expr.Literal :
+		self.folded += 1
+		return Expr.Literal(value)
+
+	# Expressions
+
+	def visitAssignExpr(self, expr: Expr.Assign) :
+		expr.expr = self.fold(expr.expr)
+		return expr
+
+	def visitBinary(self, expr: Expr.Binary) :
+		expr.left = self.fold(expr.left)
+		expr.right = self.fold(expr.right)
+		if isinstance(expr.left, Expr.Literal) and isinstance(expr.right, Expr.Literal) :
+			try :
+				return self.literal(BINARY_OPERATIONS[expr.operator.type](expr.left.value, expr.right.value))
+			except Exception :
+				# an error is raised when the program runs
+				pass
+		return expr
+
+	def visitCall(self, expr: Expr.Call) :
+		expr.callee = self.fold(expr.callee)
+		expr.arguments = [self.fold(argument) for argument in expr.arguments]
+		return expr
+
+	def visitLiteral(self, expr: Expr.Literal) :
+		return expr
+
+	def visitLogicalExpr(self, expr: Expr.Logical) :
+		expr.left = self.fold(expr.left)
+		expr.right = self.fold(expr.right)
+		if isinstance(expr.left, Expr.Literal) :
+			self.folded += 1
+			if isTruthy(expr.left.value) == (expr.operator.type == 'OR') :
+				return expr.left
+			return expr.right
+		return expr
+
+	def visitSet(self, expr: Expr.Set) :
+		expr.object = self.fold(expr.object)
+		expr.value = self.fold(expr.value)
+		return expr
+
+	def visitSuper(self, expr: Expr.Super) :
+		return expr
+
+	def visitThis(self, expr: Expr.This) :
+		return expr
+
+	def visitUnary(self, expr: Expr.Unary) :
+		expr.right = self.fold(expr.right)
+		if isinstance(expr.right, Expr.Literal) :
+			if expr.operator.type == 'BANG' :
+				# the negated truthiness, as in AstInterpreter.visitUnary
+				return self.literal(-isTruthy(expr.right.value))
+			if type(expr.right.value) == float :
+				return self.literal(-expr.right.value)
+		return expr
+
+	def visitGet(self, expr: Expr.Get) :
+		expr.object = self.fold(expr.object)
+		return expr
+
+	def visitGrouping(self, expr: Expr.Grouping) :
+		expr.expression = self.fold(expr.expression)
+		if isinstance(expr.expression, Expr.Literal) :
+			return expr.expression
+		return expr
+
+	def visitVariableExpr(self, expr: Expr.Variable) :
+		return expr
+
+	# Statements
+
+	def visitBlockStmt(self, stmt: Stmt.Block) :
+		stmt.statements = self.optimizeStatements(stmt.statements)
+		return stmt
+
+	def visitClassStmt(self, stmt: Stmt.Class) :
+		for method in stmt.methods :
+			method.accept(self)
+		return stmt
+
+	def visitExpressionStmt(self, stmt: Stmt.Expression) :
+		stmt.expression = self.fold(stmt.expression)
+		return stmt
+
+	def visitFunctionStmt(self, stmt: Stmt.Function) :
+		stmt.body = self.optimizeStatements(stmt.body)
+		return stmt
+
+	def visitIfStmt(self, stmt: Stmt.If) :
+		stmt.condition = self.fold(stmt.condition)
+		if isinstance(stmt.condition, Expr.Literal) :
+			# a branch is a statement, never a declaration, so the enclosing scope keeps its slots
+			self.pruned += 1
+			if isTruthy(stmt.condition.value) :
+				return stmt.thenBranch.accept(self)
+			return stmt.elseBranch.accept(self) if stmt.elseBranch != None else None
+		stmt.thenBranch = self.optimizeBranch(stmt.thenBranch)
+		if stmt.elseBranch != None :
+			stmt.elseBranch = self.optimizeBranch(stmt.elseBranch)
+		return stmt
+
+	def visitPrintStmt(self, stmt: Stmt.Print) :
+		stmt.expression = self.fold(stmt.expression)
+		return stmt
+
+	def visitReturnStmt(self, stmt: Stmt.Return) :
+		if stmt.value != None :
+			stmt.value = self.fold(stmt.value)
+		return stmt
+
+	def visitVarStmt(self, stmt: Stmt.Var) :
+		if stmt.initializer != None :
+			stmt.initializer = self.fold(stmt.initializer)
+		return stmt
+
+	def visitWhileStmt(self, stmt: Stmt.While) :
+		stmt.condition = self.fold(stmt.condition)
+		if isinstance(stmt.condition, Expr.Literal) and not isTruthy(stmt.condition.value) :
+			self.pruned += 1
+			return None
+		stmt.body = self.optimizeBranch(stmt.body)
+		return stmt
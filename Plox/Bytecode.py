@@ -0,0 +1,157 @@
+from __future__ import annotations
+import math
+from Plox.LoxCallable import LoxCallable
+
+# Opcodes, each instruction is a (opcode, operand) tuple stored in FunctionProto.code
+CONSTANT = 0
+NIL = 1
+POP = 2
+GET_LOCAL = 3
+SET_LOCAL = 4
+GET_GLOBAL = 5
+DEFINE_GLOBAL = 6
+SET_GLOBAL = 7
+GET_UPVALUE = 8
+SET_UPVALUE = 9
+GET_PROPERTY = 10
+SET_PROPERTY = 11
+GET_SUPER = 12
+EQUAL = 13
+NOT_EQUAL = 14
+GREATER = 15
+GREATER_EQUAL = 16
+LESS = 17
+LESS_EQUAL = 18
+ADD = 19
+SUBTRACT = 20
+MULTIPLY = 21
+DIVIDE = 22
+NOT = 23
+NEGATE = 24
+PRINT = 25
+JUMP = 26
+POP_JUMP_IF_FALSE = 27
+JUMP_IF_TRUE_OR_POP = 28
+JUMP_IF_FALSE_OR_POP = 29
+CALL = 30
+INVOKE = 31
+CLOSURE = 32
+CLOSE_UPVALUE = 33
+RETURN = 34
+CLASS = 35
+CHECK_SUPERCLASS = 36
+TAIL_CALL = 37
+TAIL_INVOKE = 38
+# the assignment statements : SET_LOCAL, SET_GLOBAL and SET_PROPERTY followed by a POP, in one instruction
+STORE_LOCAL = 39
+STORE_GLOBAL = 40
+STORE_PROPERTY = 41
+
+OPCODE_NAMES = {value: name for name, value in dict(globals()).items() if name.isupper() and type(value) == int}
+CALLS = frozenset((CALL, INVOKE, TAIL_CALL, TAIL_INVOKE))
+"""the opcodes handled by the call branch of the VM, tested at once"""
+
+
+class FunctionProto :
+	"""
+	Compiled form of a Stmt.Function (or of the whole script) :
+	a flat list of instructions plus the constant pool they index
+	"""
+	def __init__(self, name: str = '', arity: int = 0) -> None:
+		self.name = name
+		self.arity = arity
+		self.code: list[tuple[int, object]] = []
+		self.constants: list[object] = []
+		self.upvalues: list[tuple[bool, int]] = []
+		"""for each upvalue : (is it a local of the enclosing function, its slot or upvalue index there)"""
+		self.constantIndex: dict[object, int] = dict()
+
+	def addConstant(self, value: object) -> int :
+		if type(value) == float :
+			# 0.0 == -0.0, the sign keeps them apart
+			key = (float, value, math.copysign(1.0, value))
+		elif type(value) in (str, bool) :
+			key = (type(value), value)
+		else :
+			key = id(value)
+		if key not in self.constantIndex :
+			self.constants.append(value)
+			self.constantIndex[key] = len(self.constants) - 1
+		return self.constantIndex[key]
+
+	def __repr__(self) -> str:
+		return f"<proto {self.name or 'script'} >"
+
+
+class Upvalue :
+	"""A variable captured by a closure, it points to a stack slot until the slot goes out of scope"""
+	__slots__ = ('index', 'value')
+
+	def __init__(self, index: int) -> None:
+		self.index = index
+		"""position in the VM stack while open, -1 once closed"""
+		self.value = None
+
+
+class Closure(LoxCallable) :
+	def __init__(self, function: FunctionProto, upvalues: list[Upvalue]) -> None:
+		self.function = function
+		self.upvalues = upvalues
+
+	def arity(self) -> int:
+		return self.function.arity
+
+	def call(self, interpreter=None, arguments=[]) :
+		return interpreter.callClosure(self, arguments)
+
+	def bind(self, instance) -> BoundMethod :
+		return BoundMethod(instance, self)
+
+	def toString(self) -> str:
+		return f"<fun {self.function.name} >"
+
+	def __repr__(self) -> str:
+		return self.toString()
+
+
+class BoundMethod(LoxCallable) :
+	def __init__(self, receiver, method: Closure) -> None:
+		self.receiver = receiver
+		self.method = method
+
+	def arity(self) -> int:
+		return self.method.function.arity
+
+	def call(self, interpreter=None, arguments=[]) :
+		return interpreter.callClosure(self.method, arguments, self.receiver)
+
+	def toString(self) -> str:
+		return self.method.toString()
+
+	def __repr__(self) -> str:
+		return self.toString()
+
+
+def disassemble(function: FunctionProto) -> str :
+	"""Human readable listing of a compiled function and of the functions nested in it"""
+	lines = [f"== {function.name or '<script>'} =="]
+	nested = []
+	for offset, (op, arg) in enumerate(function.code) :
+		line = f"{offset:04d} {OPCODE_NAMES[op]:<20}"
+		if op in (CONSTANT, GET_GLOBAL, DEFINE_GLOBAL, SET_GLOBAL, STORE_GLOBAL, GET_PROPERTY, SET_PROPERTY, STORE_PROPERTY, GET_SUPER, CLOSURE) :
+			constant = function.constants[arg]
+			line += f"{arg:4d} '{constant.lexeme if hasattr(constant, 'lexeme') else constant}'"
+			if op == CLOSURE :
+				nested.append(constant)
+		elif op == INVOKE or op == TAIL_INVOKE :
+			line += f"{arg[1]:4d} '{function.constants[arg[0]].lexeme}'"
+		elif op == CALL or op == TAIL_CALL :
+			line += f"{arg[0]:4d}"
+		elif op == CLASS :
+			line += f"{arg[1]:4d} '{function.constants[arg[0]].lexeme}'"
+		elif arg != None :
+			line += f"{arg:4d}"
+		lines.append(line)
+	for proto in nested :
+		lines.append(disassemble(proto))
+	return '\n'.join(lines)
\ No newline at end of file
@@ -0,0 +1,328 @@
+from __future__ import annotations
+from typing import Literal
+import Plox.Expr as Expr
+import Plox.Stmt as Stmt
+from Plox.Bytecode import *
+
+BINARY_OPCODES = {
+	'PLUS': ADD,
+	'MINUS': SUBTRACT,
+	'STAR': MULTIPLY,
+	'SLASH': DIVIDE,
+	'GREATER': GREATER,
+	'GREATER_EQUAL': GREATER_EQUAL,
+	'LESS': LESS,
+	'LESS_EQUAL': LESS_EQUAL,
+	'EQUAL_EQUAL': EQUAL,
+	'BANG_EQUAL': NOT_EQUAL,
+}
+
+
+class Local :
+	def __init__(self, name: str, depth: int) -> None:
+		self.name = name
+		self.depth = depth
+		self.isCaptured = False
+
+
+class FunctionState :
+	"""Book-keeping of the function being compiled : its locals (stack slots) and its upvalues"""
+	def __init__(self, enclosing: FunctionState, function: FunctionProto, type: Literal['SCRIPT', 'FUNCTION', 'METHOD']) -> None:
+		self.enclosing = enclosing
+		self.function = function
+		self.type = type
+		self.scopeDepth = 0
+		# slot 0 holds the callee, or the receiver for methods
+		self.locals: list[Local] = [Local('this' if type == 'METHOD' else '', 0)]
+
+
+class BytecodeCompiler(Expr.Visitor, Stmt.Visitor) :
+	"""
+	Compile the syntax trees into bytecode for the VM
+	Locals live in stack slots, variables captured by closures become upvalues
+	Each use of a variable is bound to its declaration through the depth and slot AstResolver stored on the node
+	"""
+	def __init__(self) -> None:
+		self.current: FunctionState = None
+		self.scopes: list[list[tuple[FunctionState, int]]] = []
+		"""the scopes of the resolver, opened and filled in its order : the (function, stack slot) of each declaration, a resolved slot is an index here"""
+
+	def compile(self, statements: list[Stmt.Stmt] | Expr.Expr) -> FunctionProto :
+		"""Compile a whole program, or a single expression whose value is returned (REPL)"""
+		self.current = FunctionState(None, FunctionProto(), 'SCRIPT')
+		self.scopes = []
+		if isinstance(statements, Expr.Expr) :
+			self.compileNode(statements)
+		else :
+			for statement in statements :
+				self.compileNode(statement)
+			self.emit(NIL)
+		self.emit(RETURN)
+		return self.current.function
+
+	def compileNode(self, node: Stmt.Stmt | Expr.Expr) :
+		node.accept(self)
+
+	def emit(self, op: int, arg=None) -> int :
+		code = self.current.function.code
+		code.append((op, arg))
+		return len(code) - 1
+
+	def emitConstant(self, value: object) :
+		self.emit(CONSTANT, self.current.function.addConstant(value))
+
+	def patchJump(self, offset: int) :
+		"""Make the jump at offset land on the next instruction to be emitted"""
+		code = self.current.function.code
+		code[offset] = (code[offset][0], len(code))
+
+	# Scopes and variables
+
+	def beginScope(self) :
+		self.current.scopeDepth += 1
+		self.scopes.append([])
+
+	def endScope(self) :
+		state = self.current
+		state.scopeDepth -= 1
+		self.scopes.pop()
+		while state.locals and state.locals[-1].depth > state.scopeDepth :
+			self.emit(CLOSE_UPVALUE if state.locals[-1].isCaptured else POP)
+			state.locals.pop()
+
+	def addLocal(self, name: str) -> int :
+		"""Declare a variable in the innermost scope, return its stack slot"""
+		self.current.locals.append(Local(name, self.current.scopeDepth))
+		slot = len(self.current.locals) - 1
+		self.scopes[-1].append((self.current, slot))
+		return slot
+
+	def addUpvalue(self, state: FunctionState, isLocal: bool, index: int) -> int :
+		upvalues = state.function.upvalues
+		if (isLocal, index) in upvalues :
+			return upvalues.index((isLocal, index))
+		upvalues.append((isLocal, index))
+		return len(upvalues) - 1
+
+	def resolveUpvalue(self, state: FunctionState, owner: FunctionState, slot: int) -> int :
+		"""Index of the upvalue of state for the local at slot of owner, an enclosing function"""
+		if state.enclosing is owner :
+			owner.locals[slot].isCaptured = True
+			return self.addUpvalue(state, True, slot)
+		return self.addUpvalue(state, False, self.resolveUpvalue(state.enclosing, owner, slot))
+
+	def getVariable(self, name: str, depth: int, slot: int) :
+		if depth == None :
+			self.emit(GET_GLOBAL, self.current.function.addConstant(name))
+			return
+		owner, index = self.scopes[-1 - depth][slot]
+		if owner is self.current :
+			self.emit(GET_LOCAL, index)
+		else :
+			self.emit(GET_UPVALUE, self.resolveUpvalue(self.current, owner, index))
+
+	def setVariable(self, name: str, depth: int, slot: int, keep: bool = True) :
+		"""Assign the value on top of the stack, it stays there as the value of the assignment when keep"""
+		if depth == None :
+			self.emit(SET_GLOBAL if keep else STORE_GLOBAL, self.current.function.addConstant(name))
+			return
+		owner, index = self.scopes[-1 - depth][slot]
+		if owner is self.current :
+			self.emit(SET_LOCAL if keep else STORE_LOCAL, index)
+			return
+		self.emit(SET_UPVALUE, self.resolveUpvalue(self.current, owner, index))
+		if not keep :
+			self.emit(POP)
+
+	def defineVariable(self, name: str) -> int :
+		"""The value on top of the stack becomes a new variable, return its stack slot, None for a global"""
+		if self.current.scopeDepth > 0 :
+			return self.addLocal(name)
+		self.emit(DEFINE_GLOBAL, self.current.function.addConstant(name))
+		return None
+
+	# Expressions
+
+	def visitAssignExpr(self, expr: Expr.Assign) :
+		self.compileNode(expr.expr)
+		self.setVariable(expr.token.lexeme, expr.depth, expr.slot)
+
+	def visitBinary(self, expr: Expr.Binary) :
+		self.compileNode(expr.left)
+		self.compileNode(expr.right)
+		self.emit(BINARY_OPCODES[expr.operator.type])
+
+	def visitCall(self, expr: Expr.Call) :
+		self.call(expr, False)
+
+	def call(self, expr: Expr.Call, tail: bool) :
+		"""
+		A tail call, the value of a return statement, lets the VM reuse the frame of the caller
+		The closing parenthesis is kept in the constants for the errors of the call
+		"""
+		paren = self.current.function.addConstant(expr.paren)
+		if isinstance(expr.callee, Expr.Get) :
+			self.compileNode(expr.callee.object)
+			for argument in expr.arguments :
+				self.compileNode(argument)
+			self.emit(TAIL_INVOKE if tail else INVOKE, (self.current.function.addConstant(expr.callee.token), len(expr.arguments), paren))
+			return
+		self.compileNode(expr.callee)
+		for argument in expr.arguments :
+			self.compileNode(argument)
+		self.emit(TAIL_CALL if tail else CALL, (len(expr.arguments), paren))
+
+	def visitLiteral(self, expr: Expr.Literal) :
+		if expr.value == None :
+			self.emit(NIL)
+		else :
+			self.emitConstant(expr.value)
+
+	def visitLogicalExpr(self, expr: Expr.Logical) :
+		self.compileNode(expr.left)
+		jump = self.emit(JUMP_IF_TRUE_OR_POP if expr.operator.type == 'OR' else JUMP_IF_FALSE_OR_POP)
+		self.compileNode(expr.right)
+		self.patchJump(jump)
+
+	def visitSet(self, expr: Expr.Set) :
+		self.compileNode(expr.object)
+		self.compileNode(expr.value)
+		self.emit(SET_PROPERTY, self.current.function.addConstant(expr.token))
+
+	def visitSuper(self, expr: Expr.Super) :
+		# the instance is the first variable of the method scope, just inside the 'super' one
+		self.getVariable('this', expr.depth - 1, 0)
+		self.getVariable('super', expr.depth, expr.slot)
+		self.emit(GET_SUPER, self.current.function.addConstant(expr.method))
+
+	def visitThis(self, expr: Expr.This) :
+		self.getVariable('this', expr.depth, expr.slot)
+
+	def visitUnary(self, expr: Expr.Unary) :
+		self.compileNode(expr.right)
+		self.emit(NEGATE if expr.operator.type == 'MINUS' else NOT)
+
+	def visitGet(self, expr: Expr.Get) :
+		self.compileNode(expr.object)
+		self.emit(GET_PROPERTY, self.current.function.addConstant(expr.token))
+
+	def visitGrouping(self, expr: Expr.Grouping) :
+		self.compileNode(expr.expression)
+
+	def visitVariableExpr(self, expr: Expr.Variable) :
+		self.getVariable(expr.token.lexeme, expr.depth, expr.slot)
+
+	# Statements
+
+	def visitBlockStmt(self, stmt: Stmt.Block) :
+		self.beginScope()
+		for statement in stmt.statements :
+			self.compileNode(statement)
+		self.endScope()
+
+	def visitClassStmt(self, stmt: Stmt.Class) :
+		name = stmt.token.lexeme
+		# the class name is bound first, then assigned once the class is built
+		self.emit(NIL)
+		slot = self.defineVariable(name)
+
+		if stmt.superClass != None :
+			self.beginScope()
+			self.compileNode(stmt.superClass)
+			self.emit(CHECK_SUPERCLASS)
+			self.addLocal('super')
+
+		for method in stmt.methods :
+			self.function(method, 'METHOD')
+		self.emit(CLASS, (self.current.function.addConstant(stmt.token), len(stmt.methods), stmt.superClass != None))
+		if slot != None :
+			self.emit(SET_LOCAL, slot)
+		else :
+			self.emit(SET_GLOBAL, self.current.function.addConstant(name))
+		self.emit(POP)
+
+		if stmt.superClass != None :
+			self.endScope()
+
+	def function(self, stmt: Stmt.Function, type: Literal['FUNCTION', 'METHOD']) :
+		"""Compile the function in its own FunctionState and emit the closure creation"""
+		state = FunctionState(self.current, FunctionProto(stmt.token.lexeme, len(stmt.params)), type)
+		self.current = state
+		self.beginScope()
+		if type == 'METHOD' :
+			# the instance, in slot 0, is the first variable of the method scope for the resolver
+			self.scopes[-1].append((state, 0))
+		for param in stmt.params :
+			self.addLocal(param.lexeme)
+		for statement in stmt.body :
+			self.compileNode(statement)
+		self.emit(NIL)
+		self.emit(RETURN)
+		# the frame drops the locals, only the scope is closed
+		self.scopes.pop()
+		self.current = state.enclosing
+		self.emit(CLOSURE, self.current.function.addConstant(state.function))
+
+	def visitFunctionStmt(self, stmt: Stmt.Function) :
+		if self.current.scopeDepth > 0 :
+			# declared first so the function can call itself, the closure then lands in that slot
+			self.addLocal(stmt.token.lexeme)
+			self.function(stmt, 'FUNCTION')
+			return
+		self.function(stmt, 'FUNCTION')
+		self.defineVariable(stmt.token.lexeme)
+
+	def visitExpressionStmt(self, stmt: Stmt.Expression) :
+		expression = stmt.expression
+		# the value of an assignment statement is not left on the stack, one instruction is saved
+		if isinstance(expression, Expr.Assign) :
+			self.compileNode(expression.expr)
+			self.setVariable(expression.token.lexeme, expression.depth, expression.slot, keep=False)
+		elif isinstance(expression, Expr.Set) :
+			self.compileNode(expression.object)
+			self.compileNode(expression.value)
+			self.emit(STORE_PROPERTY, self.current.function.addConstant(expression.token))
+		else :
+			self.compileNode(expression)
+			self.emit(POP)
+
+	def visitIfStmt(self, stmt: Stmt.If) :
+		self.compileNode(stmt.condition)
+		thenJump = self.emit(POP_JUMP_IF_FALSE)
+		self.compileNode(stmt.thenBranch)
+		if stmt.elseBranch != None :
+			elseJump = self.emit(JUMP)
+			self.patchJump(thenJump)
+			self.compileNode(stmt.elseBranch)
+			self.patchJump(elseJump)
+		else :
+			self.patchJump(thenJump)
+
+	def visitPrintStmt(self, stmt: Stmt.Print) :
+		self.compileNode(stmt.expression)
+		self.emit(PRINT)
+
+	def visitReturnStmt(self, stmt: Stmt.Return) :
+		if isinstance(stmt.value, Expr.Call) and self.current.type != 'SCRIPT' :
+			# the RETURN still follows, for the calls which can not replace the frame
+			self.call(stmt.value, True)
+		elif stmt.value != None :
+			self.compileNode(stmt.value)
+		else :
+			self.emit(NIL)
+		self.emit(RETURN)
+
+	def visitVarStmt(self, stmt: Stmt.Var) :
+		if stmt.initializer != None :
+			self.compileNode(stmt.initializer)
+		else :
+			self.emit(NIL)
+		self.defineVariable(stmt.token.lexeme)
+
+	def visitWhileStmt(self, stmt: Stmt.While) :
+		loopStart = len(self.current.function.code)
+		self.compileNode(stmt.condition)
+		exitJump = self.emit(POP_JUMP_IF_FALSE)
+		self.compileNode(stmt.body)
+		self.emit(JUMP, loopStart)
+		self.patchJump(exitJump)
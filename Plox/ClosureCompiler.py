@@ -0,0 +1,452 @@
+from __future__ import annotations
+from typing import Callable
+import Plox.Expr as Expr
+import Plox.Stmt as Stmt
+from Plox.Environment import Environment
+from Plox.LoxCallable import LoxCallable
+from Plox.LoxFunction import LoxFunction
+from Plox.LoxClass import LoxClass
+from Plox.LoxInstance import LoxInstance
+from Plox.Return import Return
+from Plox.Token import Token
+from Plox.ErrorHandling import ErrorHandling
+from Plox.Observer import Observer
+
+Compiled = Callable[[Environment], object]
+"""a compiled node : called with the current environment, it returns the value of the expression"""
+
+BINARY_CLOSURES = {
+	'PLUS': lambda left, right: lambda env: left(env) + right(env),
+	'MINUS': lambda left, right: lambda env: left(env) - right(env),
+	'STAR': lambda left, right: lambda env: left(env) * right(env),
+	'SLASH': lambda left, right: lambda env: left(env) / right(env),
+	'GREATER': lambda left, right: lambda env: left(env) > right(env),
+	'GREATER_EQUAL': lambda left, right: lambda env: left(env) >= right(env),
+	'LESS': lambda left, right: lambda env: left(env) < right(env),
+	'LESS_EQUAL': lambda left, right: lambda env: left(env) <= right(env),
+	'EQUAL_EQUAL': lambda left, right: lambda env: left(env) == right(env),
+	'BANG_EQUAL': lambda left, right: lambda env: left(env) != right(env),
+}
+"""closures for a binary operator, given the closures of the operands"""
+
+BINARY_CONSTANT_CLOSURES = {
+	'PLUS': lambda left, constant: lambda env: left(env) + constant,
+	'MINUS': lambda left, constant: lambda env: left(env) - constant,
+	'STAR': lambda left, constant: lambda env: left(env) * constant,
+	'SLASH': lambda left, constant: lambda env: left(env) / constant,
+	'GREATER': lambda left, constant: lambda env: left(env) > constant,
+	'GREATER_EQUAL': lambda left, constant: lambda env: left(env) >= constant,
+	'LESS': lambda left, constant: lambda env: left(env) < constant,
+	'LESS_EQUAL': lambda left, constant: lambda env: left(env) <= constant,
+	'EQUAL_EQUAL': lambda left, constant: lambda env: left(env) == constant,
+	'BANG_EQUAL': lambda left, constant: lambda env: left(env) != constant,
+}
+"""same as BINARY_CLOSURES when the right operand is a literal, which is then bound directly"""
+
+
+class CompiledFunction(LoxFunction) :
+	"""A LoxFunction whose body has already been compiled to a closure"""
+	__slots__ = ('body', 'nparams')
+
+	def __init__(self, declaration: Stmt.Function, closure: Environment, body: Compiled, isInitializer: bool = False, receiver: LoxInstance = None) -> None:
+		super().__init__(declaration, closure, isInitializer, receiver)
+		self.body = body
+		self.nparams = len(declaration.params)
+
+	def call(self, interpreter=None, arguments=[]) :
+		if self.receiver is not None :
+			return self.callMethod(interpreter, self.receiver, arguments)
+		# the parameters are the first slots of the function scope
+		environment = Environment(self.closure, list(arguments))
+		completion = self.body(environment) if interpreter.observer is None else self.observed(interpreter, environment)
+		if type(completion) is Return :
+			return completion.value
+		return None
+
+	def callMethod(self, interpreter, receiver: LoxInstance, arguments: list) :
+		environment = Environment(self.closure, [receiver, *arguments])
+		completion = self.body(environment) if interpreter.observer is None else self.observed(interpreter, environment)
+		if type(completion) is Return :
+			# an empty return in an initializer returns its instance, as in LoxFunction.execute
+			return receiver if self.isInitializer else completion.value
+		return None
+
+	def run(self, interpreter, environment: Environment) :
+		return self.body(environment)
+
+	def bind(self, instance: LoxInstance) -> CompiledFunction :
+		return CompiledFunction(self.declaration, self.closure, self.body, self.isInitializer, instance)
+
+
+class ClosureCompiler(Expr.Visitor, Stmt.Visitor) :
+	"""
+	Walk the resolved tree once and turn every node into a Python closure,
+	the operator, the resolved depth and the closures of the children are bound at compile time
+	Running a program is then only calling the closures of its statements
+	"""
+	def __init__(self, error_handler: ErrorHandling, env=Environment(), is_a_test=False) -> None:
+		self.env = env
+		"""the globals"""
+		self.error_handler = error_handler
+		self.is_a_test = is_a_test
+		self.printed: list[str] = []
+		self.depth = 0
+		"""number of local scopes around the node being compiled, 0 for the global scope"""
+		self.observer: Observer = None
+		"""told the calls and the environments made, by an instrumentation (plox.py --stats, --profile), None when off"""
+
+	def interpret(self, statements: list[Stmt.Stmt] | Expr.Expr) :
+		try :
+			if type(statements) == list :
+				self.compileSequence(statements)(self.env)
+			else :
+				return self.compile(statements)(self.env)
+		except Exception as e :
+			self.error_handler.error(ori='astInterpreter', message=e)
+
+	def compile(self, node: Stmt.Stmt | Expr.Expr) -> Compiled :
+		return node.accept(self)
+
+	def compileSequence(self, statements: list[Stmt.Stmt]) -> Compiled :
+		"""
+		Closure running the statements in order, it stops at the first one completing with a Return and returns it
+		An expression statement returns the value of its expression, so the completions are checked by type
+		"""
+		compiled = [self.compile(statement) for statement in statements]
+		if len(compiled) == 1 :
+			return compiled[0]
+		def sequence(env: Environment) :
+			for statement in compiled :
+				completion = statement(env)
+				if type(completion) is Return :
+					return completion
+			return None
+		return sequence
+
+	def compileLookup(self, expr: Expr.Variable | Expr.This, token: Token) -> Compiled :
+		name = token.lexeme
+		if expr.depth == None :
+			globalValues = self.env.values
+			def getGlobal(env: Environment) :
+				try :
+					return globalValues[name]
+				except KeyError :
+					raise RuntimeError(token, f"Undefined variable ' {name} '.")
+			return getGlobal
+		distance, slot = expr.depth, expr.slot
+		if distance == 0 :
+			return lambda env: env.slots[slot]
+		if distance == 1 :
+			return lambda env: env.enclosing.slots[slot]
+		if distance == 2 :
+			return lambda env: env.enclosing.enclosing.slots[slot]
+		return lambda env: env.ancestor(distance).slots[slot]
+
+	def compileBody(self, statements: list[Stmt.Stmt]) -> Compiled :
+		"""Compile statements run in a new local scope"""
+		self.depth += 1
+		body = self.compileSequence(statements)
+		self.depth -= 1
+		return body
+
+	def compileDefinition(self, name: str, value: Compiled) -> Compiled :
+		"""Closure adding a new variable to the current scope, by name in the global scope else in the next slot"""
+		if self.depth == 0 :
+			def defineGlobal(env: Environment) :
+				env.values[name] = value(env)
+			return defineGlobal
+		def defineLocal(env: Environment) :
+			env.slots.append(value(env))
+		return defineLocal
+
+	def printValue(self, value: object) :
+		if self.is_a_test :
+			self.printed.append(value)
+		else :
+			print(value)
+
+	# Expressions
+
+	def visitAssignExpr(self, expr: Expr.Assign) :
+		value = self.compile(expr.expr)
+		name = expr.token.lexeme
+		if expr.depth == None :
+			globalValues = self.env.values
+			def assignGlobal(env: Environment) :
+				result = value(env)
+				if name not in globalValues :
+					raise RuntimeError(expr.token, f"Undefined variable ' {name} '.")
+				globalValues[name] = result
+				return result
+			return assignGlobal
+		distance, slot = expr.depth, expr.slot
+		if distance == 0 :
+			def assignLocal(env: Environment) :
+				result = env.slots[slot] = value(env)
+				return result
+			return assignLocal
+		def assignAt(env: Environment) :
+			result = env.ancestor(distance).slots[slot] = value(env)
+			return result
+		return assignAt
+
+	def visitBinary(self, expr: Expr.Binary) :
+		left = self.compile(expr.left)
+		if isinstance(expr.right, Expr.Literal) :
+			return BINARY_CONSTANT_CLOSURES[expr.operator.type](left, expr.right.value)
+		return BINARY_CLOSURES[expr.operator.type](left, self.compile(expr.right))
+
+	def visitCall(self, expr: Expr.Call) :
+		callee = self.compile(expr.callee)
+		arguments = [self.compile(argument) for argument in expr.arguments]
+		argc = len(arguments)
+		interpreter = self
+
+		def call(env: Environment) :
+			function: LoxCallable = callee(env)
+			values = [argument(env) for argument in arguments]
+			if type(function) == CompiledFunction :
+				if function.nparams != argc :
+					raise RuntimeError(expr.paren, f"Expected {function.nparams} arguments but got {argc} .")
+				return function.call(interpreter, values)
+			if function.arity() != argc :
+				raise RuntimeError(expr.paren, f"Expected {function.arity()} arguments but got {argc} .")
+			return function.call(interpreter, values)
+		return call
+
+	def visitInvoke(self, expr: Expr.Invoke) :
+		object = self.compile(expr.callee.object)
+		token = expr.callee.token
+		name = token.lexeme
+		arguments = [self.compile(argument) for argument in expr.arguments]
+		argc = len(arguments)
+		interpreter = self
+
+		def invoke(env: Environment) :
+			instance = object(env)
+			if type(instance) == LoxInstance and name not in instance.shape.indices :
+				method = instance.klass.findMethod(name)
+				if method == None :
+					raise RuntimeError(token, f"Undefined Property '{name}'")
+				values = [argument(env) for argument in arguments]
+				if type(method) == CompiledFunction and method.nparams == argc :
+					return method.callMethod(interpreter, instance, values)
+				method = method.bind(instance)
+			else :
+				if not isinstance(instance, LoxInstance) :
+					raise RuntimeError(token, "Only intances have properties.")
+				method = instance.get(token)
+				values = [argument(env) for argument in arguments]
+			if method.arity() != argc :
+				raise RuntimeError(expr.paren, f"Expected {method.arity()} arguments but got {argc} .")
+			return method.call(interpreter, values)
+		return invoke
+
+	def visitLiteral(self, expr: Expr.Literal) :
+		value = expr.value
+		return lambda env: value
+
+	def visitLogicalExpr(self, expr: Expr.Logical) :
+		left = self.compile(expr.left)
+		right = self.compile(expr.right)
+		if expr.operator.type == 'OR' :
+			def logicalOr(env: Environment) :
+				value = left(env)
+				if value is not None and value is not False :
+					return value
+				return right(env)
+			return logicalOr
+		def logicalAnd(env: Environment) :
+			value = left(env)
+			if value is None or value is False :
+				return value
+			return right(env)
+		return logicalAnd
+
+	def visitSet(self, expr: Expr.Set) :
+		object = self.compile(expr.object)
+		value = self.compile(expr.value)
+		token = expr.token
+		name = token.lexeme
+		# inline cache, as Expr.Set.shape, Expr.Set.index and Expr.Set.transition
+		cachedShape = cachedIndex = cachedTransition = None
+		def setProperty(env: Environment) :
+			nonlocal cachedShape, cachedIndex, cachedTransition
+			instance = object(env)
+			if not isinstance(instance, LoxInstance) :
+				raise RuntimeError(token, "Only intances have fields.")
+			result = value(env)
+			if type(instance) != LoxInstance :
+				instance.set(token, result)
+				return result
+			shape = instance.shape
+			if shape is cachedShape :
+				if cachedTransition is None :
+					instance.values[cachedIndex] = result
+				else :
+					instance.shape = cachedTransition
+					instance.values.append(result)
+				return result
+			instance.set(token, result)
+			cachedShape = shape
+			cachedIndex = instance.shape.indices[name]
+			cachedTransition = instance.shape if instance.shape is not shape else None
+			return result
+		return setProperty
+
+	def visitSuper(self, expr: Expr.Super) :
+		distance, slot = expr.depth, expr.slot
+		method = expr.method
+		def superMethod(env: Environment) :
+			superclass: LoxClass = env.ancestor(distance).slots[slot]
+			instance: LoxInstance = env.ancestor(distance - 1).slots[0]
+			function = superclass.findMethod(method.lexeme)
+			if function == None :
+				raise RuntimeError(method, "Undefined property '" + method.lexeme + "'.")
+			return function.bind(instance)
+		return superMethod
+
+	def visitThis(self, expr: Expr.This) :
+		return self.compileLookup(expr, expr.keyword)
+
+	def visitUnary(self, expr: Expr.Unary) :
+		right = self.compile(expr.right)
+		if expr.operator.type == 'MINUS' :
+			return lambda env: -right(env)
+		def bang(env: Environment) :
+			value = right(env)
+			# the negated truthiness, as in AstInterpreter.visitUnary
+			return -(value is not None and value is not False)
+		return bang
+
+	def visitGet(self, expr: Expr.Get) :
+		object = self.compile(expr.object)
+		token = expr.token
+		name = token.lexeme
+		# inline cache, as Expr.Get.shape and Expr.Get.index
+		cachedShape = cachedIndex = None
+		def getProperty(env: Environment) :
+			nonlocal cachedShape, cachedIndex
+			instance = object(env)
+			if type(instance) == LoxInstance :
+				shape = instance.shape
+				if shape is cachedShape :
+					return instance.values[cachedIndex]
+				index = shape.indices.get(name, None)
+				if index != None :
+					cachedShape = shape
+					cachedIndex = index
+					return instance.values[index]
+				return instance.get(token)
+			if isinstance(instance, LoxInstance) :
+				return instance.get(token)
+			raise RuntimeError(token, "Only intances have properties.")
+		return getProperty
+
+	def visitGrouping(self, expr: Expr.Grouping) :
+		return self.compile(expr.expression)
+
+	def visitVariableExpr(self, expr: Expr.Variable) :
+		return self.compileLookup(expr, expr.token)
+
+	# Statements
+
+	def visitBlockStmt(self, stmt: Stmt.Block) :
+		self.depth += 1
+		statements = [self.compile(statement) for statement in stmt.statements]
+		self.depth -= 1
+		observer = self.observer
+		def block(env: Environment) :
+			inner = Environment(enclosing=env)
+			if observer is not None :
+				observer.allocated(inner)
+			for statement in statements :
+				completion = statement(inner)
+				if type(completion) is Return :
+					return completion
+			return None
+		return block
+
+	def visitClassStmt(self, stmt: Stmt.Class) :
+		name = stmt.token.lexeme
+		superClassValue = self.compile(stmt.superClass) if stmt.superClass != None else None
+		methods = [(method, self.compileBody(method.body)) for method in stmt.methods]
+		isGlobal = self.depth == 0
+		observer = self.observer
+		def klass(env: Environment) :
+			superClass = None
+			if superClassValue != None :
+				superClass = superClassValue(env)
+				if not isinstance(superClass, LoxClass) :
+					raise RuntimeError("SuperClass must be a class")
+			env.define(name, None)
+			slot = len(env.slots) - 1
+			methodEnv = env
+			if superClass != None :
+				methodEnv = Environment(env, [superClass])
+				if observer is not None :
+					observer.allocated(methodEnv)
+			functions = {method.token.lexeme: CompiledFunction(method, methodEnv, body, method.token.lexeme == 'init') for method, body in methods}
+			if isGlobal :
+				env.values[name] = LoxClass(name, superClass, functions)
+			else :
+				env.slots[slot] = LoxClass(name, superClass, functions)
+		return klass
+
+	def visitExpressionStmt(self, stmt: Stmt.Expression) :
+		return self.compile(stmt.expression)
+
+	def visitFunctionStmt(self, stmt: Stmt.Function) :
+		body = self.compileBody(stmt.body)
+		return self.compileDefinition(stmt.token.lexeme, lambda env: CompiledFunction(stmt, env, body))
+
+	def visitIfStmt(self, stmt: Stmt.If) :
+		condition = self.compile(stmt.condition)
+		thenBranch = self.compile(stmt.thenBranch)
+		if stmt.elseBranch == None :
+			def ifThen(env: Environment) :
+				value = condition(env)
+				if value is not None and value is not False :
+					return thenBranch(env)
+				return None
+			return ifThen
+		elseBranch = self.compile(stmt.elseBranch)
+		def ifThenElse(env: Environment) :
+			value = condition(env)
+			if value is not None and value is not False :
+				return thenBranch(env)
+			return elseBranch(env)
+		return ifThenElse
+
+	def visitPrintStmt(self, stmt: Stmt.Print) :
+		expression = self.compile(stmt.expression)
+		printValue = self.printValue
+		return lambda env: printValue(expression(env))
+
+	def visitReturnStmt(self, stmt: Stmt.Return) :
+		if stmt.value == None :
+			def returnNone(env: Environment) :
+				return Return(None)
+			return returnNone
+		value = self.compile(stmt.value)
+		def returnValue(env: Environment) :
+			return Return(value(env))
+		return returnValue
+
+	def visitVarStmt(self, stmt: Stmt.Var) :
+		if stmt.initializer == None :
+			return self.compileDefinition(stmt.token.lexeme, lambda env: None)
+		return self.compileDefinition(stmt.token.lexeme, self.compile(stmt.initializer))
+
+	def visitWhileStmt(self, stmt: Stmt.While) :
+		condition = self.compile(stmt.condition)
+		body = self.compile(stmt.body)
+		def loop(env: Environment) :
+			while True :
+				value = condition(env)
+				if value is None or value is False :
+					return None
+				completion = body(env)
+				if type(completion) is Return :
+					return completion
+		return loop
\ No newline at end of file
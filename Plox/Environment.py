@@ -1,56 +1,71 @@
-from __future__ import annotations
-from Plox.Token import Token
-
-class Environment :
-	"""
-	An object which holds all the variables of a scope and a pointer toward its nearest outer scope
-	"""
-	def __init__(self, enclosing: Environment = None) -> None:
-		self.values: dict[str,any] = dict()
-		self.enclosing = enclosing
-	
-	def define(self, name: str, value: any) :
-		self.values[name] = value    
-		
-	def assign(self, token: Token, value: any) :
-		env = self
-		while env :
-			if token.lexeme in env.values :
-				env.values[token.lexeme] = value
-				return
-			env = env.enclosing
-
-		raise  RuntimeError(token, f"Undefined variable ' {token.lexeme} '.")
-	
-	def assignAt(self, distance: int, token: Token, value) -> None :
-		self.ancestor(distance).values[token.lexeme] = value
-		
-	def get(self, token: Token) :
-		env = self
-		while env :
-			if token.lexeme in env.values :
-				return env.values[token.lexeme]
-			env = env.enclosing
-
-		raise  RuntimeError(token, f"Undefined variable ' {token.lexeme} '.")
-	
-	def getAt(self, distance: int, name: str) :
-		return self.ancestor(distance).values[name]
-	
-	def ancestor(self, distance: int) -> Environment :
-		env = self
-		for _ in range(distance) :
-			if not env.enclosing :
-				raise Exception(f"{env} has no enclosing environment, the resolver must have made a mistake")
-			env = env.enclosing
-		return env
-		
-	def getAllEnv(self) :
-		env = self
-		ans = []
-		while env :
-			ans.append(env.values)
-			env = env.enclosing
-		return ans
-
+from __future__ import annotations
+from Plox.Token import Token
+
+class Environment :
+	"""
+	An object which holds all the variables of a scope and a pointer toward its nearest outer scope
+	Local variables are stored in a list, at the slot the resolver gave them,
+	only the globals (the environment without enclosing one) are stored by name
+	"""
+	# __weakref__ for plox.py --allocations, which is told when an object dies by a weakref.finalize
+	__slots__ = ('values', 'slots', 'enclosing', '__weakref__')
+
+	def __init__(self, enclosing: Environment = None, slots: list = None) -> None:
+		self.values: dict[str,any] = dict() if enclosing == None else None
+		"""the variables of the global scope, by name, None for a local scope"""
+		self.slots: list = [] if slots == None else slots
+		"""the variables of a local scope, in declaration order"""
+		self.enclosing = enclosing
+	
+	def define(self, name: str, value: any) :
+		if self.enclosing == None :
+			self.values[name] = value
+		else :
+			# declarations run in the order the resolver numbered them
+			self.slots.append(value)
+		
+	def assign(self, token: Token, value: any) :
+		env = self.outermost()
+		if token.lexeme in env.values :
+			env.values[token.lexeme] = value
+			return
+
+		raise  RuntimeError(token, f"Undefined variable ' {token.lexeme} '.")
+	
+	def assignAt(self, distance: int, slot: int, value) -> None :
+		self.ancestor(distance).slots[slot] = value
+		
+	def get(self, token: Token) :
+		env = self.outermost()
+		if token.lexeme in env.values :
+			return env.values[token.lexeme]
+
+		raise  RuntimeError(token, f"Undefined variable ' {token.lexeme} '.")
+	
+	def getAt(self, distance: int, slot: int) :
+		return self.ancestor(distance).slots[slot]
+	
+	def outermost(self) -> Environment :
+		"""the global scope, the only one storing variables by name"""
+		env = self
+		while env.enclosing :
+			env = env.enclosing
+		return env
+
+	def ancestor(self, distance: int) -> Environment :
+		env = self
+		for _ in range(distance) :
+			if not env.enclosing :
+				raise Exception(f"{env} has no enclosing environment, the resolver must have made a mistake")
+			env = env.enclosing
+		return env
+		
+	def getAllEnv(self) :
+		env = self
+		ans = []
+		while env :
+			ans.append(env.values if env.enclosing == None else env.slots)
+			env = env.enclosing
+		return ans
+
 		
\ No newline at end of file
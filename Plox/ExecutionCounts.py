@@ -0,0 +1,144 @@
+from __future__ import annotations
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterable
+import Plox.Expr as Expr
+from Plox.LoxClass import LoxClass
+from Plox.Observer import Observer
+
+BACKENDS = ('ast',)
+"""the backends telling their observer the nodes they run, the tree-walk interpreter"""
+
+KINDS = ('visits', 'operators', 'globals')
+"""
+what is counted at each location : the calls of each visit method, the Binary evaluations of each operator,
+the variables looked up in the globals
+"""
+
+
+def newLocation() -> dict :
+	return {kind: Counter() for kind in KINDS}
+
+
+def receiverName(klass) -> str :
+	return klass.name if type(klass) == LoxClass else klass.__name__
+
+
+def visitName(cls: type) -> str :
+	"""name of the visit method the accept() of the node class calls"""
+	return next(name for name in cls.accept.__code__.co_names if name.startswith('visit'))
+
+
+def merge(reports: Iterable[dict]) -> dict :
+	"""The counts of several runs, each one as given by asDict(), added up"""
+	counts = ExecutionCounts()
+	for report in reports :
+		counts.merge(report)
+	return counts.asDict()
+
+
+class ExecutionCounts(Observer) :
+	"""
+	Counts of what the tree-walk interpreter does at each location ('file:line' of the statement running), for plox.py --count
+	The expressions have no line, they are counted at the one of the innermost statement running them
+	The classes of the objects each property is read from are kept by Get node, the site 'file:line:column .name'
+	"""
+	nodes = True
+
+	def __init__(self, filename: str = '<script>') -> None:
+		self.filename = filename
+		"""first part of the locations, the file being run"""
+		self.locations: dict[str, dict] = dict()
+		"""location -> newLocation()"""
+		self.lines: dict[tuple[str, int], dict] = dict()
+		"""(filename, line) -> its entry of locations, not to format the location at each statement"""
+		self.current: dict = None
+		"""entry of the statement running"""
+		self.receivers: dict[str, set[str]] = dict()
+		"""site of a Get node -> the class names of the objects it read from"""
+		self.sites: dict[Expr.Get, set[str]] = dict()
+		"""Get node -> its entry of receivers"""
+		self.names: dict[type, str] = dict()
+		"""node class -> the name of its visit method"""
+
+	def at(self, line: int | None) -> dict :
+		"""entry of locations for the line of the current file, the file itself for what runs outside of any statement"""
+		entry = self.lines.get((self.filename, line), None)
+		if entry == None :
+			location = self.filename if line == None else f"{self.filename}:{line}"
+			entry = self.lines[(self.filename, line)] = self.locations.setdefault(location, newLocation())
+		return entry
+
+	def line(self, line: int | None) -> None :
+		self.current = self.at(line)
+
+	def visit(self, node) -> None :
+		cls = type(node)
+		name = self.names.get(cls, None)
+		if name == None :
+			name = self.names[cls] = visitName(cls)
+		current = self.current
+		current['visits'][name] += 1
+		if isinstance(node, Expr.Binary) :
+			current['operators'][node.operator.lexeme] += 1
+		elif cls == Expr.Variable and node.depth == None :
+			current['globals'][node.token.lexeme] += 1
+
+	def receiver(self, get: Expr.Get, klass) -> None :
+		classes = self.sites.get(get, None)
+		if classes == None :
+			site = f"{self.filename}:{get.line}:{get.column} .{get.token.lexeme}"
+			classes = self.sites[get] = self.receivers.setdefault(site, set())
+		classes.add(receiverName(klass))
+
+	@contextmanager
+	def counting(self) :
+		"""Count what runs outside of any statement at the file itself, while in this context"""
+		self.current = self.at(None)
+		try :
+			yield
+		finally :
+			self.current = None
+
+	def asDict(self) -> dict :
+		"""The counts as JSON serializable data, the locations and kinds without any count are left out"""
+		locations = dict()
+		for location, entry in self.locations.items() :
+			counts = {kind: dict(entry[kind]) for kind in KINDS if entry[kind]}
+			if counts :
+				locations[location] = counts
+		return {'locations': locations, 'receivers': {site: sorted(classes) for site, classes in self.receivers.items()}}
+
+	def merge(self, report: dict) -> None :
+		"""Add the counts of another run, as given by asDict()"""
+		for location, counts in report['locations'].items() :
+			entry = self.locations.setdefault(location, newLocation())
+			for kind in KINDS :
+				entry[kind].update(counts.get(kind, {}))
+		for site, classes in report.get('receivers', {}).items() :
+			self.receivers.setdefault(site, set()).update(classes)
+
+	def totals(self, kind: str) -> Counter[str] :
+		"""Counts of kind summed over all the locations"""
+		total = Counter()
+		for entry in self.locations.values() :
+			total.update(entry[kind])
+		return total
+
+	def report(self) -> str :
+		lines = []
+		for kind, title in (('visits', 'visits'), ('operators', 'binary operators'), ('globals', 'global lookups')) :
+			lines.append(title)
+			lines.extend(f"  {name:<28}{count:>12}" for name, count in self.totals(kind).most_common())
+		lines.append('get sites, by number of receiver classes')
+		sites = sorted(self.receivers.items(), key=lambda item: len(item[1]), reverse=True)
+		lines.extend(f"  {site:<40}{len(classes):>12}  {', '.join(sorted(classes))}" for site, classes in sites)
+		lines.append('locations, by number of visits')
+		entries = sorted(self.locations.items(), key=lambda item: sum(item[1]['visits'].values()), reverse=True)
+		for location, entry in entries :
+			if not entry['visits'] :
+				continue
+			details = [f"{operator} {count}" for operator, count in entry['operators'].most_common()]
+			details += [f"global {name} {count}" for name, count in entry['globals'].most_common()]
+			lines.append(f"  {location:<28}{sum(entry['visits'].values()):>12}  {', '.join(details)}")
+		return '\n'.join(lines)
\ No newline at end of file
@@ -1,134 +1,225 @@
-from __future__ import annotations
-from Plox.Token import Token
-from abc import ABC, abstractmethod
-
-
-class Expr(ABC) :
-  """unit that will represent a value after evaluation"""
-  @abstractmethod
-  def accept(self, visitor: Visitor)  :
-     pass
-     
-class Assign(Expr) :
-  def __init__(self, token: Token, expr: Expr) -> None:
-    self.token = token
-    self.expr = expr
-  def accept(self, visitor: Visitor) :
-    return visitor.visitAssignExpr(self)
-  
-class Binary(Expr) :
-  def __init__(self, left :Expr, operator: Token, right :Expr) -> None:
-    self.left = left
-    self.operator = operator
-    self.right = right
-  def accept(self, visitor: Visitor) :
-    return visitor.visitBinary(self)
-
-class Call(Expr) :
-  def __init__(self, callee: Expr, paren : Token, arguments: list[Expr]) :
-    self.callee = callee
-    self.paren = paren
-    self.arguments = arguments
-  def accept(self, visitor: Visitor) :
-    return visitor.visitCall(self)
-    
-class Literal(Expr) :
-  def __init__(self, value) -> None:
-        self.value = value
-  def accept(self, visitor: Visitor) :
-    return visitor.visitLiteral(self)
-
-class Logical(Expr) :
-  def __init__(self, left :Expr, operator: Token, right :Expr) -> None:
-    self.left = left
-    self.operator = operator
-    self.right = right
-  def accept(self, visitor: Visitor) :
-    return visitor.visitLogicalExpr(self)
-
-class Set(Expr) :
-  def __init__(self, object: Expr, token: Token, value: Expr) -> None:
-    self.object = object
-    self.token = token
-    self.value = value
-  def accept(self, visitor: Visitor) :
-    return visitor.visitSet(self)
-
-class Super(Expr) :
-  def __init__(self, keyword: Token, method: Token) -> None:
-    self.keyword = keyword
-    self.method = method
-  def accept(self, visitor: Visitor) :
-    return visitor.visitSuper(self)
-
-class This(Expr) :
-  def __init__(self, keyword : Token) -> None:
-    self.keyword = keyword
-  def accept(self, visitor: Visitor) :
-    return visitor.visitThis(self)
-
-class Unary(Expr) :
-  def __init__(self, operator: Token, right :Expr) -> None:
-        self.operator = operator
-        self.right = right
-  def accept(self, visitor: Visitor) :
-    return visitor.visitUnary(self)
-
-class Get(Expr) :
-  def __init__(self, object: Expr, token : Token) -> None :
-    self.object = object
-    self.token = token
-  def accept(self, visitor: Visitor) :
-    return visitor.visitGet(self)  
-
-class Grouping(Expr) :
-  def __init__(self, expression : Expr) -> None:
-        self.expression = expression
-  def accept(self, visitor: Visitor) :
-    return visitor.visitGrouping(self)
-
-class Variable(Expr) :
-  def __init__(self, token : Token) -> None:
-        self.token = token
-  def accept(self, visitor: Visitor) :
-    return visitor.visitVariableExpr(self)
-
-
-
-class Visitor(ABC) :
-  @abstractmethod
-  def visitAssignExpr(self, expr : Assign) :
-    pass
-  @abstractmethod
-  def visitBinary(self, expr : Binary) :
-    pass
-  @abstractmethod
-  def visitCall(self, expr: Call) :
-    pass
-  @abstractmethod
-  def visitLiteral(self, expr : Literal) :
-    pass
-  @abstractmethod
-  def visitLogicalExpr(self, expr : Logical) :
-    pass
-  @abstractmethod
-  def visitSet(self, expr : Set) :
-    pass
-  @abstractmethod
-  def visitSuper(self, expr : Super) :
-    pass
-  @abstractmethod
-  def visitThis(self, expr : This) :
-    pass
-  @abstractmethod
-  def visitUnary(self, expr : Unary) :
-    pass
-  @abstractmethod
-  def visitGet(self, expr : Get) :
-    pass
-  @abstractmethod
-  def visitGrouping(self, expr : Grouping) :
-    pass
-  @abstractmethod
-  def visitVariableExpr(self, expr : Variable) :
+from __future__ import annotations
+import operator
+from Plox.Token import Token
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+if TYPE_CHECKING :
+  from Plox.LoxInstance import Shape
+
+
+class Expr(ABC) :
+  """unit that will represent a value after evaluation"""
+  # the nodes have slots and no __dict__, large programs make hundreds of thousands of them
+  __slots__ = ()
+  @abstractmethod
+  def accept(self, visitor: Visitor)  :
+     pass
+     
+class Assign(Expr) :
+  __slots__ = ('token', 'expr', 'depth', 'slot')
+  def __init__(self, token: Token, expr: Expr) -> None:
+    self.token = token
+    self.expr = expr
+    self.depth: int = None
+    """number of scopes between this use and the declaration, set by the resolver, None for a global"""
+    self.slot: int = None
+    """index of the variable in its scope, set by the resolver"""
+  def accept(self, visitor: Visitor) :
+    return visitor.visitAssignExpr(self)
+  
+class Binary(Expr) :
+  # slots keep the attributes fast to read when the interpreter changes the class of the node
+  __slots__ = ('left', 'operator', 'right', 'specializable')
+  def __init__(self, left :Expr, operator: Token, right :Expr) -> None:
+    self.left = left
+    self.operator = operator
+    self.right = right
+    self.specializable = True
+    """False once the node has seen operands it has no specialization for, or a guard failed"""
+  def accept(self, visitor: Visitor) :
+    return visitor.visitBinary(self)
+
+class SpecializedBinary(Binary) :
+  """
+  A Binary node rewritten (its class changed) for the type of the operands it saw
+  It evaluates its operator directly, as long as both operands have this type
+  """
+  __slots__ = ()
+  operandType: type = None
+  operation = None
+  def accept(self, visitor: Visitor) :
+    return visitor.visitSpecializedBinary(self)
+
+def specialized(name: str, operandType: type, operation) -> type[SpecializedBinary] :
+  return type(name, (SpecializedBinary,), {'operandType': operandType, 'operation': operation, '__slots__': (), '__module__': __name__})
+
+SPECIALIZED_BINARIES: dict[tuple[str, type], type[SpecializedBinary]] = {
+  ('PLUS', float): specialized('FloatAdd', float, operator.add),
+  ('MINUS', float): specialized('FloatSubtract', float, operator.sub),
+  ('STAR', float): specialized('FloatMultiply', float, operator.mul),
+  ('SLASH', float): specialized('FloatDivide', float, operator.truediv),
+  ('GREATER', float): specialized('FloatGreater', float, operator.gt),
+  ('GREATER_EQUAL', float): specialized('FloatGreaterEqual', float, operator.ge),
+  ('LESS', float): specialized('FloatLess', float, operator.lt),
+  ('LESS_EQUAL', float): specialized('FloatLessEqual', float, operator.le),
+  ('EQUAL_EQUAL', float): specialized('FloatEqual', float, operator.eq),
+  ('BANG_EQUAL', float): specialized('FloatNotEqual', float, operator.ne),
+  ('PLUS', str): specialized('StringConcat', str, operator.add),
+  ('EQUAL_EQUAL', str): specialized('StringEqual', str, operator.eq),
+  ('BANG_EQUAL', str): specialized('StringNotEqual', str, operator.ne),
+}
+"""(operator type, operands type) -> the specialized node class"""
+# module attributes, so pickle finds the classes of the rewritten nodes by name
+globals().update({cls.__name__: cls for cls in SPECIALIZED_BINARIES.values()})
+
+class Call(Expr) :
+  __slots__ = ('callee', 'paren', 'arguments', 'cache')
+  def __init__(self, callee: Expr, paren : Token, arguments: list[Expr]) :
+    self.callee = callee
+    self.paren = paren
+    self.arguments = arguments
+    self.cache: dict = dict()
+    """inline cache of the interpreter : class called -> its initializer, None once megamorphic"""
+  def accept(self, visitor: Visitor) :
+    return visitor.visitCall(self)
+
+class Invoke(Call) :
+  """A Call of a Get, obj.method(args), run without binding the method first"""
+  __slots__ = ()
+  def accept(self, visitor: Visitor) :
+    return visitor.visitInvoke(self)
+    
+class Literal(Expr) :
+  __slots__ = ('value',)
+  def __init__(self, value) -> None:
+        self.value = value
+  def accept(self, visitor: Visitor) :
+    return visitor.visitLiteral(self)
+
+class Logical(Expr) :
+  __slots__ = ('left', 'operator', 'right')
+  def __init__(self, left :Expr, operator: Token, right :Expr) -> None:
+    self.left = left
+    self.operator = operator
+    self.right = right
+  def accept(self, visitor: Visitor) :
+    return visitor.visitLogicalExpr(self)
+
+class Set(Expr) :
+  __slots__ = ('object', 'token', 'value', 'shape', 'index', 'transition')
+  def __init__(self, object: Expr, token: Token, value: Expr) -> None:
+    self.object = object
+    self.token = token
+    self.value = value
+    self.shape: Shape = None
+    """inline cache of the interpreter : shape of the last instance written, the index of the field in it"""
+    self.index: int = None
+    self.transition: Shape = None
+    """the shape of the instance after the write when it added the field, else None"""
+  def accept(self, visitor: Visitor) :
+    return visitor.visitSet(self)
+
+class Super(Expr) :
+  __slots__ = ('keyword', 'method', 'depth', 'slot')
+  def __init__(self, keyword: Token, method: Token) -> None:
+    self.keyword = keyword
+    self.method = method
+    self.depth: int = None  # see Assign.depth
+    self.slot: int = None
+  def accept(self, visitor: Visitor) :
+    return visitor.visitSuper(self)
+
+class This(Expr) :
+  __slots__ = ('keyword', 'depth', 'slot')
+  def __init__(self, keyword : Token) -> None:
+    self.keyword = keyword
+    self.depth: int = None  # see Assign.depth
+    self.slot: int = None
+  def accept(self, visitor: Visitor) :
+    return visitor.visitThis(self)
+
+class Unary(Expr) :
+  __slots__ = ('operator', 'right')
+  def __init__(self, operator: Token, right :Expr) -> None:
+        self.operator = operator
+        self.right = right
+  def accept(self, visitor: Visitor) :
+    return visitor.visitUnary(self)
+
+class Get(Expr) :
+  __slots__ = ('object', 'token', 'cache', 'shape', 'index', 'line', 'column')
+  def __init__(self, object: Expr, token : Token, line: int = None, column: int = None) -> None :
+    self.object = object
+    self.token = token
+    self.line = line
+    """line and column of the property name, set by the parser, the site of the read in plox.py --count"""
+    self.column = column
+    self.cache: dict = dict()
+    """inline cache of the interpreter : class of the instance -> its method named token, None once megamorphic"""
+    self.shape: Shape = None
+    """inline cache of the interpreter : shape of the last instance the field was read from, the index of the field in it"""
+    self.index: int = None
+  def accept(self, visitor: Visitor) :
+    return visitor.visitGet(self)  
+
+class Grouping(Expr) :
+  __slots__ = ('expression',)
+  def __init__(self, expression : Expr) -> None:
+        self.expression = expression
+  def accept(self, visitor: Visitor) :
+    return visitor.visitGrouping(self)
+
+class Variable(Expr) :
+  __slots__ = ('token', 'depth', 'slot')
+  def __init__(self, token : Token) -> None:
+        self.token = token
+        self.depth: int = None  # see Assign.depth
+        self.slot: int = None
+  def accept(self, visitor: Visitor) :
+    return visitor.visitVariableExpr(self)
+
+
+
+class Visitor(ABC) :
+  @abstractmethod
+  def visitAssignExpr(self, expr : Assign) :
+    pass
+  @abstractmethod
+  def visitBinary(self, expr : Binary) :
+    pass
+  def visitSpecializedBinary(self, expr : SpecializedBinary) :
+    """only the interpreter rewrites nodes, for the other visitors they are Binary nodes"""
+    return self.visitBinary(expr)
+  @abstractmethod
+  def visitCall(self, expr: Call) :
+    pass
+  def visitInvoke(self, expr : Invoke) :
+    """visitors without a faster path for method calls see Call nodes"""
+    return self.visitCall(expr)
+  @abstractmethod
+  def visitLiteral(self, expr : Literal) :
+    pass
+  @abstractmethod
+  def visitLogicalExpr(self, expr : Logical) :
+    pass
+  @abstractmethod
+  def visitSet(self, expr : Set) :
+    pass
+  @abstractmethod
+  def visitSuper(self, expr : Super) :
+    pass
+  @abstractmethod
+  def visitThis(self, expr : This) :
+    pass
+  @abstractmethod
+  def visitUnary(self, expr : Unary) :
+    pass
+  @abstractmethod
+  def visitGet(self, expr : Get) :
+    pass
+  @abstractmethod
+  def visitGrouping(self, expr : Grouping) :
+    pass
+  @abstractmethod
+  def visitVariableExpr(self, expr : Variable) :
     pass
\ No newline at end of file
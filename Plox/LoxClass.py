@@ -1,36 +1,42 @@
-from __future__ import annotations, absolute_import
-from Plox.LoxCallable import LoxCallable
-import Plox.LoxInstance as LoxInstance
-import Plox.LoxFunction as LoxFunction 
-
-class LoxClass(LoxCallable) :
-	def __init__(self, name : str, superClass: LoxClass, methods : dict[str, LoxFunction.LoxFunction]) -> None:
-		self.name = name
-		self.superClass = superClass
-		self.methods = methods
-	
-	def arity(self) -> int:
-		initializer = self.findMethod("init")
-		return initializer.arity() if initializer != None  else 0
-	
-	def call(self, interpreter=None, arguments=[]) :
-		instance = LoxInstance.LoxInstance(self)
-		initializer = self.findMethod("init")
-		if initializer != None :
-			initializer.bind(instance).call(interpreter, arguments)
-		return instance
-	
-	def findMethod(self, name: str) :
-		if name in self.methods :
-			return self.methods[name]
-		if self.superClass != None :
-			return self.superClass.findMethod(name)
-		
-		return None
-	
-	def toString(self) :
-		superClass_str = '< ' + str(self.superClass) if self.superClass != None else ''
-		return self.name + superClass_str
-	
-	def __repr__(self) -> str:
+from __future__ import annotations, absolute_import
+from Plox.LoxCallable import LoxCallable
+import Plox.LoxInstance as LoxInstance
+import Plox.LoxFunction as LoxFunction 
+
+class LoxClass(LoxCallable) :
+	def __init__(self, name : str, superClass: LoxClass, methods : dict[str, LoxFunction.LoxFunction]) -> None:
+		self.name = name
+		self.superClass = superClass
+		self.methods = methods
+		
+		self.methodTable: dict[str, LoxFunction.LoxFunction] = dict(superClass.methodTable) if superClass != None else dict()
+		"""the methods of the class and the inherited ones, flattened once so a lookup never walks the superclasses"""
+		self.methodTable.update(methods)
+		self.initializer = self.methodTable.get("init", None)
+		self.shape = LoxInstance.Shape()
+		"""empty shape of the new instances, the root of the shapes of the instances of this class"""
+	
+	def arity(self) -> int:
+		return self.initializer.arity() if self.initializer != None  else 0
+	
+	def call(self, interpreter=None, arguments=[]) :
+		instance = LoxInstance.LoxInstance(self)
+		observer = interpreter.observer
+		if observer is not None :
+			observer.allocated(instance)
+		if self.initializer != None :
+			initializer = self.initializer.bind(instance)
+			if observer is not None :
+				observer.allocated(initializer)
+			initializer.call(interpreter, arguments)
+		return instance
+	
+	def findMethod(self, name: str) :
+		return self.methodTable.get(name, None)
+	
+	def toString(self) :
+		superClass_str = '< ' + str(self.superClass) if self.superClass != None else ''
+		return self.name + superClass_str
+	
+	def __repr__(self) -> str:
 		return self.toString()
\ No newline at end of file
@@ -1,44 +1,65 @@
-from __future__ import annotations
-from Plox.LoxCallable import LoxCallable
-import Plox.LoxInstance as LoxInstance
-import Plox.Stmt as Stmt
-import Plox.AstInterpreter
-from Plox.Environment import Environment
-from Plox.Return import Return
-
-class LoxFunction(LoxCallable) :  
-	def __init__(self, declaration: Stmt.Function, closure: Environment, isInitializer: bool = False) -> None:
-		self.declaration = declaration
-		self.closure = closure
-		self.isInitializer = isInitializer
-	
-	def arity(self) -> int:
-		return len(self.declaration.params)
-	
-	def call(self, interpreter : Plox.AstInterpreter.AstInterpreter=None, arguments=[]) :
-		environment = Environment(enclosing=self.closure)
-		for i in range(len(self.declaration.params)) :
-			environment.define(self.declaration.params[i].lexeme, arguments[i])
-		
-		try: 
-			interpreter.executeBlock(self.declaration.body, environment)
-		except Return as returnVal :
-			
-			if self.isInitializer :
-				# a empty return in a constructor will return its instance
-				return self.closure.getAt(0, "this")
-						
-			return returnVal.value
-		
-		return None
-	
-	def bind(self, instance : LoxInstance) -> LoxFunction :
-		env = Environment(self.closure)
-		env.define("this", instance)
-		return LoxFunction(self.declaration, env, self.isInitializer)
-	
-	def toString(self) -> str:
-		return f"<fun {self.declaration.token.lexeme} >"
-	
-	def __repr__(self) -> str:
+from __future__ import annotations
+from Plox.LoxCallable import LoxCallable
+import Plox.LoxInstance as LoxInstance
+import Plox.Stmt as Stmt
+import Plox.AstInterpreter
+from Plox.Environment import Environment
+
+class LoxFunction(LoxCallable) :  
+	# __weakref__ for the finalizers of plox.py --allocations
+	__slots__ = ('declaration', 'closure', 'isInitializer', 'receiver', '__weakref__')
+
+	def __init__(self, declaration: Stmt.Function, closure: Environment, isInitializer: bool = False, receiver: LoxInstance.LoxInstance = None) -> None:
+		self.declaration = declaration
+		self.closure = closure
+		self.isInitializer = isInitializer
+		self.receiver = receiver
+		"""the instance a method is bound to, 'this' is the first slot of its scope"""
+	
+	def arity(self) -> int:
+		return len(self.declaration.params)
+	
+	def call(self, interpreter : Plox.AstInterpreter.AstInterpreter=None, arguments=[]) :
+		if self.receiver is not None :
+			return self.callMethod(interpreter, self.receiver, arguments)
+		# the parameters are the first variables of the function scope, in order
+		return self.execute(interpreter, Environment(enclosing=self.closure, slots=list(arguments)))
+	
+	def callMethod(self, interpreter : Plox.AstInterpreter.AstInterpreter, receiver : LoxInstance.LoxInstance, arguments: list) :
+		"""Call the method on receiver, without binding it first"""
+		return self.execute(interpreter, Environment(enclosing=self.closure, slots=[receiver, *arguments]))
+	
+	def execute(self, interpreter : Plox.AstInterpreter.AstInterpreter, environment: Environment) :
+		if interpreter.observer is not None :
+			completion = self.observed(interpreter, environment)
+		else :
+			completion = interpreter.executeBlock(self.declaration.body, environment)
+		if completion is not None :
+			if self.isInitializer :
+				# a empty return in a constructor will return its instance
+				return environment.slots[0]
+			return completion.value
+		return None
+	
+	def observed(self, interpreter, environment: Environment) :
+		"""The completion of the body run in environment, telling the observer of the interpreter"""
+		observer = interpreter.observer
+		observer.allocated(environment)
+		observer.enter(self)
+		try :
+			return self.run(interpreter, environment)
+		finally :
+			observer.leave(self)
+	
+	def run(self, interpreter, environment: Environment) :
+		"""The completion of the body run in environment"""
+		return interpreter.executeBlock(self.declaration.body, environment)
+	
+	def bind(self, instance : LoxInstance) -> LoxFunction :
+		return LoxFunction(self.declaration, self.closure, self.isInitializer, instance)
+	
+	def toString(self) -> str:
+		return f"<fun {self.declaration.token.lexeme} >"
+	
+	def __repr__(self) -> str:
 		return self.toString()
\ No newline at end of file
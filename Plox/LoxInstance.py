@@ -1,29 +1,67 @@
-from __future__ import annotations, absolute_import
-import Plox.LoxClass as LoxClass
-from Plox.Token import Token
-
-class LoxInstance :
-	def __init__(self, klass: LoxClass.LoxClass) -> None :
-		self.klass = klass
-		self.fields : dict[str, object] = dict()
-
-	def toString(self) -> str:
-		if self.klass == None : 
-			return "None instance"
-		return self.klass.name + " instance"
-	
-	def __repr__(self) -> str:
-		return self.toString()
-	
-	def get(self, token: Token) -> object :
-		if token.lexeme in self.fields :
-			return self.fields[token.lexeme]
-		
-		method = self.klass.findMethod(token.lexeme)
-		if method != None :
-			return method.bind(self)
-		
-		raise RuntimeError(token, f"Undefined Property '{token.lexeme}'")
-	
-	def set(self, token: Token, value : object) :
-		self.fields[token.lexeme] = value
\ No newline at end of file
+from __future__ import annotations, absolute_import
+import Plox.LoxClass as LoxClass
+from Plox.Token import Token
+
+class Shape :
+	"""
+	Layout shared by the instances which got the same fields in the same order :
+	the index of each field in LoxInstance.values, and the shapes reached by adding one more field
+	"""
+	__slots__ = ('indices', 'transitions')
+
+	def __init__(self, indices: dict[str, int] = None) -> None :
+		self.indices: dict[str, int] = indices if indices != None else dict()
+		self.transitions: dict[str, Shape] = dict()
+
+	def withField(self, name: str) -> Shape :
+		"""The shape of an instance of this shape once the field name is added, created the first time only"""
+		shape = self.transitions.get(name, None)
+		if shape == None :
+			shape = Shape({**self.indices, name: len(self.indices)})
+			self.transitions[name] = shape
+		return shape
+
+NO_FIELDS = Shape()
+"""shape of the instances without a class"""
+
+class LoxInstance :
+	# __weakref__ for the finalizers of plox.py --allocations
+	__slots__ = ('klass', 'shape', 'values', '__weakref__')
+
+	def __init__(self, klass: LoxClass.LoxClass) -> None :
+		self.klass = klass
+		self.shape: Shape = klass.shape if klass != None else NO_FIELDS
+		"""starts as the empty shape of the class"""
+		self.values: list[object] = []
+		"""the values of the fields, at the index given by the shape"""
+
+	@property
+	def fields(self) -> dict[str, object] :
+		return {name: self.values[index] for name, index in self.shape.indices.items()}
+
+	def toString(self) -> str:
+		if self.klass == None : 
+			return "None instance"
+		return self.klass.name + " instance"
+	
+	def __repr__(self) -> str:
+		return self.toString()
+	
+	def get(self, token: Token) -> object :
+		index = self.shape.indices.get(token.lexeme, None)
+		if index != None :
+			return self.values[index]
+		
+		method = self.klass.findMethod(token.lexeme)
+		if method != None :
+			return method.bind(self)
+		
+		raise RuntimeError(token, f"Undefined Property '{token.lexeme}'")
+	
+	def set(self, token: Token, value : object) :
+		index = self.shape.indices.get(token.lexeme, None)
+		if index != None :
+			self.values[index] = value
+		else :
+			self.shape = self.shape.withField(token.lexeme)
+			self.values.append(value)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+
+class Observer :
+	"""
+	An instrumentation told what a program does by the backend running it (plox.py --stats, --profile...),
+	the backends call the hooks of their observer attribute when it is not None
+	The hooks do nothing here, each instrumentation overrides the ones it needs
+	"""
+	nodes = False
+	"""whether the tree-walk interpreter tells line(), visit() and receiver() too, a call for each node it runs"""
+
+	def enter(self, function) -> None :
+		"""the body of a Lox function starts running, a LoxFunction or a CompiledFunction"""
+
+	def leave(self, function) -> None :
+		"""the body of the function is done, it returned or raised"""
+
+	def allocated(self, object) -> None :
+		"""a runtime object was made : an Environment, a function (a bound method too), a LoxInstance or a LoxArray"""
+
+	def line(self, line: int | None) -> None :
+		"""a statement of this line starts running, or the one running it is back, None outside of any statement"""
+
+	def visit(self, node) -> None :
+		"""a statement or an expression is about to be run by its visit method"""
+
+	def receiver(self, get, klass) -> None :
+		"""the property of the Expr.Get node is read from an object of klass (a LoxClass, or the type of a native object), or its method called on it"""
+
+
+class Observers(Observer) :
+	"""Several observers of the same backend, each one is told everything"""
+	def __init__(self, observers: list[Observer]) -> None:
+		self.observers = observers
+		self.nodes = any(observer.nodes for observer in observers)
+
+	def enter(self, function) -> None :
+		for observer in self.observers :
+			observer.enter(function)
+
+	def leave(self, function) -> None :
+		for observer in self.observers :
+			observer.leave(function)
+
+	def allocated(self, object) -> None :
+		for observer in self.observers :
+			observer.allocated(object)
+
+	def line(self, line: int | None) -> None :
+		for observer in self.observers :
+			observer.line(line)
+
+	def visit(self, node) -> None :
+		for observer in self.observers :
+			observer.visit(node)
+
+	def receiver(self, get, klass) -> None :
+		for observer in self.observers :
+			observer.receiver(get, klass)
\ No newline at end of file
@@ -1,22 +1,208 @@
-
-from Plox.ErrorHandling import ErrorHandling
-from Plox.Scanner import Scanner
-from Plox.Parser import Parser
-from Plox.AstInterpreter import AstInterpreter
-from Plox.AstResolver import AstResolver
-from Plox.Natives import globals
-import Plox.Expr as Expr
-
-
-class Plox :
-    """ The plox interpreter, a tree-walk interpreter """
-    def __init__(self, is_a_test=False) -> None :
-        self.error_handler = ErrorHandling()
-        self.scanner = Scanner(self.error_handler)
-        self.parser = Parser(self.error_handler, self.scanner)
-        
-        self.locals: dict[Expr.Expr, int] = dict()
-        """Map a variable name to how far the scope refered to is, to avoid shadowing problems"""
-        
-        self.astResolver = AstResolver(self.error_handler, self.locals)
-        self.astInterpreter = AstInterpreter(error_handler=self.error_handler, locals=self.locals, env=globals, is_a_test=is_a_test)
\ No newline at end of file
+from contextlib import ExitStack, nullcontext
+from typing import Iterable
+
+from Plox.ErrorHandling import ErrorHandling
+from Plox.Scanner import Scanner
+from Plox.Parser import Parser
+from Plox.AstInterpreter import AstInterpreter
+from Plox.AstResolver import AstResolver
+from Plox.AstOptimizer import AstOptimizer
+from Plox.AstCache import AstCache
+import Plox.Snapshot as Snapshot
+import Plox.Profiler as Profiler
+import Plox.Sampler as Sampler
+import Plox.ExecutionCounts as ExecutionCounts
+import Plox.Allocations as Allocations
+from Plox.Stats import Stats, countNodes
+from Plox.Observer import Observers
+from Plox.VM import VM
+from Plox.ClosureCompiler import ClosureCompiler
+from Plox.PythonTranspiler import PythonTranspiler
+from Plox.Natives import globals
+import Plox.Expr as Expr
+import Plox.Stmt as Stmt
+
+BACKENDS = ('ast', 'closure', 'vm', 'python')
+"""
+'ast' walks the syntax trees, 'closure' compiles each node to a Python closure before running them,
+'vm' compiles them to bytecode run by a stack based VM, 'python' transpiles them to Python source run with exec()
+"""
+
+FEATURES = {
+    'snapshots': Snapshot.BACKENDS,
+    'profile': Profiler.BACKENDS,
+    'sample': Sampler.BACKENDS,
+    'count': ExecutionCounts.BACKENDS,
+    'allocations': Allocations.BACKENDS,
+}
+"""feature -> the backends supporting it, the features not in the table are supported by all of them"""
+
+
+def unsupported(backend: str, features: Iterable[str]) -> str | None :
+    """Error message for the first of the features the backend doesn't support, None when it supports them all"""
+    for feature in features :
+        if backend not in FEATURES[feature] :
+            return f"the {backend} backend doesn't support {feature}, expected one of {FEATURES[feature]}"
+    return None
+
+
+class Plox :
+    """ The plox interpreter, a tree-walk interpreter """
+    def __init__(self, is_a_test=False, backend='ast', optimize=False, cache=False, stats=False, profile=False, sample: float = None, count=False,
+                 allocations=False, memoryLimit: int = None) -> None :
+        if backend not in BACKENDS :
+            raise ValueError(f"Unknown backend {backend}, expected one of {BACKENDS}")
+        features = {'profile': profile, 'sample': sample, 'count': count, 'allocations': allocations or memoryLimit != None}
+        message = unsupported(backend, [feature for feature, enabled in features.items() if enabled])
+        if message != None :
+            raise ValueError(message)
+        self.backend = backend
+        self.error_handler = ErrorHandling()
+        self.scanner = Scanner(self.error_handler)
+        self.parser = Parser(self.error_handler, self.scanner)
+        
+        self.astResolver = AstResolver(self.error_handler)
+        """stores on each variable node how far the scope refered to is, to avoid shadowing problems, and its slot in this scope"""
+        self.stats = Stats() if stats else None
+        """time of the phases and counters, when enabled"""
+        self.profiler = Profiler.Profiler() if profile else None
+        """calls and time of each Lox function and the stacks they ran in, when enabled"""
+        self.sampler = Sampler.Sampler(sample) if sample else None
+        """samples of the Lox lines and stacks running, every sample seconds, when enabled"""
+        self.executionCounts = ExecutionCounts.ExecutionCounts() if count else None
+        """visits, binary operators and global lookups at each line, receiver classes at each property read, when enabled"""
+        self.allocations = Allocations.Allocations(memoryLimit, account=allocations) if allocations or memoryLimit != None else None
+        """runtime objects made by each line and the memory traced, when enabled or to abort the program past memoryLimit bytes"""
+        self.astCache = AstCache() if cache else None
+        """resolved syntax trees of the source files saved on disk, when enabled"""
+        self.astOptimizer = AstOptimizer() if optimize else None
+        """folds constants and removes dead branches between the resolver and the backend, when enabled"""
+        self.astInterpreter = AstInterpreter(error_handler=self.error_handler, env=globals, is_a_test=is_a_test)
+
+        self.executor: AstInterpreter | ClosureCompiler | VM | PythonTranspiler = self.astInterpreter
+        """the object running the resolved statements for the selected backend"""
+        if backend == 'closure' :
+            self.executor = ClosureCompiler(error_handler=self.error_handler, env=globals, is_a_test=is_a_test)
+        if backend == 'vm' :
+            self.executor = VM(error_handler=self.error_handler, env=globals, is_a_test=is_a_test)
+        if backend == 'python' :
+            self.executor = PythonTranspiler(error_handler=self.error_handler, env=globals, is_a_test=is_a_test)
+        observers = [observer for observer in (self.stats, self.profiler, self.executionCounts, self.allocations) if observer != None]
+        if observers :
+            self.executor.observer = observers[0] if len(observers) == 1 else Observers(observers)
+            if self.executor.observer.nodes :
+                # the observers of the nodes are only supported by the tree-walk interpreter
+                self.executor.observeNodes()
+
+    def load(self, source: str, filename: str = None) -> list[Stmt.Stmt] :
+        """
+        Scan, parse and resolve the source of a file, the statements are read from the cache instead when it has them
+        Only the statements without any error are stored in the cache
+        """
+        if self.executionCounts != None and filename != None :
+            self.executionCounts.filename = filename
+        if self.astCache != None and filename != None :
+            with self.phase('cache') :
+                statements = self.astCache.load(filename, source)
+            if statements != None :
+                self.parser.statements = statements
+                self.countNodes(statements)
+                return statements
+        with self.phase('scan') :
+            self.scanner.scan_source(source)
+        with self.phase('parse') :
+            statements = self.parser.parse()
+        with self.phase('resolve') :
+            self.astResolver.resolve(statements)
+        self.countNodes(statements)
+        handler = self.error_handler
+        errors = handler.has_lexical_errors or handler.parser_errors or handler.resolver_errors
+        if self.astCache != None and filename != None and not errors :
+            self.astCache.store(filename, source, statements)
+        return statements
+
+    def interpret(self, statements: list[Stmt.Stmt] | Expr.Expr) :
+        """Execute resolved statements, or evaluate an expression, with the selected backend"""
+        if self.astOptimizer != None :
+            with self.phase('optimize') :
+                statements = self.astOptimizer.optimize(statements)
+        if self.stats == None and self.profiler == None and self.sampler == None and self.executionCounts == None and self.allocations == None :
+            return self.executor.interpret(statements)
+        with ExitStack() as contexts :
+            if self.stats != None :
+                contexts.enter_context(self.stats.phase('interpret'))
+                contexts.enter_context(self.stats.counting(self.executor))
+            if self.profiler != None :
+                contexts.enter_context(self.profiler.profiling())
+            if self.sampler != None :
+                contexts.enter_context(self.sampler.sampling())
+            if self.executionCounts != None :
+                contexts.enter_context(self.executionCounts.counting())
+            if self.allocations != None :
+                contexts.enter_context(self.allocations.tracking())
+            return self.executor.interpret(statements)
+
+    def phase(self, name: str) :
+        """Context timing the phase name, when the stats are enabled"""
+        return nullcontext() if self.stats == None else self.stats.phase(name)
+
+    def countNodes(self, statements: list[Stmt.Stmt]) -> None :
+        if self.stats != None :
+            nodes, locals = countNodes(statements)
+            self.stats.counters['nodes'] += nodes
+            self.stats.counters['resolved locals'] += locals
+
+    def statistics(self) -> dict :
+        """Time of each phase (wall and CPU seconds) and the counters, None when the stats are not enabled"""
+        if self.stats == None :
+            return None
+        counters = self.stats.counters
+        counters['tokens'] = self.scanner.tokens.discarded + len(self.scanner.tokens)
+        handler = self.error_handler
+        # a runtime exception ends the run it is raised in, the backends report each one
+        counters['exceptions'] = len(handler.astInterpreter_errors)
+        counters['errors'] = len(handler.lexical_errors) + len(handler.parser_errors) + len(handler.resolver_errors)
+        if self.backend == 'python' :
+            # the transpiled functions call each other directly
+            counters['calls'] = None
+        # only the VM has its own call frames, the other backends nest Python calls
+        frameStats = getattr(self.executor, 'frameStats', None)
+        counters['frames pushed'] = frameStats['pushed'] if frameStats != None else None
+        counters['max depth'] = frameStats['max depth'] if frameStats != None else None
+        return self.stats.asDict()
+
+    def runStream(self, lines: Iterable[str]) -> None :
+        """
+        Scan, parse, resolve and execute the top-level declarations one at a time,
+        so only the tokens and the syntax tree of the current one are in memory
+        After the first error nothing more is executed, the rest is still read to report the syntax errors
+        """
+        handler = self.error_handler
+        declarations = self.parser.declarations(self.scanner.scan_lines(lines))
+        while True :
+            # the declarations are scanned and parsed together
+            with self.phase('scan and parse') :
+                statement = next(declarations, declarations)
+            if statement is declarations :
+                break
+            if handler.has_lexical_errors or handler.parser_errors or handler.resolver_errors or handler.astInterpreter_errors :
+                continue
+            with self.phase('resolve') :
+                self.astResolver.resolve([statement])
+            self.countNodes([statement])
+            if not handler.resolver_errors :
+                self.interpret([statement])
+
+    def saveSnapshot(self, path: str) -> None :
+        """Save the global variables, for example after running a prelude, to be restored by loadSnapshot()"""
+        Snapshot.save(path, self.executor.env, self.backend)
+
+    def loadSnapshot(self, path: str) -> None :
+        """Replace the global variables by the ones of a snapshot saved with the same backend"""
+        compiler = self.executor if self.backend == 'closure' else None
+        Snapshot.load(path, self.executor.env, self.backend, compiler)
+
+    @property
+    def printed(self) -> list :
+        """what the program printed, when run as a test"""
+        return self.executor.printed
\ No newline at end of file
@@ -0,0 +1,94 @@
+from __future__ import annotations
+import time
+from contextlib import contextmanager
+import Plox.Stmt as Stmt
+from Plox.LoxFunction import LoxFunction
+from Plox.Observer import Observer
+
+BACKENDS = ('ast', 'closure')
+"""the backends telling their observer the Lox calls, the VM and the transpiled code call the functions themselves"""
+
+SCRIPT = '<script>'
+"""name of the outermost frame, the top-level statements"""
+
+
+def frameName(declaration: Stmt.Function) -> str :
+	return f"{declaration.token.lexeme}:{declaration.line}"
+
+
+class Profiler(Observer) :
+	"""
+	Deterministic profiler of the Lox functions, for plox.py --profile
+	Every call is timed, and its stack of Lox functions (name and line of their declaration) is recorded,
+	as the observer of the backend
+	"""
+	def __init__(self) -> None:
+		self.functions: dict[Stmt.Function, list[int]] = dict()
+		"""declaration -> [calls, self ns, cumulative ns], a recursive call is counted once in the cumulative time"""
+		self.root: list = [0, dict()]
+		"""tree of the stacks, each node is [self ns, {declaration: node of the function called from there}]"""
+		self.stack: list[list] = []
+		"""frames running, each is [node, ns spent in the functions it called, start]"""
+		self.active: dict[Stmt.Function, int] = dict()
+		"""declaration -> how many of its calls are on the stack"""
+
+	def enter(self, function: LoxFunction) -> None :
+		declaration = function.declaration
+		children = self.stack[-1][0][1]
+		node = children.get(declaration, None)
+		if node == None :
+			node = children[declaration] = [0, dict()]
+		self.active[declaration] = self.active.get(declaration, 0) + 1
+		self.stack.append([node, 0, time.perf_counter_ns()])
+
+	def leave(self, function: LoxFunction) -> None :
+		node, called, start = self.stack.pop()
+		elapsed = time.perf_counter_ns() - start
+		self.stack[-1][1] += elapsed
+		node[0] += elapsed - called
+		declaration = function.declaration
+		entry = self.functions.get(declaration, None)
+		if entry == None :
+			entry = self.functions[declaration] = [0, 0, 0]
+		entry[0] += 1
+		entry[1] += elapsed - called
+		self.active[declaration] -= 1
+		if self.active[declaration] == 0 :
+			entry[2] += elapsed
+
+	@contextmanager
+	def profiling(self) :
+		"""Time the script while in this context, the time outside of any function goes to SCRIPT"""
+		frame = [self.root, 0, time.perf_counter_ns()]
+		self.stack.append(frame)
+		try :
+			yield
+		finally :
+			self.stack.pop()
+			self.root[0] += time.perf_counter_ns() - frame[2] - frame[1]
+
+	def folded(self) -> str :
+		"""
+		The stacks in the folded format of flamegraph.pl and speedscope : one line per stack, its frames separated by ';'
+		followed by the microseconds spent in its last function itself
+		"""
+		lines = []
+		nodes = [((SCRIPT,), self.root)]
+		while nodes :
+			names, (ns, children) = nodes.pop()
+			if ns // 1000 > 0 :
+				lines.append(f"{';'.join(names)} {ns // 1000}")
+			nodes.extend((names + (frameName(declaration),), node) for declaration, node in children.items())
+		return '\n'.join(sorted(lines))
+
+	def entries(self) -> list[tuple[str, int, float, float]] :
+		"""(function, calls, self ms, cumulative ms) of each function, the most time spent in itself first"""
+		entries = [(frameName(declaration), calls, ns / 1e6, cumulative / 1e6) for declaration, (calls, ns, cumulative) in self.functions.items()]
+		return sorted(entries, key=lambda entry: entry[2], reverse=True)
+
+	def report(self) -> str :
+		lines = [f"{'calls':>10}{'self ms':>12}{'cum ms':>12}  function"]
+		for name, calls, ns, cumulative in self.entries() :
+			lines.append(f"{calls:>10}{ns:12.2f}{cumulative:12.2f}  {name}")
+		lines.append(f"{'':>10}{self.root[0] / 1e6:12.2f}{'':>12}  {SCRIPT}")
+		return '\n'.join(lines)
\ No newline at end of file
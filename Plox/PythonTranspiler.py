@@ -0,0 +1,539 @@
+from __future__ import annotations
+from functools import partial
+import Plox.Expr as Expr
+import Plox.Stmt as Stmt
+from Plox.Environment import Environment
+from Plox.LoxCallable import LoxCallable
+from Plox.LoxClass import LoxClass
+from Plox.LoxInstance import LoxInstance
+from Plox.Token import Token
+from Plox.ErrorHandling import ErrorHandling
+from Plox.Observer import Observer
+
+BINARY_OPERATORS = {
+	'PLUS': '+', 'MINUS': '-', 'STAR': '*', 'SLASH': '/',
+	'GREATER': '>', 'GREATER_EQUAL': '>=', 'LESS': '<', 'LESS_EQUAL': '<=',
+	'EQUAL_EQUAL': '==', 'BANG_EQUAL': '!=',
+}
+COMPARISONS = ('GREATER', 'GREATER_EQUAL', 'LESS', 'LESS_EQUAL', 'EQUAL_EQUAL', 'BANG_EQUAL')
+"""operators always producing a bool, whose Python truthiness is the Lox one"""
+
+
+class PyFunction(LoxCallable) :
+	"""A Lox function transpiled to a Python function, methods take the receiver as first argument"""
+	def __init__(self, name: str, fn, nparams: int) -> None:
+		self.name = name
+		self.fn = fn
+		self.nparams = nparams
+
+	def arity(self) -> int:
+		return self.nparams
+
+	def call(self, interpreter=None, arguments=[]) :
+		return self.fn(*arguments)
+
+	def bind(self, instance: LoxInstance) -> PyFunction :
+		return PyFunction(self.name, partial(self.fn, instance), self.nparams)
+
+	def toString(self) -> str:
+		return f"<fun {self.name} >"
+
+	def __repr__(self) -> str:
+		return self.toString()
+
+
+class Declaration :
+	"""A local variable of the Lox program and the Python name it is given"""
+	def __init__(self, pyName: str, function: Stmt.Function) -> None:
+		self.pyName = pyName
+		self.function = function
+		"""the function declaring it, None for the top level"""
+		self.captured = False
+		self.assigned = False
+		self.initialized = False
+		self.capturedUninitialized = False
+
+	@property
+	def boxed(self) -> bool :
+		"""captured and mutable : stored in a one element list shared with the closures, else captured by value"""
+		return self.captured and (self.assigned or self.capturedUninitialized)
+
+
+class ScopeAnalyzer(Expr.Visitor, Stmt.Visitor) :
+	"""
+	First pass of the transpiler : bind each variable use to its declaration, found at the depth and slot
+	AstResolver stored on the node, and find the variables captured by nested functions
+	The scopes are opened and filled in the order of the resolver, so the slots are the indices of the declarations
+	"""
+	def __init__(self) -> None:
+		self.scopes: list[list[Declaration]] = []
+		self.functions: list[Stmt.Function] = [None]
+		self.declarations: dict[object, Declaration] = dict()
+		"""declaring node (Stmt.Var, Stmt.Function, Stmt.Class...) or (function, index of a parameter) -> declaration, not a Token, they are shared"""
+		self.references: dict[Expr.Expr, Declaration] = dict()
+		"""variable use (or (Expr.Super, 'this') for the instance a super call reads) -> declaration, absent for globals"""
+		self.freeVariables: dict[Stmt.Function, list[Declaration]] = dict()
+		"""function -> declarations of enclosing functions it needs, itself or through its nested functions"""
+		self.counter = 0
+
+	def analyze(self, node: list[Stmt.Stmt] | Stmt.Stmt | Expr.Expr) :
+		if isinstance(node, list) :
+			for statement in node :
+				statement.accept(self)
+		elif node != None :
+			node.accept(self)
+
+	def declare(self, key: object, name: str) -> Declaration :
+		if not self.scopes :
+			return None
+		self.counter += 1
+		declaration = Declaration(f"{name}_{self.counter}", self.functions[-1])
+		self.declarations[key] = declaration
+		self.scopes[-1].append(declaration)
+		return declaration
+
+	def reference(self, key: object, depth: int, slot: int, isAssignment: bool = False) :
+		if depth == None :
+			return
+		declaration = self.scopes[-1 - depth][slot]
+		self.references[key] = declaration
+		declaration.assigned |= isAssignment
+		if declaration.function is self.functions[-1] :
+			return
+		declaration.captured = True
+		declaration.capturedUninitialized |= not declaration.initialized
+		for function in reversed(self.functions) :
+			if function is declaration.function :
+				break
+			if declaration not in self.freeVariables[function] :
+				self.freeVariables[function].append(declaration)
+
+	def function(self, stmt: Stmt.Function, isMethod: bool) :
+		self.freeVariables[stmt] = []
+		self.functions.append(stmt)
+		self.scopes.append([])
+		if isMethod :
+			self.declare((stmt, 'this'), 'this').initialized = True
+		for index, param in enumerate(stmt.params) :
+			self.declare((stmt, index), param.lexeme).initialized = True
+		self.analyze(stmt.body)
+		self.scopes.pop()
+		self.functions.pop()
+
+	# Expressions
+
+	def visitAssignExpr(self, expr: Expr.Assign) :
+		self.analyze(expr.expr)
+		self.reference(expr, expr.depth, expr.slot, isAssignment=True)
+
+	def visitBinary(self, expr: Expr.Binary) :
+		self.analyze(expr.left)
+		self.analyze(expr.right)
+
+	def visitCall(self, expr: Expr.Call) :
+		self.analyze(expr.callee)
+		self.analyze(expr.arguments)
+
+	def visitLiteral(self, expr: Expr.Literal) :
+		pass
+
+	def visitLogicalExpr(self, expr: Expr.Logical) :
+		self.analyze(expr.left)
+		self.analyze(expr.right)
+
+	def visitSet(self, expr: Expr.Set) :
+		self.analyze(expr.object)
+		self.analyze(expr.value)
+
+	def visitSuper(self, expr: Expr.Super) :
+		self.reference(expr, expr.depth, expr.slot)
+		# the instance is the first variable of the method scope, just inside the 'super' one
+		self.reference((expr, 'this'), expr.depth - 1, 0)
+
+	def visitThis(self, expr: Expr.This) :
+		self.reference(expr, expr.depth, expr.slot)
+
+	def visitUnary(self, expr: Expr.Unary) :
+		self.analyze(expr.right)
+
+	def visitGet(self, expr: Expr.Get) :
+		self.analyze(expr.object)
+
+	def visitGrouping(self, expr: Expr.Grouping) :
+		self.analyze(expr.expression)
+
+	def visitVariableExpr(self, expr: Expr.Variable) :
+		self.reference(expr, expr.depth, expr.slot)
+
+	# Statements
+
+	def visitBlockStmt(self, stmt: Stmt.Block) :
+		self.scopes.append([])
+		self.analyze(stmt.statements)
+		self.scopes.pop()
+
+	def visitClassStmt(self, stmt: Stmt.Class) :
+		declaration = self.declare(stmt, stmt.token.lexeme)
+		self.analyze(stmt.superClass)
+		if stmt.superClass != None :
+			self.scopes.append([])
+			self.declare((stmt, 'super'), 'super').initialized = True
+		for method in stmt.methods :
+			self.function(method, isMethod=True)
+		if stmt.superClass != None :
+			self.scopes.pop()
+		if declaration != None :
+			declaration.initialized = True
+
+	def visitExpressionStmt(self, stmt: Stmt.Expression) :
+		self.analyze(stmt.expression)
+
+	def visitFunctionStmt(self, stmt: Stmt.Function) :
+		declaration = self.declare(stmt, stmt.token.lexeme)
+		self.function(stmt, isMethod=False)
+		if declaration != None :
+			declaration.initialized = True
+
+	def visitIfStmt(self, stmt: Stmt.If) :
+		self.analyze(stmt.condition)
+		self.analyze(stmt.thenBranch)
+		self.analyze(stmt.elseBranch)
+
+	def visitPrintStmt(self, stmt: Stmt.Print) :
+		self.analyze(stmt.expression)
+
+	def visitReturnStmt(self, stmt: Stmt.Return) :
+		self.analyze(stmt.value)
+
+	def visitVarStmt(self, stmt: Stmt.Var) :
+		self.analyze(stmt.initializer)
+		declaration = self.declare(stmt, stmt.token.lexeme)
+		if declaration != None :
+			declaration.initialized = True
+
+	def visitWhileStmt(self, stmt: Stmt.While) :
+		self.analyze(stmt.condition)
+		self.analyze(stmt.body)
+
+
+class PythonTranspiler(Expr.Visitor, Stmt.Visitor) :
+	"""
+	Translate the syntax trees into Python source code, compiled with compile() and run with exec()
+	LoxClass, LoxInstance and the natives stay the runtime library of the generated code
+	"""
+	def __init__(self, error_handler: ErrorHandling, env=Environment(), is_a_test=False) -> None:
+		self.env = env
+		"""the globals"""
+		self.error_handler = error_handler
+		self.is_a_test = is_a_test
+		self.printed: list[str] = []
+		self.source = ''
+		"""the Python code generated for the last program, kept for inspection"""
+		self.observer: Observer = None
+		"""told the instances the classes make, by plox.py --stats, None when off"""
+
+	def interpret(self, statements: list[Stmt.Stmt] | Expr.Expr) :
+		try :
+			self.source = self.transpile(statements)
+			namespace = self.runtimeNamespace()
+			exec(compile(self.source, '<lox>', 'exec'), namespace)
+			return namespace['_main']()
+		except Exception as e :
+			self.error_handler.error(ori='astInterpreter', message=e)
+
+	def transpile(self, statements: list[Stmt.Stmt] | Expr.Expr) -> str :
+		"""Python source of a module defining _main(), which runs the program or returns the expression value (REPL)"""
+		self.scopes = ScopeAnalyzer()
+		self.scopes.analyze(statements)
+		self.lines: list[str] = []
+		self.indent = 0
+		self.tokens: list[Token] = []
+		self.counter = 0
+		self.currentFunction: Stmt.Function = None
+
+		self.emit('def _main() :')
+		self.indent += 1
+		if isinstance(statements, Expr.Expr) :
+			self.emit(f"return {self.expression(statements)}")
+		else :
+			self.block(statements)
+		self.indent -= 1
+		return '\n'.join(self.lines) + '\n'
+
+	def runtimeNamespace(self) -> dict[str, object] :
+		"""Helpers the generated code calls"""
+		globalValues = self.env.values
+		tokens = self.tokens
+		interpreter = self
+
+		def call(callee, *arguments) :
+			if type(callee) == PyFunction and callee.nparams == len(arguments) :
+				return callee.fn(*arguments)
+			if callee.arity() != len(arguments) :
+				raise RuntimeError(f"Expected {callee.arity()} arguments but got {len(arguments)} .")
+			return callee.call(interpreter, list(arguments))
+
+		def get(object, token: Token) :
+			if isinstance(object, LoxInstance) :
+				return object.get(token)
+			raise RuntimeError(token, "Only intances have properties.")
+
+		def invoke(object, token: Token, *arguments) :
+			if type(object) == LoxInstance and token.lexeme not in object.shape.indices :
+				method = object.klass.findMethod(token.lexeme)
+				if type(method) == PyFunction and method.nparams == len(arguments) :
+					# call the method with its receiver without binding it
+					return method.fn(object, *arguments)
+			return call(get(object, token), *arguments)
+
+		def set(object, token: Token, value) :
+			if not isinstance(object, LoxInstance) :
+				raise RuntimeError(token, "Only intances have fields.")
+			object.set(token, value)
+			return value
+
+		def superMethod(superClass: LoxClass, instance: LoxInstance, token: Token) :
+			method = superClass.findMethod(token.lexeme)
+			if method == None :
+				raise RuntimeError(token, "Undefined property '" + token.lexeme + "'.")
+			return method.bind(instance)
+
+		def undefined(name: str) :
+			raise RuntimeError(Token('IDENTIFIER', name), f"Undefined variable ' {name} '.")
+
+		def setGlobal(name: str, value) :
+			if name not in globalValues :
+				raise RuntimeError(Token('IDENTIFIER', name), f"Undefined variable ' {name} '.")
+			globalValues[name] = value
+			return value
+
+		def setBox(box: list, value) :
+			box[0] = value
+			return value
+
+		def superClassOf(superClass) :
+			if not isinstance(superClass, LoxClass) :
+				raise RuntimeError("SuperClass must be a class")
+			return superClass
+
+		return {
+			'_G': globalValues, '_K': tokens, '_PyFunction': PyFunction, '_LoxClass': LoxClass,
+			'_call': call, '_get': get, '_invoke': invoke, '_set': set, '_super': superMethod,
+			'_setglobal': setGlobal, '_undefined': undefined, '_setbox': setBox, '_superclass': superClassOf, '_print': self.printValue,
+		}
+
+	def printValue(self, value: object) :
+		if self.is_a_test :
+			self.printed.append(value)
+		else :
+			print(value)
+
+	# Code generation helpers
+
+	def emit(self, line: str) :
+		self.lines.append('\t' * self.indent + line)
+
+	def block(self, statements: list[Stmt.Stmt]) :
+		"""Emit statements as the body of a Python block, which can not be empty"""
+		count = len(self.lines)
+		for statement in statements :
+			statement.accept(self)
+		if len(self.lines) == count :
+			self.emit('pass')
+
+	def body(self, statement: Stmt.Stmt) :
+		self.block(statement.statements if isinstance(statement, Stmt.Block) else [statement])
+
+	def expression(self, expr: Expr.Expr) -> str :
+		return expr.accept(self)
+
+	def condition(self, expr: Expr.Expr) -> str :
+		"""Python expression which is true iff expr is truthy in Lox : neither None nor false"""
+		if isinstance(expr, Expr.Binary) and expr.operator.type in COMPARISONS :
+			return self.expression(expr)
+		temporary = self.temporary()
+		return f"(({temporary} := {self.expression(expr)}) is not None and {temporary} is not False)"
+
+	def temporary(self) -> str :
+		self.counter += 1
+		return f"_t{self.counter}"
+
+	def token(self, token: Token) -> str :
+		self.tokens.append(token)
+		return f"_K[{len(self.tokens) - 1}]"
+
+	def read(self, expr: Expr.Expr, name: str) -> str :
+		declaration = self.scopes.references.get(expr, None)
+		if declaration == None :
+			# the membership test keeps the read inline, the helper only raises
+			return f"(_G[{name!r}] if {name!r} in _G else _undefined({name!r}))"
+		return declaration.pyName + ('[0]' if declaration.boxed else '')
+
+	def define(self, key: object, name: str, value: str) :
+		"""Emit the definition of a new variable"""
+		declaration = self.scopes.declarations.get(key, None)
+		if declaration == None :
+			self.emit(f"_G[{name!r}] = {value}")
+		elif declaration.boxed :
+			self.emit(f"{declaration.pyName} = [{value}]")
+		else :
+			self.emit(f"{declaration.pyName} = {value}")
+
+	def function(self, stmt: Stmt.Function, isMethod: bool) -> str :
+		"""Emit the def of a function, return the name of the Python function"""
+		self.counter += 1
+		pyName = f"_fn{self.counter}"
+		params = []
+		if isMethod :
+			params.append(self.scopes.declarations[(stmt, 'this')].pyName)
+		params += [self.scopes.declarations[(stmt, index)].pyName for index in range(len(stmt.params))]
+		free = [f"{declaration.pyName}={declaration.pyName}" for declaration in self.scopes.freeVariables[stmt]]
+		if free :
+			params.append('*')
+			params += free
+		self.emit(f"def {pyName}({', '.join(params)}) :")
+		self.indent += 1
+		self.emit(f"# {'method' if isMethod else 'fun'} {stmt.token.lexeme}")
+		for index in range(len(stmt.params)) :
+			declaration = self.scopes.declarations[(stmt, index)]
+			if declaration.boxed :
+				self.emit(f"{declaration.pyName} = [{declaration.pyName}]")
+		enclosing = self.currentFunction
+		self.currentFunction = stmt
+		self.block(stmt.body)
+		self.currentFunction = enclosing
+		self.indent -= 1
+		return pyName
+
+	# Expressions
+
+	def visitAssignExpr(self, expr: Expr.Assign) :
+		value = self.expression(expr.expr)
+		declaration = self.scopes.references.get(expr, None)
+		if declaration == None :
+			return f"_setglobal({expr.token.lexeme!r}, {value})"
+		if declaration.boxed :
+			return f"_setbox({declaration.pyName}, {value})"
+		return f"({declaration.pyName} := {value})"
+
+	def visitBinary(self, expr: Expr.Binary) :
+		return f"({self.expression(expr.left)} {BINARY_OPERATORS[expr.operator.type]} {self.expression(expr.right)})"
+
+	def visitCall(self, expr: Expr.Call) :
+		arguments = [self.expression(argument) for argument in expr.arguments]
+		if isinstance(expr.callee, Expr.Get) :
+			return f"_invoke({', '.join([self.expression(expr.callee.object), self.token(expr.callee.token)] + arguments)})"
+		return f"_call({', '.join([self.expression(expr.callee)] + arguments)})"
+
+	def visitLiteral(self, expr: Expr.Literal) :
+		if type(expr.value) == float and expr.value - expr.value != 0 :
+			# inf and nan, which a folded constant can be, have no literal in Python
+			return f"float('{expr.value}')"
+		return repr(expr.value)
+
+	def visitLogicalExpr(self, expr: Expr.Logical) :
+		temporary = self.temporary()
+		left = self.expression(expr.left)
+		right = self.expression(expr.right)
+		truthy = f"({temporary} := {left}) is not None and {temporary} is not False"
+		if expr.operator.type == 'OR' :
+			return f"({temporary} if {truthy} else {right})"
+		return f"({right} if {truthy} else {temporary})"
+
+	def visitSet(self, expr: Expr.Set) :
+		return f"_set({self.expression(expr.object)}, {self.token(expr.token)}, {self.expression(expr.value)})"
+
+	def visitSuper(self, expr: Expr.Super) :
+		return f"_super({self.read(expr, 'super')}, {self.read((expr, 'this'), 'this')}, {self.token(expr.method)})"
+
+	def visitThis(self, expr: Expr.This) :
+		return self.read(expr, 'this')
+
+	def visitUnary(self, expr: Expr.Unary) :
+		if expr.operator.type == 'MINUS' :
+			return f"(-{self.expression(expr.right)})"
+		# the negated truthiness, as in AstInterpreter.visitUnary
+		return f"(-{self.condition(expr.right)})"
+
+	def visitGet(self, expr: Expr.Get) :
+		return f"_get({self.expression(expr.object)}, {self.token(expr.token)})"
+
+	def visitGrouping(self, expr: Expr.Grouping) :
+		return self.expression(expr.expression)
+
+	def visitVariableExpr(self, expr: Expr.Variable) :
+		return self.read(expr, expr.token.lexeme)
+
+	# Statements
+
+	def visitBlockStmt(self, stmt: Stmt.Block) :
+		for statement in stmt.statements :
+			statement.accept(self)
+
+	def visitClassStmt(self, stmt: Stmt.Class) :
+		name = stmt.token.lexeme
+		superClass = 'None'
+		if stmt.superClass != None :
+			superClass = self.temporary()
+			self.emit(f"{superClass} = _superclass({self.expression(stmt.superClass)})")
+		self.define(stmt, name, 'None')
+		if stmt.superClass != None :
+			self.define((stmt, 'super'), 'super', superClass)
+		methods = []
+		for method in stmt.methods :
+			pyName = self.function(method, isMethod=True)
+			methods.append(f"{method.token.lexeme!r}: _PyFunction({method.token.lexeme!r}, {pyName}, {len(method.params)})")
+		klass = f"_LoxClass({name!r}, {superClass}, {{{', '.join(methods)}}})"
+		declaration = self.scopes.declarations.get(stmt, None)
+		if declaration == None :
+			self.emit(f"_G[{name!r}] = {klass}")
+		else :
+			self.emit(f"{declaration.pyName}{'[0]' if declaration.boxed else ''} = {klass}")
+
+	def visitExpressionStmt(self, stmt: Stmt.Expression) :
+		expr = stmt.expression
+		if isinstance(expr, Expr.Assign) :
+			declaration = self.scopes.references.get(expr, None)
+			if declaration != None :
+				self.emit(f"{declaration.pyName}{'[0]' if declaration.boxed else ''} = {self.expression(expr.expr)}")
+				return
+		self.emit(self.expression(expr))
+
+	def visitFunctionStmt(self, stmt: Stmt.Function) :
+		declaration = self.scopes.declarations.get(stmt, None)
+		if declaration != None and declaration.boxed :
+			# the box exists before the def so the function can refer to itself
+			self.emit(f"{declaration.pyName} = [None]")
+		pyName = self.function(stmt, isMethod=False)
+		function = f"_PyFunction({stmt.token.lexeme!r}, {pyName}, {len(stmt.params)})"
+		if declaration == None :
+			self.emit(f"_G[{stmt.token.lexeme!r}] = {function}")
+		else :
+			self.emit(f"{declaration.pyName}{'[0]' if declaration.boxed else ''} = {function}")
+
+	def visitIfStmt(self, stmt: Stmt.If) :
+		self.emit(f"if {self.condition(stmt.condition)} :")
+		self.indent += 1
+		self.body(stmt.thenBranch)
+		self.indent -= 1
+		if stmt.elseBranch != None :
+			self.emit('else :')
+			self.indent += 1
+			self.body(stmt.elseBranch)
+			self.indent -= 1
+
+	def visitPrintStmt(self, stmt: Stmt.Print) :
+		self.emit(f"_print({self.expression(stmt.expression)})")
+
+	def visitReturnStmt(self, stmt: Stmt.Return) :
+		self.emit(f"return {self.expression(stmt.value) if stmt.value != None else 'None'}")
+
+	def visitVarStmt(self, stmt: Stmt.Var) :
+		value = self.expression(stmt.initializer) if stmt.initializer != None else 'None'
+		self.define(stmt, stmt.token.lexeme, value)
+
+	def visitWhileStmt(self, stmt: Stmt.While) :
+		self.emit(f"while {self.condition(stmt.condition)} :")
+		self.indent += 1
+		self.body(stmt.body)
+		self.indent -= 1
\ No newline at end of file
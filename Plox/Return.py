@@ -1,3 +1,8 @@
-class Return(RuntimeError) :
-	def __init__(self, value) :
+class Return :
+	"""
+	Completion of a return statement : the statements return it to the enclosing ones up to the call,
+	all the other statements complete with None
+	"""
+	__slots__ = ('value',)
+	def __init__(self, value) :
 		self.value = value
\ No newline at end of file
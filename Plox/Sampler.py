@@ -0,0 +1,123 @@
+from __future__ import annotations
+import signal
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+import Plox.Stmt as Stmt
+from Plox.AstInterpreter import AstInterpreter
+from Plox.LoxFunction import LoxFunction
+from Plox.Profiler import SCRIPT, frameName
+
+BACKENDS = ('ast',)
+"""the backends whose Python stack tells the Lox statements and calls running, the others run compiled code"""
+
+EXECUTE_STATEMENT = (AstInterpreter.execute.__code__, AstInterpreter.observedExecute.__code__)
+"""code of the frames running a statement, it is their local stmt, observed when other instrumentations want the nodes"""
+EXECUTE_FUNCTION = LoxFunction.execute.__code__
+"""code of the frames running the body of a Lox function, it is their local self"""
+
+
+class Sampler :
+	"""
+	Sampling profiler of the Lox programs, for plox.py --sample
+	At each tick of a timer the Python stack of the interpreter is walked : the statements being executed give
+	the Lox lines, the frames of LoxFunction.execute give the Lox call stack
+	Nothing is wrapped, the program only pays for the ticks
+	"""
+	def __init__(self, interval: float = 0.001) -> None:
+		self.interval = interval
+		"""seconds of CPU time between two samples, of wall time when sampled by a thread"""
+		self.samples = 0
+		"""ticks which found a Lox statement running"""
+		self.lines: Counter[int] = Counter()
+		"""line -> samples where its statement was the innermost running"""
+		self.linesTotal: Counter[int] = Counter()
+		"""line -> samples where its statement was running, itself or a statement or function it called"""
+		self.functions: Counter[Stmt.Function | None] = Counter()
+		"""declaration (None for the top-level statements) -> samples in its own statements"""
+		self.functionsTotal: Counter[Stmt.Function | None] = Counter()
+		"""declaration -> samples with the function on the stack"""
+		self.stacks: Counter[tuple[Stmt.Function, ...]] = Counter()
+		"""Lox call stack, outermost first -> samples"""
+
+	def sample(self, frame) -> None :
+		"""Record the Lox line and the call stack of frame, the innermost one running"""
+		line = None
+		lines = set()
+		stack = []
+		while frame != None :
+			code = frame.f_code
+			if code in EXECUTE_STATEMENT :
+				statementLine = getattr(frame.f_locals['stmt'], 'line', None)
+				if statementLine != None :
+					if line == None :
+						line = statementLine
+					lines.add(statementLine)
+			elif code is EXECUTE_FUNCTION :
+				stack.append(frame.f_locals['self'].declaration)
+			frame = frame.f_back
+		if line == None :
+			return
+		self.samples += 1
+		self.lines[line] += 1
+		self.linesTotal.update(lines)
+		self.functions[stack[0] if stack else None] += 1
+		self.functionsTotal.update(set(stack))
+		stack.reverse()
+		self.stacks[tuple(stack)] += 1
+
+	@contextmanager
+	def sampling(self) :
+		"""
+		Sample the program run while in this context, with a SIGPROF timer when possible,
+		else (no setitimer, not the main thread) with a thread looking at the stack of this one
+		"""
+		if hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread() :
+			previous = signal.signal(signal.SIGPROF, lambda signum, frame : self.sample(frame))
+			signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+			try :
+				yield
+			finally :
+				signal.setitimer(signal.ITIMER_PROF, 0)
+				signal.signal(signal.SIGPROF, previous)
+			return
+		ident = threading.get_ident()
+		stopped = threading.Event()
+		def sampleThread() :
+			while not stopped.wait(self.interval) :
+				self.sample(sys._current_frames().get(ident, None))
+		thread = threading.Thread(target=sampleThread, daemon=True)
+		thread.start()
+		try :
+			yield
+		finally :
+			stopped.set()
+			thread.join()
+
+	def folded(self) -> str :
+		"""The sampled stacks in the folded format of flamegraph.pl and speedscope, with their number of samples"""
+		lines = [f"{';'.join((SCRIPT,) + tuple(frameName(declaration) for declaration in stack))} {count}" for stack, count in self.stacks.items()]
+		return '\n'.join(sorted(lines))
+
+	def annotate(self, source: str) -> str :
+		"""source with the percentage of the samples in each line, itself and with what it called"""
+		lines = [f"{'self':>7}{'total':>7}"]
+		for number, text in enumerate(source.split('\n'), 1) :
+			if number in self.linesTotal :
+				lines.append(f"{self.percent(self.lines[number]):>7}{self.percent(self.linesTotal[number]):>7}{number:>6}  {text}")
+			else :
+				lines.append(f"{'':>14}{number:>6}  {text}")
+		return '\n'.join(lines)
+
+	def percent(self, count: int) -> str :
+		return f"{100 * count / self.samples:.1f}%" if count else ''
+
+	def report(self) -> str :
+		lines = [f"{self.samples} samples every {self.interval * 1000:g} ms", f"{'self':>7}{'total':>7}  function"]
+		for declaration, count in self.functions.most_common() :
+			if declaration == None :
+				lines.append(f"{self.percent(count):>7}{self.percent(self.samples):>7}  {SCRIPT}")
+			else :
+				lines.append(f"{self.percent(count):>7}{self.percent(self.functionsTotal[declaration]):>7}  {frameName(declaration)}")
+		return '\n'.join(lines)
\ No newline at end of file
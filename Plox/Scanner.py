@@ -1,149 +1,110 @@
-
-from Plox.ErrorHandling import ErrorHandling
-from Plox.Token import Token
-from Plox.Const import *
-
-
-class Scanner :
-    """
-    Produce tokens out of the source code
-    """
-    def __init__(self, error_handler :ErrorHandling) -> None:
-        self.tokens : list[Token] = []
-        self.error_handler = error_handler
-
-    def is_valid_character(self, c:str) -> bool :
-        return c in LEXEME_TO_TOKEN_1CHAR or c in LEXEME_TO_TOKEN or self.is_string(c) or c == '_'
-
-    def is_string(self,c:str) -> bool :
-        return ord('a') <= ord(c.lower()) <= ord('z')
-
-    def scan(self, i: int, line: str) -> None :
-        if self.tokens and self.tokens[-1].type =='EOF' :
-            self.tokens.pop()
-        token = Token()
-        last_slash = float('inf')
-        for col, c in enumerate(line) :
-            if token.type == 'IDENTIFIER' and (self.is_string(c) or c.isdigit() or c == '_'):
-                token.lexeme += c
-                continue
-            if token.type == 'IDENTIFIER':
-                if token.lexeme in RESERVED_KEYWORD :
-                    token.type = token.lexeme.upper()
-                self.tokens.append(token)
-                token = Token()
-            if token.type == 'NUMBER' and not c.isdigit() and c != '.' or (c == '.' and '.' in token.lexeme) :
-                has_end_dot = False
-                if token.lexeme[-1] == '.' :
-                    has_end_dot = True
-                    token.lexeme = token.lexeme[:-1]
-                token.literal = token.lexeme
-                if '.' not in  token.lexeme :
-                    token.literal += '.0'
-                else :
-                    pos_cut_off = len(token.literal) - 1
-                    for i in range(len(token.literal)-1, -1, -1) :
-                        if token.literal[i] == '.' or token.literal[i] != '0':
-                            pos_cut_off = max(pos_cut_off, i+1)
-                            break
-                        pos_cut_off = i
-
-                        token.literal = token.literal[:pos_cut_off+1]
-                token.literal = float(token.literal)
-                self.tokens.append(token)
-                if has_end_dot :
-                    self.tokens.append(Token('DOT', '.'))
-                token = Token()
-            if c == '"' :
-                if token.type == 'STRING' :
-                    self.tokens.append(token)
-                    token = Token()
-                else :
-                    token.type = 'STRING'
-                    token.literal=''
-                continue
-            if token.type == 'STRING'  :
-                token.lexeme += c
-                token.literal += c            
-                continue
-            if token.type == 'STRING':
-                self.tokens.append(token)
-                token = Token()
-
-            if c.isdigit() or (token.type == 'NUMBER' and c == '.') :
-                if token.type and token.type != 'NUMBER' :
-                    self.tokens.append(token)
-                    token = Token()
-                token.type = 'NUMBER'
-                token.lexeme += c
-                continue
-
-
-            if c in (' ', '\t', '\n') :
-                if token.type == 'STRING' and c == ' ' :
-                    token.lexeme += c
-                    token.literal += c
-                elif token.type != '' :
-                    self.tokens.append(token)
-                    token = Token()
-                continue
-            if c == '/' :
-                if last_slash +1 == col :
-                    token.type = ''
-                    break
-                last_slash = col
-            if not self.is_valid_character(c) :
-                self.error_handler.error('scanner', i, token, c)
-
-            if c in LEXEME_TO_TOKEN:
-                token_name = LEXEME_TO_TOKEN[c]
-                if token.type != '' and f"{token.type}_{token_name}" not in VALID_TOKEN_COMBO :
-                    self.tokens.append(token)
-                    token = Token()
-                if token.type :
-                    token.type += '_'
-                token.type += token_name
-                token.lexeme += c
-
-            elif token.type not in ('', 'STRING')  :
-                self.tokens.append(token)
-                token = Token()
-
-            if c in LEXEME_TO_TOKEN_1CHAR :
-                self.tokens.append(Token(LEXEME_TO_TOKEN_1CHAR[c], c))
-
-            if token.type == '' and c not in LEXEME_TO_TOKEN_1CHAR and c not in LEXEME_TO_TOKEN and (self.is_string(c) or c.isdigit() or c == '_') :
-                token.type = 'IDENTIFIER'
-                token.lexeme = c
-        if token.type != '' :
-            if token.type == 'IDENTIFIER':
-                if token.lexeme in RESERVED_KEYWORD :
-                    token.type = token.lexeme.upper()
-                self.tokens.append(token)
-            elif token.type == 'STRING' :
-                self.error_handler.error('scanner', i, token, c)
-            elif token.type == 'NUMBER' :
-                has_end_dot = False
-                if token.lexeme[-1] == '.' :
-                    has_end_dot = True
-                    token.lexeme = token.lexeme[:-1]
-                token.literal = token.lexeme
-                if '.' not in  token.lexeme :
-                    token.literal += '.0'
-                else :
-                    pos_cut_off = len(token.literal) - 1
-                    for i in range(len(token.literal)-1, -1, -1) :
-                        if token.literal[i] == '.' or token.literal[i] != '0':
-                            pos_cut_off = max(pos_cut_off, i+1)
-                            break
-                        pos_cut_off = i
-
-                        token.literal = token.literal[:pos_cut_off+1]
-                token.literal = float(token.literal)
-                self.tokens.append(token)
-                if has_end_dot :
-                    self.tokens.append(Token('DOT', '.'))
-            else :
-                self.tokens.append(token)
-            token = Token()
-        self.tokens.append(Token('EOF'))
+import re
+from typing import Iterable, Iterator
+
+from Plox.ErrorHandling import ErrorHandling
+from Plox.Token import Token
+from Plox.TokenBuffer import *
+from Plox.Const import RESERVED_KEYWORD
+
+
+TOKEN_PATTERN = re.compile(r'''
+    (\n[ \t\r]*)                  # 1 newline, with the indentation of the next line
+  | [ \t\r]+ | //[^\n]*           #   blanks and comments
+  | ([A-Za-z_][A-Za-z0-9_]*)      # 2 identifier or keyword
+  | (\d+(?:\.\d+)?)               # 3 number
+  | ([!=<>]=?|[(){},.\-+;*/])     # 4 operator or punctuation
+  | "([^"]*)"                     # 5 string, it can span several lines
+  | ("[^"]*)                      # 6 unterminated string
+  | (.)                           # 7 unexpected character
+''', re.VERBOSE)
+"""one alternative for each kind of lexeme, the number of the group which matched tells which"""
+NEWLINE, WORD, NUMBER_LITERAL, OPERATOR, STRING_LITERAL, UNTERMINATED, UNEXPECTED = range(1, 8)
+
+KEYWORDS = {word: KINDS[word.upper()] for word in RESERVED_KEYWORD}
+"""lexeme of a keyword -> its kind"""
+OPERATORS = {lexeme: kind for kind, lexeme in LEXEMES.items() if kind < IDENTIFIER}
+"""lexeme of an operator or a punctuation -> its kind"""
+
+
+class Scanner :
+    """
+    Produce tokens out of the source code
+    """
+    def __init__(self, error_handler :ErrorHandling) -> None:
+        self.tokens = TokenBuffer()
+        self.error_handler = error_handler
+
+    def scan(self, i: int, line: str) -> None :
+        """Scan the line number i (from 0) of the source, for the REPL which gets the source line by line"""
+        self.scan_source(line, i + 1)
+
+    def scan_lines(self, lines: Iterable[str], batch_size: int = 1 << 16) -> Iterator[int] :
+        """
+        Generator scanning the lines (ending with their newline, like the ones of a file) in batches of about batch_size characters
+        It yields the number of tokens in the buffer after each batch, so the source is never held in memory all at once
+        A string still open at the end of a batch is scanned again with the next one
+        """
+        line = 1
+        pending: list[str] = []
+        size = 0
+        for text in lines :
+            pending.append(text)
+            size += len(text)
+            if size >= batch_size :
+                source = ''.join(pending)
+                rest = self.scan_source(source, line, final=False)
+                line += source.count('\n', 0, len(source) - rest)
+                pending = [source[len(source) - rest:]] if rest else []
+                size = rest
+                yield len(self.tokens)
+        self.scan_source(''.join(pending), line)
+        yield len(self.tokens)
+
+    def scan_source(self, source: str, line: int = 1, final: bool = True) -> int :
+        """
+        Scan source, whose first line is numbered line, in one pass of a single regular expression
+        The tokens are added to the ones of the previous calls, followed by one EOF token
+        When final is False, more source follows : an unterminated string is not an error but left unscanned,
+        the number of characters left is returned
+        """
+        tokens = self.tokens
+        if len(tokens) and tokens.kinds[-1] == EOF :
+            tokens.pop()
+        offset = tokens.add_source(source)
+        kinds, starts, ends, lines = tokens.kinds, tokens.starts, tokens.ends, tokens.lines
+        keywords, operators = KEYWORDS, OPERATORS
+        for match in TOKEN_PATTERN.finditer(source) :
+            group = match.lastindex
+            if group == None :
+                continue
+            if group == NEWLINE :
+                line += 1
+                continue
+            start, end = match.span(group)
+            if group == WORD :
+                kinds.append(keywords.get(match.group(group), IDENTIFIER))
+            elif group == OPERATOR :
+                kinds.append(operators[match.group(group)])
+            elif group == NUMBER_LITERAL :
+                tokens.append(NUMBER, offset + start, offset + end, line, float(match.group(group)))
+                continue
+            elif group == STRING_LITERAL :
+                text = match.group(group)
+                tokens.append(STRING, offset + start, offset + end, line, text)
+                line += text.count('\n')
+                continue
+            elif group == UNTERMINATED :
+                if not final :
+                    tokens.append(EOF, offset + start, offset + start, line)
+                    return len(source) - start
+                self.error_handler.error('scanner', line - 1, Token('STRING'))
+                break
+            else :
+                self.error_handler.error('scanner', line - 1, Token(), match.group(group))
+                continue
+            starts.append(offset + start)
+            ends.append(offset + end)
+            lines.append(line)
+        end = offset + len(source)
+        tokens.append(EOF, end, end, line)
+        return 0
\ No newline at end of file
@@ -0,0 +1,109 @@
+from __future__ import annotations
+import copyreg
+import io
+import os
+import pickle
+from Plox.AstCache import interpreterVersion
+from Plox.ClosureCompiler import ClosureCompiler, CompiledFunction
+from Plox.Environment import Environment
+
+MAGIC = b'PLOXSNAP'
+
+BACKENDS = ('ast', 'closure', 'vm')
+"""the backends whose values can be saved, the functions of 'python' are Python code made by exec()"""
+
+
+COMPILER = object()
+"""stands for the compiler of the interpreter loading the snapshot"""
+
+
+class BodyCompiler :
+	"""Compiles again the bodies of the closure compiled functions of a snapshot, once per declaration"""
+	def __init__(self, compiler: ClosureCompiler) -> None:
+		self.compiler = compiler
+		self.bodies: dict[int, object] = dict()
+		"""id of a declaration -> its compiled body, the bound methods share the body of their method"""
+
+	def body(self, declaration) :
+		body = self.bodies.get(id(declaration), None)
+		if body == None :
+			body = self.bodies[id(declaration)] = self.compiler.compileBody(declaration.body)
+		return body
+
+
+def restoreCompiledFunction(function: CompiledFunction, state: tuple) -> None :
+	"""
+	State setter of the saved closure compiled functions,
+	their body is compiled at their first call, most functions of a prelude are never called by a job
+	"""
+	bodyCompiler, declaration, closure, receiver = state
+	def compileAtFirstCall(env: Environment) :
+		function.body = bodyCompiler.body(declaration)
+		return function.body(env)
+	CompiledFunction.__init__(function, declaration, closure, compileAtFirstCall, receiver)
+
+
+class SnapshotPickler(pickle.Pickler) :
+	"""
+	Pickler of the global variables : the globals Environment itself is saved as a reference,
+	so the restored closures use the globals of the interpreter loading the snapshot,
+	and a closure compiled function is saved without its body, which is Python code, it is compiled again when loaded
+	"""
+	def __init__(self, file: io.BufferedIOBase, env: Environment) -> None:
+		super().__init__(file, pickle.HIGHEST_PROTOCOL)
+		self.env = env
+
+	def persistent_id(self, obj: object) :
+		if obj is self.env :
+			return 'globals'
+		if obj is COMPILER :
+			return 'compiler'
+		return None
+
+	def reducer_override(self, obj: object) :
+		if type(obj) == CompiledFunction :
+			# the state is set once the object exists, so the functions can be in their own closure
+			state = (COMPILER, obj.declaration, obj.closure, obj.receiver)
+			return (copyreg.__newobj__, (CompiledFunction,), state, None, None, restoreCompiledFunction)
+		return NotImplemented
+
+
+class SnapshotUnpickler(pickle.Unpickler) :
+	def __init__(self, file: io.BufferedIOBase, env: Environment, compiler: ClosureCompiler = None) -> None:
+		super().__init__(file)
+		self.env = env
+		self.bodyCompiler = BodyCompiler(compiler)
+
+	def persistent_load(self, pid: str) :
+		return self.env if pid == 'globals' else self.bodyCompiler
+
+
+def header(backend: str) -> bytes :
+	modules = tuple(sorted(name for name in os.listdir(os.path.dirname(__file__)) if name.endswith('.py')))
+	return MAGIC + interpreterVersion(modules) + backend.encode().ljust(8)
+
+
+def save(path: str, env: Environment, backend: str) -> None :
+	"""Write the global variables of env, with everything they reference, to the file at path"""
+	if backend not in BACKENDS :
+		raise ValueError(f"The {backend} backend can't save snapshots, expected one of {BACKENDS}")
+	with open(path, 'wb') as file :
+		file.write(header(backend))
+		SnapshotPickler(file, env).dump(env.values)
+
+
+def load(path: str, env: Environment, backend: str, compiler: ClosureCompiler = None) -> None :
+	"""
+	Replace the global variables of env by the ones saved at path, by the same backend and the same interpreter
+	compiler compiles the functions of a 'closure' snapshot
+	"""
+	if backend not in BACKENDS :
+		raise ValueError(f"The {backend} backend can't load snapshots, expected one of {BACKENDS}")
+	expected = header(backend)
+	with open(path, 'rb') as file :
+		if file.read(len(expected)) != expected :
+			raise ValueError(f"{path} is not a snapshot of this interpreter with the {backend} backend")
+		values = SnapshotUnpickler(file, env, compiler).load()
+	# the dict itself is kept, the backends hold references to it
+	env.values.clear()
+	env.values.update(values)
\ No newline at end of file
@@ -0,0 +1,85 @@
+from __future__ import annotations
+import time
+from contextlib import contextmanager
+import Plox.Expr as Expr
+import Plox.Stmt as Stmt
+from Plox.Environment import Environment
+from Plox.LoxInstance import LoxInstance
+from Plox.Observer import Observer
+
+COUNTERS = ('tokens', 'nodes', 'resolved locals', 'environments', 'calls', 'frames pushed', 'max depth', 'instances', 'exceptions', 'errors')
+
+
+def countNodes(nodes: list) -> tuple[int, int] :
+	"""Number of Expr and Stmt objects reachable from the nodes, and how many of them are variables the resolver found local"""
+	count = 0
+	locals = 0
+	stack = list(nodes)
+	while stack :
+		node = stack.pop()
+		if type(node) == list :
+			stack.extend(node)
+		elif isinstance(node, (Expr.Expr, Stmt.Stmt)) :
+			count += 1
+			if getattr(node, 'depth', None) != None :
+				locals += 1
+			for cls in type(node).__mro__ :
+				stack.extend(getattr(node, name) for name in getattr(cls, '__slots__', ()) if name not in ('cache', 'shape', 'transition', 'line'))
+	return count, locals
+
+
+class Stats(Observer) :
+	"""
+	Wall and CPU time of the phases (scan, parse, resolve, interpret...) and counters of what they made, for plox.py --stats
+	The environments, the instances and the calls are counted as the observer of the backend
+	"""
+	def __init__(self) -> None:
+		self.phases: dict[str, dict[str, float]] = dict()
+		"""phase -> {'wall': seconds, 'cpu': seconds}, a phase run several times (REPL, streaming) adds up"""
+		self.counters: dict[str, int] = {name: 0 for name in COUNTERS}
+		"""None for a counter the backend can't count"""
+
+	@contextmanager
+	def phase(self, name: str) :
+		wall, cpu = time.perf_counter(), time.process_time()
+		try :
+			yield
+		finally :
+			times = self.phases.setdefault(name, {'wall': 0.0, 'cpu': 0.0})
+			times['wall'] += time.perf_counter() - wall
+			times['cpu'] += time.process_time() - cpu
+
+	def enter(self, function) -> None :
+		self.counters['calls'] += 1
+
+	def allocated(self, object) -> None :
+		if type(object) == Environment :
+			self.counters['environments'] += 1
+		elif isinstance(object, LoxInstance) :
+			self.counters['instances'] += 1
+
+	@contextmanager
+	def counting(self, executor: object) :
+		"""Count the calls of the VM, which runs them in its own frames, made by executor while in this context"""
+		frameStats = getattr(executor, 'frameStats', None)
+		if frameStats == None :
+			yield
+			return
+		# the script itself is one of the frames
+		before = frameStats['pushed'] + frameStats['tail calls'] + 1
+		try :
+			yield
+		finally :
+			self.counters['calls'] += frameStats['pushed'] + frameStats['tail calls'] - before
+
+	def asDict(self) -> dict :
+		return {'phases': {name: dict(times) for name, times in self.phases.items()}, 'counters': dict(self.counters)}
+
+	def report(self) -> str :
+		lines = [f"{'phase':<16}{'wall ms':>12}{'cpu ms':>12}"]
+		for name, times in self.phases.items() :
+			lines.append(f"{name:<16}{times['wall'] * 1000:12.2f}{times['cpu'] * 1000:12.2f}")
+		lines.append('')
+		for name, value in self.counters.items() :
+			lines.append(f"{name:<16}{'-' if value == None else value:>12}")
+		return '\n'.join(lines)
\ No newline at end of file
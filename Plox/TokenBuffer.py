@@ -0,0 +1,180 @@
+from __future__ import annotations
+from array import array
+from bisect import bisect_right
+import sys
+
+from Plox.Token import Token
+
+# Token kinds, stored as small integers in TokenBuffer.kinds
+LEFT_PAREN = 0
+RIGHT_PAREN = 1
+LEFT_BRACE = 2
+RIGHT_BRACE = 3
+COMMA = 4
+DOT = 5
+MINUS = 6
+PLUS = 7
+SEMICOLON = 8
+STAR = 9
+SLASH = 10
+EQUAL = 11
+EQUAL_EQUAL = 12
+BANG = 13
+BANG_EQUAL = 14
+GREATER = 15
+GREATER_EQUAL = 16
+LESS = 17
+LESS_EQUAL = 18
+IDENTIFIER = 19
+STRING = 20
+NUMBER = 21
+AND = 22
+CLASS = 23
+ELSE = 24
+FALSE = 25
+FOR = 26
+FUN = 27
+IF = 28
+NONE = 29
+OR = 30
+PRINT = 31
+RETURN = 32
+SUPER = 33
+THIS = 34
+TRUE = 35
+VAR = 36
+WHILE = 37
+EOF = 38
+
+KIND_NAMES = {value: name for name, value in dict(globals()).items() if name.isupper() and type(value) == int}
+"""kind -> the type of the Token objects"""
+KINDS = {name: value for value, name in KIND_NAMES.items()}
+"""type of a Token -> its kind"""
+LEXEMES = {
+    LEFT_PAREN: '(', RIGHT_PAREN: ')', LEFT_BRACE: '{', RIGHT_BRACE: '}', COMMA: ',', DOT: '.', MINUS: '-', PLUS: '+',
+    SEMICOLON: ';', STAR: '*', SLASH: '/', EQUAL: '=', EQUAL_EQUAL: '==', BANG: '!', BANG_EQUAL: '!=',
+    GREATER: '>', GREATER_EQUAL: '>=', LESS: '<', LESS_EQUAL: '<=', NONE: 'None', EOF: '',
+    **{kind: name.lower() for kind, name in KIND_NAMES.items() if AND <= kind <= WHILE and kind != NONE},
+}
+"""the lexeme of the kinds which always have the same one, the others are sliced from the source"""
+
+
+class TokenBuffer :
+    """
+    The scanned tokens, stored as parallel arrays instead of one Token object each :
+    the kind, the start and end offsets of the lexeme in the source and the line of every token,
+    plus a table of the values of the literals
+    The lexemes are sliced from the source, and Token objects made, only for the tokens the parser keeps
+    """
+    def __init__(self) -> None:
+        self.kinds = array('B')
+        self.starts = array('Q')
+        """offset of the first character of the lexeme in the source, 64 bits as a streamed source goes past 4 GiB"""
+        self.ends = array('Q')
+        self.lines = array('I')
+        self.literals: dict[int, object] = dict()
+        """index of a NUMBER or a STRING token -> its value"""
+        self.values: dict[tuple[type, object], object] = dict()
+        """one object for each distinct literal value"""
+        self.chunks: list[str] = []
+        """the source, in the pieces it was scanned"""
+        self.chunk_starts: list[int] = []
+        """offset in the source of the first character of each chunk"""
+        self.size = 0
+        """length of the source"""
+        self.shared: dict[tuple[int, str, int], Token] = dict()
+        """the Token objects already made, one for each distinct kind, lexeme and line"""
+        self.discarded = 0
+        """number of tokens removed by discard()"""
+
+    def __len__(self) -> int :
+        return len(self.kinds)
+
+    def __getitem__(self, index: int) -> Token :
+        if index < 0 :
+            index += len(self.kinds)
+        if not 0 <= index < len(self.kinds) :
+            raise IndexError("token index out of range")
+        return self.token(index)
+
+    def __iter__(self) :
+        for index in range(len(self.kinds)) :
+            yield self.token(index)
+
+    def add_source(self, text: str) -> int :
+        """Append text to the source, return its offset"""
+        offset = self.size
+        self.chunks.append(text)
+        self.chunk_starts.append(offset)
+        self.size += len(text)
+        return offset
+
+    def append(self, kind: int, start: int, end: int, line: int, literal: object = None) -> None :
+        if literal != None :
+            literal = self.values.setdefault((type(literal), literal), literal)
+            self.literals[len(self.kinds)] = literal
+        self.kinds.append(kind)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.lines.append(line)
+
+    def pop(self) -> None :
+        """Remove the last token"""
+        self.literals.pop(len(self.kinds) - 1, None)
+        self.kinds.pop()
+        self.starts.pop()
+        self.ends.pop()
+        self.lines.pop()
+
+    def discard(self, count: int) -> None :
+        """
+        Remove the first count tokens, and the chunks of the source before the first remaining one,
+        when streaming the tokens are discarded once the parser is done with them
+        The Token objects and the literal values are no longer shared with the next tokens
+        """
+        self.discarded += count
+        del self.kinds[:count]
+        del self.starts[:count]
+        del self.ends[:count]
+        del self.lines[:count]
+        self.literals = {index - count: value for index, value in self.literals.items() if index >= count}
+        self.values.clear()
+        self.shared.clear()
+        first = self.starts[0] if len(self.starts) else self.size
+        chunk = max(bisect_right(self.chunk_starts, first) - 1, 0)
+        del self.chunks[:chunk]
+        del self.chunk_starts[:chunk]
+
+    def lexeme(self, index: int) -> str :
+        start, end = self.starts[index], self.ends[index]
+        chunk = bisect_right(self.chunk_starts, start) - 1
+        if chunk < 0 :
+            return ''
+        offset = self.chunk_starts[chunk]
+        return self.chunks[chunk][start - offset:end - offset]
+
+    def column(self, index: int) -> int :
+        """
+        Column of the first character of the token at index, from 1, counted in its chunk of the source,
+        the chunks start a line but the rest of a streamed batch ending in an unterminated string
+        """
+        start = self.starts[index]
+        chunk = bisect_right(self.chunk_starts, start) - 1
+        offset = self.chunk_starts[chunk]
+        return start - offset - self.chunks[chunk].rfind('\n', 0, start - offset)
+
+    def token(self, index: int) -> Token :
+        """
+        The Token object for the token at index, with its line,
+        shared by all the tokens of that line with the same kind and lexeme
+        """
+        kind = self.kinds[index]
+        lexeme = LEXEMES.get(kind, None)
+        if lexeme is None :
+            lexeme = self.lexeme(index)
+        line = self.lines[index]
+        key = (kind, lexeme, line)
+        token = self.shared.get(key, None)
+        if token is None :
+            token = self.shared[key] = Token(KIND_NAMES[kind], sys.intern(lexeme), self.literals.get(index, None), line)
+        return token
\ No newline at end of file
@@ -0,0 +1,329 @@
+from __future__ import annotations
+import Plox.Expr as Expr
+import Plox.Stmt as Stmt
+from Plox.Bytecode import *
+from Plox.BytecodeCompiler import BytecodeCompiler
+from Plox.Environment import Environment
+from Plox.LoxCallable import LoxCallable
+from Plox.LoxClass import LoxClass
+from Plox.LoxInstance import LoxInstance
+from Plox.Token import Token
+from Plox.ErrorHandling import ErrorHandling
+from Plox.Observer import Observer
+
+
+class VM :
+	"""
+	Stack based virtual machine running the bytecode produced by BytecodeCompiler
+	A Lox call pushes a frame on the VM frame stack, it does not recurse in Python,
+	so the recursion depth is only limited by the memory, and a tail call replaces the frame of its caller
+	"""
+	def __init__(self, error_handler: ErrorHandling, env=Environment(), is_a_test=False) -> None:
+		self.env = env
+		"""the globals"""
+		self.error_handler = error_handler
+		self.is_a_test = is_a_test
+		self.printed: list[str] = []
+		self.compiler = BytecodeCompiler()
+
+		self.stack: list[object] = []
+		self.frames: list[tuple] = []
+		"""saved (code, constants, upvalues, ip, base, isInitializer) of the callers"""
+		self.openUpvalues: list[Upvalue] = []
+		"""upvalues still pointing into the stack, sorted by stack index"""
+		self.frameStats = {'pushed': 0, 'tail calls': 0, 'max depth': 0}
+		"""frames pushed by calls, calls which reused the frame of their caller, and the deepest frame stack"""
+		self.observer: Observer = None
+		"""told the instances made, by plox.py --stats, None when off"""
+
+	def interpret(self, statements: list[Stmt.Stmt] | Expr.Expr) :
+		try :
+			script = self.compiler.compile(statements)
+			return self.callClosure(Closure(script, []), [])
+		except Exception as e :
+			self.stack.clear()
+			self.frames.clear()
+			self.openUpvalues.clear()
+			self.error_handler.error(ori='astInterpreter', message=e)
+
+	def callClosure(self, closure: Closure, arguments: list[object], receiver=None) :
+		"""Run a closure to completion, used for the script and when native code calls back into Lox"""
+		if len(arguments) != closure.function.arity :
+			raise RuntimeError(f"Expected {closure.function.arity} arguments but got {len(arguments)} .")
+		base = len(self.stack)
+		self.frameStats['pushed'] += 1
+		if len(self.frames) >= self.frameStats['max depth'] :
+			self.frameStats['max depth'] = len(self.frames) + 1
+		self.stack.append(closure if receiver is None else receiver)
+		self.stack.extend(arguments)
+		return self.run(closure, base)
+
+	def captureUpvalue(self, index: int) -> Upvalue :
+		openUpvalues = self.openUpvalues
+		position = len(openUpvalues)
+		while position > 0 and openUpvalues[position - 1].index >= index :
+			if openUpvalues[position - 1].index == index :
+				return openUpvalues[position - 1]
+			position -= 1
+		upvalue = Upvalue(index)
+		openUpvalues.insert(position, upvalue)
+		return upvalue
+
+	def closeUpvalues(self, last: int) :
+		"""Move the values of the slots above last out of the stack, into their upvalues"""
+		openUpvalues = self.openUpvalues
+		while openUpvalues and openUpvalues[-1].index >= last :
+			upvalue = openUpvalues.pop()
+			upvalue.value = self.stack[upvalue.index]
+			upvalue.index = -1
+
+	def prepareCall(self, callee: object, argc: int, paren: Token) -> tuple[Closure, bool] :
+		"""
+		Handle a call to something else than a closure, paren is the closing parenthesis of the call for the errors
+		Return the closure to push a frame for and whether it is an initializer,
+		or None when the call has been completed here
+		"""
+		stack = self.stack
+		if type(callee) == BoundMethod :
+			stack[-1 - argc] = callee.receiver
+			return callee.method, False
+		if isinstance(callee, LoxClass) :
+			stack[-1 - argc] = LoxInstance(callee)
+			if self.observer is not None :
+				self.observer.allocated(stack[-1 - argc])
+			initializer = callee.initializer
+			if initializer != None :
+				return initializer, True
+			if argc != 0 :
+				raise RuntimeError(paren, f"Expected 0 arguments but got {argc} .")
+			return None, False
+		if isinstance(callee, LoxCallable) :
+			if argc != callee.arity() :
+				raise RuntimeError(paren, f"Expected {callee.arity()} arguments but got {argc} .")
+			arguments = stack[len(stack) - argc:]
+			del stack[len(stack) - argc - 1:]
+			stack.append(callee.call(self, arguments))
+			return None, False
+		raise RuntimeError(paren, "Can only call functions and classes.")
+
+	def printValue(self, value: object) :
+		if self.is_a_test :
+			self.printed.append(value)
+		else :
+			print(value)
+
+	def run(self, closure: Closure, base: int) :
+		stack = self.stack
+		push = stack.append
+		pop = stack.pop
+		frames = self.frames
+		openUpvalues = self.openUpvalues
+		globalValues = self.env.values
+		frameStats = self.frameStats
+		entryDepth = len(frames)
+
+		code = closure.function.code
+		constants = closure.function.constants
+		upvalues = closure.upvalues
+		ip = 0
+		isInitializer = False
+
+		# the opcodes are tested in the order of their counts on the programs of benchmarks/, the most run first
+		while True :
+			op, arg = code[ip]
+			ip += 1
+
+			if op == GET_LOCAL :
+				push(stack[base + arg])
+			elif op == CONSTANT :
+				push(constants[arg])
+			elif op == GET_GLOBAL :
+				try :
+					push(globalValues[constants[arg]])
+				except KeyError :
+					raise RuntimeError(Token('IDENTIFIER', constants[arg]), f"Undefined variable ' {constants[arg]} '.")
+			elif op == POP :
+				pop()
+			elif op == ADD :
+				right = pop()
+				stack[-1] = stack[-1] + right
+			elif op == POP_JUMP_IF_FALSE :
+				value = pop()
+				if value is None or value is False :
+					ip = arg
+			elif op == STORE_LOCAL :
+				stack[base + arg] = pop()
+			elif op == LESS :
+				right = pop()
+				stack[-1] = stack[-1] < right
+			elif op == JUMP :
+				ip = arg
+			elif op == GET_PROPERTY :
+				instance = stack[-1]
+				if not isinstance(instance, LoxInstance) :
+					raise RuntimeError(constants[arg], "Only intances have properties.")
+				stack[-1] = instance.get(constants[arg])
+			elif op == STORE_PROPERTY :
+				value = pop()
+				instance = pop()
+				if not isinstance(instance, LoxInstance) :
+					raise RuntimeError(constants[arg], "Only intances have fields.")
+				instance.set(constants[arg], value)
+			elif op in CALLS :
+				if op == INVOKE or op == TAIL_INVOKE :
+					nameIndex, argc, paren = arg
+					receiver = stack[-1 - argc]
+					token = constants[nameIndex]
+					if type(receiver) == LoxInstance :
+						index = receiver.shape.indices.get(token.lexeme, None)
+						if index != None :
+							callee = receiver.values[index]
+							stack[-1 - argc] = callee
+						else :
+							callee = receiver.klass.findMethod(token.lexeme)
+							if callee == None :
+								raise RuntimeError(token, f"Undefined Property '{token.lexeme}'")
+					elif isinstance(receiver, LoxInstance) :
+						callee = receiver.get(token)
+						stack[-1 - argc] = callee
+					else :
+						raise RuntimeError(token, "Only intances have properties.")
+				else :
+					argc, paren = arg
+					callee = stack[-1 - argc]
+
+				if type(callee) == Closure :
+					calleeIsInitializer = False
+				else :
+					callee, calleeIsInitializer = self.prepareCall(callee, argc, constants[paren])
+					if callee is None :
+						continue
+				function = callee.function
+				if function.arity != argc :
+					raise RuntimeError(constants[paren], f"Expected {function.arity} arguments but got {argc} .")
+				if (op == TAIL_CALL or op == TAIL_INVOKE) and not isInitializer :
+					# nothing is left to run in this frame : the callee and its arguments take its slots
+					if openUpvalues and openUpvalues[-1].index >= base :
+						self.closeUpvalues(base)
+					stack[base:] = stack[len(stack) - argc - 1:]
+					frameStats['tail calls'] += 1
+				else :
+					frames.append((code, constants, upvalues, ip, base, isInitializer))
+					base = len(stack) - argc - 1
+					frameStats['pushed'] += 1
+					if len(frames) >= frameStats['max depth'] :
+						frameStats['max depth'] = len(frames) + 1
+				code = function.code
+				constants = function.constants
+				upvalues = callee.upvalues
+				ip = 0
+				isInitializer = calleeIsInitializer
+			elif op == RETURN :
+				result = pop()
+				if openUpvalues and openUpvalues[-1].index >= base :
+					self.closeUpvalues(base)
+				if isInitializer :
+					# calling a class evaluates to the new instance
+					result = stack[base]
+				del stack[base:]
+				if len(frames) == entryDepth :
+					return result
+				code, constants, upvalues, ip, base, isInitializer = frames.pop()
+				push(result)
+			elif op == STORE_GLOBAL :
+				if constants[arg] not in globalValues :
+					raise RuntimeError(Token('IDENTIFIER', constants[arg]), f"Undefined variable ' {constants[arg]} '.")
+				globalValues[constants[arg]] = pop()
+			elif op == GET_UPVALUE :
+				upvalue = upvalues[arg]
+				push(stack[upvalue.index] if upvalue.index >= 0 else upvalue.value)
+			elif op == SUBTRACT :
+				right = pop()
+				stack[-1] = stack[-1] - right
+			elif op == NIL :
+				push(None)
+			elif op == EQUAL :
+				right = pop()
+				stack[-1] = stack[-1] == right
+			elif op == NOT :
+				value = stack[-1]
+				# same result as the tree-walk interpreter : the negated truthiness
+				stack[-1] = -(value is not None and value is not False)
+			elif op == GREATER :
+				right = pop()
+				stack[-1] = stack[-1] > right
+			elif op == MULTIPLY :
+				right = pop()
+				stack[-1] = stack[-1] * right
+			elif op == DIVIDE :
+				right = pop()
+				stack[-1] = stack[-1] / right
+			elif op == GREATER_EQUAL :
+				right = pop()
+				stack[-1] = stack[-1] >= right
+			elif op == LESS_EQUAL :
+				right = pop()
+				stack[-1] = stack[-1] <= right
+			elif op == NOT_EQUAL :
+				right = pop()
+				stack[-1] = stack[-1] != right
+			elif op == SET_UPVALUE :
+				upvalue = upvalues[arg]
+				if upvalue.index >= 0 :
+					stack[upvalue.index] = stack[-1]
+				else :
+					upvalue.value = stack[-1]
+			elif op == JUMP_IF_FALSE_OR_POP :
+				value = stack[-1]
+				if value is None or value is False :
+					ip = arg
+				else :
+					pop()
+			elif op == JUMP_IF_TRUE_OR_POP :
+				value = stack[-1]
+				if value is not None and value is not False :
+					ip = arg
+				else :
+					pop()
+			elif op == NEGATE :
+				stack[-1] = -stack[-1]
+			elif op == PRINT :
+				self.printValue(pop())
+			elif op == DEFINE_GLOBAL :
+				globalValues[constants[arg]] = pop()
+			elif op == SET_LOCAL :
+				stack[base + arg] = stack[-1]
+			elif op == SET_PROPERTY :
+				value = pop()
+				instance = stack[-1]
+				if not isinstance(instance, LoxInstance) :
+					raise RuntimeError(constants[arg], "Only intances have fields.")
+				instance.set(constants[arg], value)
+				stack[-1] = value
+			elif op == SET_GLOBAL :
+				if constants[arg] not in globalValues :
+					raise RuntimeError(Token('IDENTIFIER', constants[arg]), f"Undefined variable ' {constants[arg]} '.")
+				globalValues[constants[arg]] = stack[-1]
+			elif op == CLOSURE :
+				function: FunctionProto = constants[arg]
+				captured = [self.captureUpvalue(base + index) if isLocal else upvalues[index] for isLocal, index in function.upvalues]
+				push(Closure(function, captured))
+			elif op == CLOSE_UPVALUE :
+				self.closeUpvalues(len(stack) - 1)
+				pop()
+			elif op == GET_SUPER :
+				superClass: LoxClass = pop()
+				method = superClass.findMethod(constants[arg].lexeme)
+				if method == None :
+					raise RuntimeError(constants[arg], "Undefined property '" + constants[arg].lexeme + "'.")
+				stack[-1] = method.bind(stack[-1])
+			elif op == CLASS :
+				nameIndex, methodCount, hasSuperClass = arg
+				methods = {method.function.name: method for method in stack[len(stack) - methodCount:]}
+				del stack[len(stack) - methodCount:]
+				push(LoxClass(constants[nameIndex].lexeme, stack[-1] if hasSuperClass else None, methods))
+			elif op == CHECK_SUPERCLASS :
+				if not isinstance(stack[-1], LoxClass) :
+					raise RuntimeError("SuperClass must be a class")
+			else :
+				raise RuntimeError(f"Unknown opcode {op}")
\ No newline at end of file
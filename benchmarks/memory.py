@@ -0,0 +1,83 @@
+# python3 benchmarks/memory.py [--functions N]
+# memory used by the tokens, the syntax trees and the environments of a large generated program
+
+
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Plox.Plox import Plox
+from Plox.Environment import Environment
+from Plox.Natives import globals
+import Plox.Expr as Expr
+import Plox.Stmt as Stmt
+
+FUNCTION = """
+fun f{i}(a, b) {{
+    var total = {i};
+    for (var j = 0; j < a; j = j + 1) {{
+        if (j > b) total = total + j * 2;
+        else total = total - 1;
+    }}
+    return total;
+}}
+var r{i} = f{i}(3, 1);
+"""
+
+def generate(functions: int) -> list[str] :
+    return ''.join(FUNCTION.format(i=i) for i in range(functions)).split('\n')
+
+def count_nodes(nodes: list) -> int :
+    """number of Expr and Stmt objects reachable from the nodes"""
+    count = 0
+    stack = list(nodes)
+    while stack :
+        node = stack.pop()
+        if isinstance(node, list) :
+            stack.extend(node)
+        elif isinstance(node, (Expr.Expr, Stmt.Stmt)) :
+            count += 1
+            for cls in type(node).__mro__ :
+                stack.extend(getattr(node, name, None) for name in getattr(cls, '__slots__', ()))
+    return count
+
+def traced() -> int :
+    return tracemalloc.get_traced_memory()[0]
+
+def main() :
+    argparser = argparse.ArgumentParser(description='bytes per token, per syntax tree node and per environment')
+    argparser.add_argument('--functions', type=int, default=2000, help="number of functions in the generated program")
+    args = argparser.parse_args()
+
+    lines = generate(args.functions)
+    interpreter = Plox(is_a_test=True)
+    tracemalloc.start()
+
+    before = traced()
+    interpreter.scanner.scan_source('\n'.join(lines))
+    tokens = traced() - before
+
+    before = traced()
+    interpreter.parser.parse()
+    interpreter.astResolver.resolve(interpreter.parser.statements)
+    nodes = traced() - before
+
+    environments = []
+    before = traced()
+    for _ in range(10000) :
+        environments.append(Environment(enclosing=globals, slots=[]))
+    environment = (traced() - before) / 10000
+
+    tracemalloc.stop()
+    token_count = len(interpreter.scanner.tokens)
+    node_count = count_nodes(interpreter.parser.statements)
+    print(f"{len(lines)} lines")
+    print(f"tokens       {token_count:8d}  {tokens / token_count:7.1f} bytes each")
+    print(f"nodes        {node_count:8d}  {nodes / node_count:7.1f} bytes each")
+    print(f"environments {10000:8d}  {environment:7.1f} bytes each")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
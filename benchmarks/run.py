@@ -0,0 +1,120 @@
+# python3 benchmarks/run.py [names...] [--backend ast] [--warmups 1] [--repetitions 5] [--output results.json]
+# time of each phase (scan, parse, resolve, interpret) and peak memory of the benchmark programs, as JSON
+
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from Plox.Plox import Plox, BACKENDS
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+PHASES = ('scan', 'parse', 'resolve', 'interpret')
+
+def benchmarks() -> list[str] :
+    """names of the .lox programs of this directory"""
+    return sorted(name[:-len('.lox')] for name in os.listdir(DIRECTORY) if name.endswith('.lox'))
+
+def run_once(source: str, backend: str, optimize: bool) -> tuple[dict[str, float], Plox] :
+    """Run the source with a new interpreter, return the seconds spent in each phase"""
+    interpreter = Plox(is_a_test=True, backend=backend, optimize=optimize)
+    times = {}
+    start = time.perf_counter()
+    interpreter.scanner.scan_source(source)
+    times['scan'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    statements = interpreter.parser.parse()
+    times['parse'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    interpreter.astResolver.resolve(statements)
+    times['resolve'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    interpreter.interpret(statements)
+    times['interpret'] = time.perf_counter() - start
+    return times, interpreter
+
+def peak_memory(source: str, backend: str, optimize: bool) -> int :
+    """bytes allocated at the peak of one more run, traced apart as tracemalloc slows everything down"""
+    tracemalloc.start()
+    try :
+        run_once(source, backend, optimize)
+        return tracemalloc.get_traced_memory()[1]
+    finally :
+        tracemalloc.stop()
+
+def summary(samples: list[float]) -> dict[str, float] :
+    return {'min': min(samples), 'median': statistics.median(samples), 'mean': statistics.fmean(samples)}
+
+def measure(name: str, backend: str, optimize: bool, warmups: int, repetitions: int) -> dict :
+    with open(os.path.join(DIRECTORY, name + '.lox')) as file :
+        source = file.read()
+    for _ in range(warmups) :
+        run_once(source, backend, optimize)
+    samples = {phase: [] for phase in PHASES + ('total',)}
+    for _ in range(repetitions) :
+        times, interpreter = run_once(source, backend, optimize)
+        for phase in PHASES :
+            samples[phase].append(times[phase])
+        samples['total'].append(sum(times.values()))
+    errors = interpreter.error_handler
+    return {
+        'seconds': {phase: summary(values) for phase, values in samples.items()},
+        'peak_memory': peak_memory(source, backend, optimize),
+        'output': [str(value) for value in interpreter.printed],
+        'errors': [str(error) for error in errors.lexical_errors + errors.parser_errors + errors.resolver_errors + errors.astInterpreter_errors],
+    }
+
+def revision() -> str :
+    """git commit of the interpreter, so results of different versions can be told apart"""
+    try :
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError) :
+        return None
+
+def main() :
+    argparser = argparse.ArgumentParser(description='time of each phase and peak memory of the benchmark programs, as JSON')
+    argparser.add_argument('names', nargs='*', help=f"benchmarks to run, all by default : {', '.join(benchmarks())}")
+    argparser.add_argument('--backend', choices=BACKENDS, default='ast')
+    argparser.add_argument('--optimize', action='store_true', help="run the optimizer, its time is part of interpret")
+    argparser.add_argument('--warmups', type=int, default=1, help="runs before the measured ones")
+    argparser.add_argument('--repetitions', type=int, default=5, help="measured runs, min, median and mean are reported")
+    argparser.add_argument('--output', help="file to write the JSON to, else it is printed")
+    args = argparser.parse_args()
+
+    for name in args.names :
+        if name not in benchmarks() :
+            argparser.error(f"unknown benchmark {name}")
+    results = {
+        'revision': revision(),
+        'python': platform.python_version(),
+        'backend': args.backend,
+        'optimize': args.optimize,
+        'warmups': args.warmups,
+        'repetitions': args.repetitions,
+        'benchmarks': {},
+    }
+    for name in args.names or benchmarks() :
+        results['benchmarks'][name] = measure(name, args.backend, args.optimize, args.warmups, max(args.repetitions, 1))
+        print(f"{name:20s} {results['benchmarks'][name]['seconds']['total']['min']:8.3f} s", file=sys.stderr)
+
+    report = json.dumps(results, indent=2)
+    if args.output :
+        with open(args.output, 'w') as file :
+            file.write(report + '\n')
+    else :
+        print(report)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,57 +1,135 @@
-# python3 plox.py file_example.txt
-
-
-from io import TextIOWrapper
-import sys
-
-from Plox.Plox import Plox
-import Plox.Expr as Expr 
-
-def run(interpreter:Plox, file :TextIOWrapper=None) :
-    for i, line in enumerate(file) :
-        interpreter.scanner.scan(i, line)
-    interpreter.parser.parse()
-    # print('-----------------')
-    # print(AstPrinter().stringfyTree(interpreter.parser.statements))
-    # print('-----------------')
-    interpreter.astResolver.resolve(interpreter.parser.statements)
-    interpreter.astInterpreter.interpret(interpreter.parser.statements)
-    
-def runPrompt(interpreter:Plox) :
-  line = ''
-  i = 0
-  while True :
-    i += 1
-    line = input('>')
-    interpreter.scanner.scan(i, line)
-    syntax = interpreter.parser.parseRepl()
-
-    if interpreter.error_handler.has_lexical_errors :
-        continue
-    
-    if type(syntax) == list :
-      interpreter.astInterpreter.interpret(syntax)
-    elif (type(syntax) == type(Expr.Expr())) :
-      result = interpreter.astInterpreter.interpret(syntax)
-      if result != None :
-        print("=", result)
-
-
-def main():
-    interpreter = Plox()
-
-    if len(sys.argv) > 2:
-        print("Usage: plox.py <filename>", file=sys.stderr)
-        exit(1)
-
-    if len(sys.argv) == 2:
-        filename = sys.argv[1]
-        with open(filename) as file:
-            run(interpreter, file=file)
-        if interpreter.error_handler.has_lexical_errors :
-            exit(65)
-    else :
-        runPrompt(interpreter)
-
-if __name__ == "__main__":
+# python3 plox.py file_example.txt
+
+
+from io import TextIOWrapper
+import argparse
+import json
+import os
+import signal
+import sys
+
+from Plox.Plox import Plox, BACKENDS, unsupported
+import Plox.ExecutionCounts as ExecutionCounts
+import Plox.Expr as Expr 
+
+def run(interpreter:Plox, file :TextIOWrapper=None, dump_python=False, stream=False) :
+    if stream :
+        interpreter.runStream(file)
+        return
+    statements = interpreter.load(file.read(), file.name)
+    # print('-----------------')
+    # print(AstPrinter().stringfyTree(statements))
+    # print('-----------------')
+    if dump_python :
+        if interpreter.astOptimizer != None :
+            statements = interpreter.astOptimizer.optimize(statements)
+        print(interpreter.executor.transpile(statements))
+        return
+    interpreter.interpret(statements)
+    
+def runPrompt(interpreter:Plox) :
+  line = ''
+  i = 0
+  while True :
+    i += 1
+    line = input('>')
+    interpreter.scanner.scan(i, line)
+    syntax = interpreter.parser.parseRepl()
+
+    if interpreter.error_handler.has_lexical_errors :
+        continue
+    
+    if type(syntax) == list :
+      # local variables are found at the slots the resolver assigns
+      interpreter.astResolver.resolve(syntax)
+      interpreter.interpret(syntax)
+    elif isinstance(syntax, Expr.Expr) :
+      interpreter.astResolver.resolve(syntax)
+      result = interpreter.interpret(syntax)
+      if result != None :
+        print("=", result)
+
+
+def main():
+    argparser = argparse.ArgumentParser(prog='plox.py', description='Lox interpreter, runs the REPL when no file is given')
+    argparser.add_argument('filename', nargs='?')
+    argparser.add_argument('--backend', choices=BACKENDS, default='ast', help="'ast' tree-walk interpreter, 'closure' closure compiled tree, 'vm' bytecode VM or 'python' transpiled to Python")
+    argparser.add_argument('--optimize', action='store_true', help="fold constant expressions and remove dead branches before running")
+    argparser.add_argument('--dump-python', action='store_true', help="print the Python code generated for the file instead of running it")
+    argparser.add_argument('--cache', action='store_true', help="save the resolved syntax trees in __loxcache__ next to the file and reuse them while it is unchanged, the cache is unpickled so only use it in trusted directories")
+    argparser.add_argument('--load-snapshot', metavar='SNAPSHOT', help="start with the global variables saved in SNAPSHOT instead of the built-in ones")
+    argparser.add_argument('--save-snapshot', metavar='SNAPSHOT', help="save the global variables to SNAPSHOT once the file has run, for --load-snapshot")
+    argparser.add_argument('--stats', action='store_true', help="print the time of each phase and counters of what the program did to stderr")
+    argparser.add_argument('--profile', action='store_true', help="print the calls, self and cumulative time of each Lox function to stderr (ast and closure backends)")
+    argparser.add_argument('--profile-folded', metavar='FILE', help="profile the Lox functions and write their stacks to FILE in the folded format of flamegraph.pl")
+    argparser.add_argument('--sample', action='store_true', help="sample the Lox lines and functions running and print the source annotated with them to stderr (ast backend)")
+    argparser.add_argument('--sample-folded', metavar='FILE', help="sample the Lox functions running and write their stacks to FILE in the folded format of flamegraph.pl")
+    argparser.add_argument('--sample-interval', metavar='MS', type=float, default=1.0, help="milliseconds of CPU time between two samples, 1 by default")
+    argparser.add_argument('--count', action='store_true', help="print the visits, binary operators, global lookups of each line and the receiver classes of each property read to stderr (ast backend)")
+    argparser.add_argument('--count-json', metavar='FILE', help="add the counts of each line to the ones of FILE, as JSON, so the counts of several runs add up")
+    argparser.add_argument('--allocations', action='store_true', help="print the environments, functions, instances and arrays made by each line, with their bytes, to stderr, and a heap summary on SIGUSR1 (ast backend)")
+    argparser.add_argument('--memory-limit', metavar='MB', type=float, help="abort the program once it holds more than MB megabytes, as traced by tracemalloc at each statement (ast backend)")
+    argparser.add_argument('--stream', action='store_true', help="run each top-level declaration as soon as it is parsed, for scripts too large to hold in memory")
+    args = argparser.parse_args()
+    profile = args.profile or args.profile_folded != None
+    sample = args.sample or args.sample_folded != None
+    count = args.count or args.count_json != None
+    features = {'snapshots': args.load_snapshot or args.save_snapshot, 'profile': profile, 'sample': sample, 'count': count,
+                'allocations': args.allocations or args.memory_limit != None}
+    message = unsupported(args.backend, [feature for feature, enabled in features.items() if enabled])
+    if message != None :
+        argparser.error(message)
+
+    interpreter = Plox(backend='python' if args.dump_python else args.backend, optimize=args.optimize, cache=args.cache, stats=args.stats, profile=profile and not args.dump_python,
+                         sample=args.sample_interval / 1000 if sample and not args.dump_python else None,
+                         count=count and not args.dump_python, allocations=args.allocations and not args.dump_python,
+                         memoryLimit=None if args.memory_limit == None or args.dump_python else int(args.memory_limit * 1024 * 1024))
+
+    if interpreter.allocations != None and hasattr(signal, 'SIGUSR1') :
+        signal.signal(signal.SIGUSR1, lambda signum, frame : print(interpreter.allocations.heapSummary(), file=sys.stderr))
+
+    if args.load_snapshot :
+        try :
+            interpreter.loadSnapshot(args.load_snapshot)
+        except (OSError, ValueError) as error :
+            argparser.error(str(error))
+
+    if args.filename :
+        filename = args.filename
+        with open(filename) as file:
+            run(interpreter, file=file, dump_python=args.dump_python, stream=args.stream and not args.dump_python)
+        if interpreter.error_handler.has_lexical_errors :
+            exit(65)
+        if args.save_snapshot :
+            interpreter.saveSnapshot(args.save_snapshot)
+        if args.stats :
+            interpreter.statistics()
+            print(interpreter.stats.report(), file=sys.stderr)
+        if args.profile :
+            print(interpreter.profiler.report(), file=sys.stderr)
+        if args.profile_folded :
+            with open(args.profile_folded, 'w') as folded :
+                folded.write(interpreter.profiler.folded() + '\n')
+        if args.sample :
+            print(interpreter.sampler.report(), file=sys.stderr)
+            with open(filename) as file :
+                print(interpreter.sampler.annotate(file.read()), file=sys.stderr)
+        if args.sample_folded :
+            with open(args.sample_folded, 'w') as folded :
+                folded.write(interpreter.sampler.folded() + '\n')
+        if args.count :
+            print(interpreter.executionCounts.report(), file=sys.stderr)
+        if args.allocations :
+            print(interpreter.allocations.report(), file=sys.stderr)
+        if args.count_json :
+            report = interpreter.executionCounts.asDict()
+            if os.path.exists(args.count_json) :
+                with open(args.count_json) as previous :
+                    report = ExecutionCounts.merge([json.load(previous), report])
+            with open(args.count_json, 'w') as output :
+                json.dump(report, output, indent=1)
+    else :
+        runPrompt(interpreter)
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,70 @@
+#  pytest  -vv
+from __future__ import annotations
+import Plox.Plox as Plox
+from Plox.Environment import Environment
+import pytest
+import tracemalloc
+
+
+def test_allocations() :
+    source = """
+        class Point { init(x) { this.x = x; } get() { return this.x; } }
+        var points = Array(3);
+        for (var i = 0; i < 3; i = i + 1) points.set(i, Point(i));
+        var get = points.get(2).get;
+        print get();
+    """
+    interpreter = Plox.Plox(is_a_test=True, allocations=True)
+    interpreter.interpret(interpreter.load(source))
+    assert interpreter.printed == [2]
+    allocations = interpreter.allocations
+    # (total, live) made by each line
+    sites = {site: counts[:2] for site, counts in allocations.sites.items()}
+    assert sites == {
+        ('LoxFunction', 2): [2, 2], ('LoxArray[3]', 3): [1, 1], ('LoxInstance Point', 4): [3, 3],
+        ('Environment', 4): [7, 0], ('LoxFunction (bound)', 5): [1, 1], ('Environment', 6): [1, 0],
+    }
+    assert all(counts[2] > 0 for counts in allocations.sites.values())
+    assert allocations.traced[1] > 0
+    assert 'LoxInstance Point' in allocations.report()
+    assert 'LoxInstance Point' in allocations.heapSummary()
+    assert not tracemalloc.is_tracing() and '__del__' not in Environment.__dict__
+
+def test_memory_limit() :
+    source = """
+        class Node { init(next) { this.next = next; } }
+        var list = false;
+        while (true) list = Node(list);
+    """
+    interpreter = Plox.Plox(is_a_test=True, memoryLimit=1 << 20)
+    interpreter.interpret(interpreter.load(source))
+    assert len(interpreter.error_handler.astInterpreter_errors) == 1
+    assert 'memory limit of 1048576 bytes exceeded' in str(interpreter.error_handler.astInterpreter_errors[0])
+    with pytest.raises(ValueError) :
+        Plox.Plox(backend='vm', memoryLimit=1 << 20)
+
+def test_memory_limit_strings() :
+    source = """
+        var s = "x";
+        var i = 0;
+        while (i < 24) { s = s + s; i = i + 1; }
+        print "done";
+    """
+    interpreter = Plox.Plox(is_a_test=True, memoryLimit=1 << 20)
+    interpreter.interpret(interpreter.load(source))
+    assert interpreter.printed == []
+    assert 'memory limit of 1048576 bytes exceeded' in str(interpreter.error_handler.astInterpreter_errors[0])
+    assert not tracemalloc.is_tracing()
+
+def test_memory_limit_frees() :
+    source = """
+        class Node { init(next) { this.next = next; } }
+        var list = false;
+        for (var i = 0; i < 4000; i = i + 1) list = Node(list);
+    """
+    limited = Plox.Plox(is_a_test=True, memoryLimit=1 << 20)
+    for _ in range(3) :
+        # the lists freed are not counted, the three would take more than the limit
+        limited.interpret(limited.load(source))
+        limited.interpret(limited.load('list = false;'))
+    assert limited.error_handler.astInterpreter_errors == []
\ No newline at end of file
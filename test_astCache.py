@@ -0,0 +1,30 @@
+#  pytest  -vv
+from __future__ import annotations
+import Plox.Plox as Plox
+
+
+def test_ast_cache(tmp_path) :
+    filename = str(tmp_path / 'program.lox')
+    source = 'class A { init(x) { this.x = x; } }\nfun f(a) { return A(a).x * 2; }\nprint f(21);'
+    for source, hits, misses, printed in ((source, 0, 1, [42.0]), (source, 1, 0, [42.0]), (source.replace('21', '1'), 0, 1, [2.0])) :
+        interpreter = Plox.Plox(is_a_test=True, cache=True)
+        interpreter.interpret(interpreter.load(source, filename))
+        assert (interpreter.astCache.hits, interpreter.astCache.misses) == (hits, misses)
+        assert interpreter.printed == printed
+    # a program with errors is not cached
+    interpreter = Plox.Plox(is_a_test=True, cache=True)
+    interpreter.load('return 1;', filename)
+    assert Plox.Plox(is_a_test=True, cache=True).astCache.load(filename, 'return 1;') == None
+
+def test_ast_cache_unreadable(tmp_path) :
+    filename = str(tmp_path / 'program.lox')
+    source = 'print 1 + 2;'
+    interpreter = Plox.Plox(is_a_test=True, cache=True)
+    interpreter.interpret(interpreter.load(source, filename))
+    # a valid header followed by a pickle importing a module which doesn't exist
+    with open(interpreter.astCache.path(filename), 'wb') as file :
+        file.write(interpreter.astCache.header(source) + b'cnosuchmodule\nthing\n.')
+    interpreter = Plox.Plox(is_a_test=True, cache=True)
+    interpreter.interpret(interpreter.load(source, filename))
+    assert (interpreter.astCache.hits, interpreter.astCache.misses) == (0, 1)
+    assert interpreter.printed == [3.0]
\ No newline at end of file
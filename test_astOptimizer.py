@@ -0,0 +1,85 @@
+#  pytest  -vv
+from __future__ import annotations
+import Plox.Plox as Plox
+import Plox.Expr as Expr
+import Plox.Stmt as Stmt
+
+
+def scan_and_parse_and_optimize(content: str) -> Plox.Plox :
+    interpreter = Plox.Plox(is_a_test=True, optimize=True)
+    for i, line in enumerate(content.split('\n')) :
+        interpreter.scanner.scan(i, line)
+
+    interpreter.parser.parse()
+    interpreter.astResolver.resolve(interpreter.parser.statements)
+    return interpreter
+
+def run_with_and_without_optimizer(content: str) -> list :
+    """the optimized program must print exactly what the original one prints"""
+    optimized = scan_and_parse_and_optimize(content)
+    optimized.interpret(optimized.parser.statements)
+
+    original = Plox.Plox(is_a_test=True)
+    for i, line in enumerate(content.split('\n')) :
+        original.scanner.scan(i, line)
+    original.parser.parse()
+    original.astResolver.resolve(original.parser.statements)
+    original.interpret(original.parser.statements)
+
+    result = optimized.error_handler.astInterpreter_errors + optimized.printed
+    assert [str(s) for s in result] == [str(s) for s in original.error_handler.astInterpreter_errors + original.printed]
+    return result
+
+
+def test_fold_expressions() :
+    interpreter = scan_and_parse_and_optimize(content="""
+        print 1 + 2 * (3 - 1);
+        print "a" + "b";
+        print -(2 * 2);
+        print !true;
+        print false or "default";
+        print 1 < 2 and "both";
+        print 1 / 0;
+    """)
+    statements = interpreter.astOptimizer.optimize(interpreter.parser.statements)
+    values = [statement.expression.value for statement in statements[:6]]
+    assert values == [5.0, 'ab', -4.0, -1, 'default', 'both']
+    # the division by zero is left to raise at runtime
+    assert type(statements[6].expression) == Expr.Binary
+
+def test_prune_dead_code() :
+    interpreter = scan_and_parse_and_optimize(content="""
+        if (1 > 2) print "never";
+        if (true) print "always"; else print "never";
+        while (false) print "never";
+        while (1 == 2) { print "never"; }
+    """)
+    statements = interpreter.astOptimizer.optimize(interpreter.parser.statements)
+    assert len(statements) == 1
+    assert type(statements[0]) == Stmt.Print
+    assert interpreter.astOptimizer.pruned == 4
+
+def test_optimized_program_keeps_its_scopes() :
+    ast_str = run_with_and_without_optimizer(content="""
+        var a = "global";
+        {
+            var b = "outer " + "b";
+            if (true) {
+                var c = 1 + 1;
+                fun show() {
+                    print a;
+                    print b;
+                    print c;
+                }
+                show();
+            }
+            if (false) { var d = 1; }
+            var e = "after";
+            print e;
+        }
+        for (var i = 0; i < 2 * 1; i = i + 1) {
+            if (!false) print i;
+        }
+    """)
+    EXPECTED = ['global', 'outer b', 2.0, 'after', 0.0, 1.0]
+    assert ast_str == EXPECTED
@@ -0,0 +1,173 @@
+#  pytest  -vv
+from __future__ import annotations
+import Plox.Plox as Plox
+
+
+def scan_and_parse_and_run(content: str, backend: str = 'closure')  -> list:
+    interpreter = Plox.Plox(is_a_test=True, backend=backend)
+    for i, line in enumerate(content.split('\n')) :
+        interpreter.scanner.scan(i, line)
+
+    interpreter.parser.parse()
+    interpreter.astResolver.resolve(interpreter.parser.statements)
+    interpreter.interpret(interpreter.parser.statements)
+    return interpreter.error_handler.astInterpreter_errors + interpreter.printed
+
+def run_on_both_backends(content: str) -> list :
+    """the closure compiled program must print exactly what the tree-walk interpreter prints"""
+    compiled = scan_and_parse_and_run(content, 'closure')
+    assert [str(s) for s in compiled] == [str(s) for s in scan_and_parse_and_run(content, 'ast')]
+    return compiled
+
+
+def test_operators() :
+    ast_str = run_on_both_backends(content="""
+        var a = 3;
+        print a + 1;
+        print 10 - a;
+        print a * a / 2;
+        print a > 1;
+        print a >= 4;
+        print a == 3;
+        print a != 3;
+        print -a;
+        print false or "default";
+        print a and "both";
+    """)
+    EXPECTED = [4.0, 7.0, 4.5, True, False, True, False, -3.0, 'default', 'both']
+    assert ast_str == EXPECTED
+
+def test_scope() :
+    ast_str = run_on_both_backends(content="""
+        var a = "global a";
+        var b = "global b";
+        {
+            var a = "outer a";
+            {
+                var a = "inner a";
+                print a;
+                print b;
+                a = "inner a again";
+                b = "changed b";
+                print a;
+            }
+            print a;
+        }
+        print b;
+    """)
+    EXPECTED = ['inner a', 'global b', 'inner a again', 'outer a', 'changed b']
+    assert ast_str == EXPECTED
+
+def test_loop_and_recursion() :
+    ast_str = run_on_both_backends(content="""
+        fun fib(n) {
+            if (n <= 1) return n;
+            return fib(n - 2) + fib(n - 1);
+        }
+
+        for (var i = 0; i < 10; i = i + 1) {
+            print fib(i);
+        }
+    """)
+    EXPECTED = [0., 1., 1., 2., 3., 5., 8., 13., 21., 34.]
+    assert ast_str == EXPECTED
+
+def test_closure() :
+    ast_str = run_on_both_backends(content="""
+        fun makeCounter() {
+            var i = 0;
+            fun count() {
+                i = i + 1;
+                return i;
+            }
+
+            return count;
+        }
+
+        var counter = makeCounter();
+        print counter();
+        print counter();
+        var other = makeCounter();
+        print other();
+    """)
+    EXPECTED = [1., 2., 1.]
+    assert ast_str == EXPECTED
+
+def test_class_inheritance_super() :
+    ast_str = run_on_both_backends(content="""
+        class Doughnut {
+            init(filling) {
+                this.filling = filling;
+            }
+            cook() {
+                return "Fry until golden brown.";
+            }
+        }
+
+        class BostonCream < Doughnut {
+            cook() {
+                return super.cook() + " Pipe full of " + this.filling + ".";
+            }
+        }
+
+        var cream = BostonCream("custard");
+        print cream.cook();
+        var cook = cream.cook;
+        print cook();
+    """)
+    EXPECTED = ["Fry until golden brown. Pipe full of custard.", "Fry until golden brown. Pipe full of custard."]
+    assert ast_str == EXPECTED
+
+def test_native_array() :
+    ast_str = run_on_both_backends(content="""
+        var array = Array(3);
+        print array.length;
+        array.set(1, "new");
+        print array.get(1);
+    """)
+    EXPECTED = [3, 'new']
+    assert ast_str == EXPECTED
+
+def test_runtime_errors() :
+    ast_str = run_on_both_backends(content="""
+        var NotAClass = "I am totally not a class";
+        class Subclass < NotAClass {}
+    """)
+    EXPECTED = ["SuperClass must be a class"]
+    assert [str(s) for s in ast_str] == EXPECTED
+
+def test_return_completion() :
+    ast_str = run_on_both_backends(content="""
+        fun find(n) {
+            var i = 0;
+            while (i < 100) {
+                if (i == n) { { return i * 2; } }
+                i = i + 1;
+            }
+            return -1;
+        }
+        print find(7);
+        print find(200);
+        fun noReturn() { 1 + 2; }
+        print noReturn();
+        fun early() {
+            for (var i = 0; i < 3; i = i + 1) {
+                if (i == 1) return "out";
+                print i;
+            }
+        }
+        print early();
+    """)
+    EXPECTED = [14.0, -1.0, None, 0.0, 'out']
+    assert ast_str == EXPECTED
+
+def test_initializer_returning_early() :
+    ast_str = run_on_both_backends(content="""
+        class A { init(x) { this.x = x; if (x > 1) return; this.x = 0; } }
+        var a = A(2);
+        print a.x;
+        print a.init(3);
+        print a.x;
+        print A(1).x;
+    """)
+    assert [str(s) for s in ast_str] == ['2.0', 'A instance', '3.0', '0.0']
\ No newline at end of file
@@ -0,0 +1,54 @@
+#  pytest  -vv
+from __future__ import annotations
+import Plox.Plox as Plox
+import Plox.ExecutionCounts as ExecutionCounts
+from Plox.AstInterpreter import AstInterpreter
+import json
+
+
+def test_execution_counts() :
+    source = """
+        class Circle { area() { return 3; } }
+        class Square { area() { return 4; } }
+        var shapes = Array(2);
+        shapes.set(0, Circle());
+        shapes.set(1, Square());
+        for (var i = 0; i < 2; i = i + 1) print shapes.get(i).area() * 2;
+    """
+    interpreter = Plox.Plox(is_a_test=True, count=True)
+    interpreter.interpret(interpreter.load(source, 'shapes.lox'))
+    assert interpreter.printed == [6, 8]
+    counts = interpreter.executionCounts.asDict()
+    assert counts['receivers']['shapes.lox:7:56 .get'] == ['LoxArray']
+    assert counts['receivers']['shapes.lox:7:63 .area'] == ['Circle', 'Square']
+    locations = counts['locations']
+    assert locations['shapes.lox:7']['operators'] == {'<': 3, '+': 2, '*': 2}
+    assert locations['shapes.lox:7']['globals'] == {'shapes': 2}
+    assert locations['shapes.lox:2']['visits'] == {'visitClassStmt': 1, 'visitReturnStmt': 1, 'visitLiteral': 1}
+    # the counts of several runs add up, through JSON
+    report = json.loads(json.dumps(counts))
+    merged = ExecutionCounts.merge([report, report])
+    assert merged['locations']['shapes.lox:7']['operators'] == {'<': 6, '+': 4, '*': 4}
+    assert merged['receivers'] == counts['receivers']
+    assert 'shapes.lox:7:63 .area' in interpreter.executionCounts.report()
+    assert not hasattr(AstInterpreter.execute, '__wrapped__')
+
+def test_execution_counts_keep_each_get_site() :
+    source = """
+        class A { init() { this.x = 1; } }
+        class B { init() { this.x = 2; } }
+        var a = A();
+        var b = B();
+        print a.x + b.x;
+    """
+    interpreter = Plox.Plox(is_a_test=True, count=True)
+    interpreter.interpret(interpreter.load(source, 'sites.lox'))
+    assert interpreter.printed == [3]
+    assert interpreter.executionCounts.asDict()['receivers'] == {'sites.lox:6:17 .x': ['A'], 'sites.lox:6:23 .x': ['B']}
+    # the interpreters without the instrumentation are not observed
+    visits = interpreter.executionCounts.totals('visits')
+    other = Plox.Plox(is_a_test=True)
+    other.interpret(other.load(source))
+    assert other.printed == [3]
+    assert interpreter.executionCounts.totals('visits') == visits
+    assert 'execute' in vars(interpreter.executor) and 'execute' not in vars(other.executor)
\ No newline at end of file
@@ -0,0 +1,43 @@
+#  pytest  -vv
+from __future__ import annotations
+import Plox.Plox as Plox
+import pytest
+
+
+def test_profile() :
+    source = """
+        fun fib(n) {
+            if (n < 2) return n;
+            return fib(n - 1) + fib(n - 2);
+        }
+        class A {
+            init(x) { this.x = x; }
+            get() { return fib(this.x); }
+        }
+        print A(5).get();
+    """
+    for backend in ('ast', 'closure') :
+        interpreter = Plox.Plox(is_a_test=True, backend=backend, profile=True)
+        interpreter.interpret(interpreter.load(source))
+        assert interpreter.printed == [5]
+        calls = {name: (calls, ns <= cumulative) for name, calls, ns, cumulative in interpreter.profiler.entries()}
+        assert calls == {'fib:2': (15, True), 'init:7': (1, True), 'get:8': (1, True)}
+        stacks = [line.rsplit(' ', 1)[0] for line in interpreter.profiler.folded().split('\n')]
+        assert all(stack.startswith('<script>') for stack in stacks)
+        assert all(stack.startswith('<script>;get:8;fib:2') for stack in stacks if 'fib' in stack)
+        assert 'get:8' in interpreter.profiler.report()
+    with pytest.raises(ValueError) :
+        Plox.Plox(backend='vm', profile=True)
+
+def test_profile_recursion_and_errors() :
+    interpreter = Plox.Plox(is_a_test=True, profile=True)
+    interpreter.interpret(interpreter.load("""
+        fun count(n) { if (n == 0) return nope; return count(n - 1); }
+        count(3);
+    """))
+    # the stack is unwound by the exception, a recursive function counts its time once in the cumulative one
+    assert len(interpreter.error_handler.astInterpreter_errors) == 1
+    assert interpreter.profiler.stack == []
+    [(name, calls, ns, cumulative)] = interpreter.profiler.entries()
+    assert (name, calls) == ('count:2', 4)
+    assert ns <= cumulative
\ No newline at end of file
@@ -0,0 +1,181 @@
+#  pytest  -vv
+from __future__ import annotations
+import Plox.Plox as Plox
+
+
+def scan_and_parse_and_run(content: str, backend: str = 'python')  -> list:
+    interpreter = Plox.Plox(is_a_test=True, backend=backend)
+    for i, line in enumerate(content.split('\n')) :
+        interpreter.scanner.scan(i, line)
+
+    interpreter.parser.parse()
+    interpreter.astResolver.resolve(interpreter.parser.statements)
+    interpreter.interpret(interpreter.parser.statements)
+    return interpreter.error_handler.astInterpreter_errors + interpreter.printed
+
+def run_on_both_backends(content: str) -> list :
+    """the transpiled program must print exactly what the tree-walk interpreter prints"""
+    transpiled = scan_and_parse_and_run(content, 'python')
+    assert [str(s) for s in transpiled] == [str(s) for s in scan_and_parse_and_run(content, 'ast')]
+    return transpiled
+
+
+def test_operators() :
+    ast_str = run_on_both_backends(content="""
+        var a = 3;
+        print a + 1;
+        print a * a / 2 - 1;
+        print a >= 4;
+        print a != 3;
+        print -a;
+        print !a;
+        print false or "default";
+        print a and "both";
+        print "it's" + " quoted";
+    """)
+    EXPECTED = [4.0, 3.5, False, False, -3.0, -1, 'default', 'both', "it's quoted"]
+    assert ast_str == EXPECTED
+
+def test_scope_and_assignment() :
+    ast_str = run_on_both_backends(content="""
+        var a = "global a";
+        {
+            var a = "outer a";
+            {
+                var a = "inner a";
+                print a;
+                a = "inner a again";
+                print a;
+            }
+            print a;
+            var b;
+            var c = (b = 5) + 1;
+            print b;
+            print c;
+        }
+        a = "changed a";
+        print a;
+    """)
+    EXPECTED = ['inner a', 'inner a again', 'outer a', 5.0, 6.0, 'changed a']
+    assert ast_str == EXPECTED
+
+def test_loop_and_recursion() :
+    ast_str = run_on_both_backends(content="""
+        fun fib(n) {
+            if (n <= 1) return n;
+            return fib(n - 2) + fib(n - 1);
+        }
+
+        for (var i = 0; i < 10; i = i + 1) {
+            print fib(i);
+        }
+    """)
+    EXPECTED = [0., 1., 1., 2., 3., 5., 8., 13., 21., 34.]
+    assert ast_str == EXPECTED
+
+def test_closures() :
+    ast_str = run_on_both_backends(content="""
+        fun makeCounter() {
+            var i = 0;
+            fun count() {
+                i = i + 1;
+                return i;
+            }
+
+            return count;
+        }
+
+        var counter = makeCounter();
+        print counter();
+        print counter();
+
+        var fns = Array(3);
+        for (var i = 0; i < 3; i = i + 1) {
+            var j = i;
+            fun f() { return j; }
+            fns.set(i, f);
+        }
+        print fns.get(0)();
+        print fns.get(2)();
+
+        {
+            var late = 1;
+            fun readLate() { return late; }
+            late = 2;
+            print readLate();
+            fun countDown(n) {
+                if (n == 0) return "done";
+                return countDown(n - 1);
+            }
+            print countDown(3);
+        }
+    """)
+    EXPECTED = [1., 2., 0., 2., 2., 'done']
+    assert ast_str == EXPECTED
+
+def test_class_inheritance_super() :
+    ast_str = run_on_both_backends(content="""
+        class Doughnut {
+            init(filling) {
+                this.filling = filling;
+            }
+            cook() {
+                return "Fry until golden brown.";
+            }
+        }
+
+        class BostonCream < Doughnut {
+            cook() {
+                fun nested() {
+                    return super.cook() + " Pipe full of " + this.filling + ".";
+                }
+                return nested();
+            }
+        }
+
+        var cream = BostonCream("custard");
+        print cream.cook();
+        var cook = cream.cook;
+        print cook();
+        print cream;
+    """)
+    EXPECTED = ["Fry until golden brown. Pipe full of custard.", "Fry until golden brown. Pipe full of custard."]
+    assert ast_str[:2] == EXPECTED
+    assert str(ast_str[2]) == 'BostonCream instance'
+
+def test_runtime_errors() :
+    ast_str = run_on_both_backends(content="""
+        var NotAClass = "I am totally not a class";
+        class Subclass < NotAClass {}
+    """)
+    EXPECTED = ["SuperClass must be a class"]
+    assert [str(s) for s in ast_str] == EXPECTED
+
+    ast_str = run_on_both_backends(content="""
+        print notDefined;
+    """)
+    EXPECTED = ["(IDENTIFIER notDefined None, \"Undefined variable ' notDefined '.\")"]
+    assert [str(s) for s in ast_str] == EXPECTED
+
+def test_generated_source() :
+    interpreter = Plox.Plox(is_a_test=True, backend='python')
+    interpreter.scanner.scan(0, 'fun add(a, b) { return a + b; } print add(1, 2);')
+    interpreter.parser.parse()
+    # the transpiler reads the depth and slot the resolver stores on the variables
+    interpreter.astResolver.resolve(interpreter.parser.statements)
+    source = interpreter.executor.transpile(interpreter.parser.statements)
+    assert source.startswith('def _main() :')
+    assert "_G['add'] = _PyFunction('add'" in source
+    assert 'return (a_1 + b_2)' in source
+    compile(source, '<lox>', 'exec')
+
+def test_shared_parameter_tokens() :
+    # the parser shares the Token of every 'state' and every 'super' of a line, the declarations can't be found by token
+    ast_str = run_on_both_backends(content="""
+        class A { init(state) { this.state = state; } get() { return this.state; } }
+        class B < A { init(state) { super.init(state + 1); } get() { return super.get() * 10; } }
+        class C < A { init(state) { super.init(state + 2); } get() { return super.get() * 100; } }
+        fun twice(state) { return state * 2; }
+        print B(1).get() + C(1).get() + twice(4);
+    """)
+    assert ast_str == [328.0]
\ No newline at end of file
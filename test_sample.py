@@ -0,0 +1,36 @@
+#  pytest  -vv
+from __future__ import annotations
+import Plox.Plox as Plox
+from Plox.Profiler import frameName
+import pytest
+import threading
+
+
+def test_sample() :
+    source = """
+        fun fib(n) {
+            if (n < 2) return n;
+            return fib(n - 1) + fib(n - 2);
+        }
+        print fib(20);
+    """
+    def run(sampled: list) :
+        interpreter = Plox.Plox(is_a_test=True, sample=0.001)
+        interpreter.interpret(interpreter.load(source))
+        sampled.append(interpreter.sampler)
+    sampled = []
+    run(sampled)
+    # sampled by a thread when not run by the main thread
+    thread = threading.Thread(target=run, args=(sampled,))
+    thread.start()
+    thread.join()
+    for sampler in sampled :
+        assert sampler.samples > 0
+        assert set(sampler.lines) <= {3, 4}
+        assert sampler.linesTotal[6] == sampler.samples
+        assert [frameName(declaration) for declaration in sampler.functions] == ['fib:2']
+        assert all(line.startswith('<script>;fib:2') for line in sampler.folded().split('\n'))
+        assert '    print fib(20);' in sampler.annotate(source)
+        assert 'fib:2' in sampler.report()
+    with pytest.raises(ValueError) :
+        Plox.Plox(backend='closure', sample=0.001)
\ No newline at end of file
@@ -0,0 +1,45 @@
+#  pytest  -vv
+from __future__ import annotations
+import Plox.Plox as Plox
+from Plox.Natives import globals
+
+
+def test_snapshot(tmp_path) :
+    prelude = """
+        class Counter {
+            init(start) { this.count = start; }
+            next() { this.count = this.count + 1; return this.count; }
+        }
+        class Twice < Counter {
+            next() { super.next(); return super.next(); }
+        }
+        fun makeFib() {
+            fun fib(n) { if (n < 2) return n; return fib(n - 1) + fib(n - 2); }
+            return fib;
+        }
+        var fib = makeFib();
+        var counter = Twice(10);
+        var counters = Array(1);
+        counters.set(0, counter);
+    """
+    job = "print fib(10); print counter.next(); print counters.get(0).next(); print clock() > 0;"
+    # the globals are shared by all the interpreters : start from the native functions only, and give the other tests back theirs
+    saved = dict(globals.values)
+    globals.values.clear()
+    globals.values.update((name, saved[name]) for name in ('clock', 'Array'))
+    try :
+        for backend in ('ast', 'closure', 'vm') :
+            path = str(tmp_path / f'{backend}.snapshot')
+            interpreter = Plox.Plox(is_a_test=True, backend=backend)
+            interpreter.interpret(interpreter.load(prelude))
+            interpreter.saveSnapshot(path)
+            globals.values.clear()
+
+            interpreter = Plox.Plox(is_a_test=True, backend=backend)
+            interpreter.loadSnapshot(path)
+            interpreter.interpret(interpreter.load(job))
+            assert interpreter.error_handler.astInterpreter_errors == []
+            assert interpreter.printed == [55.0, 12.0, 14.0, True]
+    finally :
+        globals.values.clear()
+        globals.values.update(saved)
\ No newline at end of file
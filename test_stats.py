@@ -0,0 +1,45 @@
+#  pytest  -vv
+from __future__ import annotations
+import Plox.Plox as Plox
+
+
+def test_stats() :
+    source = """
+        class Point { init(x) { this.x = x; } }
+        fun make(n) { var point = Point(n); return point.x; }
+        for (var i = 0; i < 3; i = i + 1) print make(i);
+        print nope;
+    """
+    for backend in ('ast', 'closure', 'vm') :
+        interpreter = Plox.Plox(is_a_test=True, backend=backend, stats=True)
+        interpreter.interpret(interpreter.load(source))
+        stats = interpreter.statistics()
+        assert list(stats['phases']) == ['scan', 'parse', 'resolve', 'interpret']
+        assert stats['phases']['interpret']['wall'] > 0
+        counters = stats['counters']
+        assert (counters['tokens'], counters['nodes'], counters['resolved locals']) == (63, 33, 8)
+        assert (counters['calls'], counters['instances'], counters['exceptions'], counters['errors']) == (6, 3, 1, 0)
+        # the for loop, its body three times, make and init three times, the VM uses its own frames
+        assert counters['environments'] == (0 if backend == 'vm' else 10)
+    assert Plox.Plox(is_a_test=True).statistics() == None
+
+def test_stats_errors() :
+    interpreter = Plox.Plox(is_a_test=True, stats=True)
+    interpreter.interpret(interpreter.load("var a = ;\nprint -a;"))
+    interpreter.interpret(interpreter.load("print nope;"))
+    counters = interpreter.statistics()['counters']
+    # the syntax error, then the runtime exceptions of each run
+    assert (counters['errors'], counters['exceptions']) == (1, 2)
+
+def test_stats_observe_their_interpreter_only() :
+    observed = Plox.Plox(is_a_test=True, stats=True)
+    other = Plox.Plox(is_a_test=True)
+    assert observed.executor.observer is observed.stats
+    assert other.executor.observer == None
+    source = "fun f() { { var a = 1; } } f();"
+    # the other interpreter runs while the stats count
+    with observed.stats.counting(observed.executor) :
+        other.interpret(other.load(source))
+    observed.interpret(observed.load(source))
+    # the call, its environment and the one of the block
+    assert (observed.stats.counters['calls'], observed.stats.counters['environments']) == (1, 2)
\ No newline at end of file
@@ -0,0 +1,322 @@
+#  pytest  -vv
+from __future__ import annotations
+import Plox.Plox as Plox
+from Plox.BytecodeCompiler import BytecodeCompiler
+from Plox.Bytecode import disassemble
+
+
+def scan_and_parse_and_run(content: str, backend: str = 'vm')  -> list:
+    interpreter = Plox.Plox(is_a_test=True, backend=backend)
+    for i, line in enumerate(content.split('\n')) :
+        interpreter.scanner.scan(i, line)
+
+    interpreter.parser.parse()
+    interpreter.astResolver.resolve(interpreter.parser.statements)
+    interpreter.interpret(interpreter.parser.statements)
+    return interpreter.error_handler.astInterpreter_errors + interpreter.printed
+
+def run_on_both_backends(content: str) -> list :
+    """the VM must print exactly what the tree-walk interpreter prints"""
+    on_vm = scan_and_parse_and_run(content, 'vm')
+    assert [str(s) for s in on_vm] == [str(s) for s in scan_and_parse_and_run(content, 'ast')]
+    return on_vm
+
+
+def test_arithmetic_and_logic() :
+    ast_str = run_on_both_backends(content="""
+        print 1 + 2 * 3 - 4 / 2;
+        print (1 + 2) * 3;
+        print "a" + "b";
+        print 1 < 2;
+        print 2 <= 1;
+        print 1 == 1;
+        print "a" != "a";
+        print -4;
+        print true and "right";
+        print false or "right";
+        print false and "right";
+    """)
+    EXPECTED = [5.0, 9.0, 'ab', True, False, True, False, -4.0, 'right', 'right', False]
+    assert ast_str == EXPECTED
+
+def test_scope() :
+    ast_str = run_on_both_backends(content="""
+        var a = "global a";
+        var b = "global b";
+        {
+            var a = "outer a";
+            {
+                var a = "inner a";
+                print a;
+                print b;
+            }
+            print a;
+        }
+        print a;
+    """)
+    EXPECTED = ['inner a', 'global b', 'outer a', 'global a']
+    assert ast_str == EXPECTED
+
+def test_recursion() :
+    ast_str = run_on_both_backends(content="""
+        fun fib(n) {
+            if (n <= 1) return n;
+            return fib(n - 2) + fib(n - 1);
+        }
+
+        for (var i = 0; i < 10; i = i + 1) {
+            print fib(i);
+        }
+    """)
+    EXPECTED = [0., 1., 1., 2., 3., 5., 8., 13., 21., 34.]
+    assert ast_str == EXPECTED
+
+def test_deep_recursion_does_not_use_the_python_stack() :
+    ast_str = scan_and_parse_and_run(content="""
+        fun count(n) {
+            if (n == 0) return 0;
+            return 1 + count(n - 1);
+        }
+        print count(5000);
+    """)
+    EXPECTED = [5000.]
+    assert ast_str == EXPECTED
+
+def test_deep_recursion_on_the_other_backends_points_to_the_vm() :
+    for backend in ('ast', 'closure', 'python') :
+        printed = scan_and_parse_and_run(content="""
+            fun count(n) {
+                if (n == 0) return 0;
+                return 1 + count(n - 1);
+            }
+            print count(3000);
+        """, backend=backend)
+        assert len(printed) == 1
+        assert type(printed[0]) == RecursionError
+        assert '--backend=vm' in str(printed[0])
+
+def test_frame_stats() :
+    interpreter = Plox.Plox(is_a_test=True, backend='vm', stats=True)
+    interpreter.interpret(interpreter.load("""
+        fun count(n) {
+            if (n == 0) return 0;
+            return 1 + count(n - 1);
+        }
+        print count(10);
+    """))
+    counters = interpreter.statistics()['counters']
+    # the script and the eleven calls of count, all nested
+    assert (counters['frames pushed'], counters['max depth']) == (12, 12)
+    assert 'max depth' in interpreter.stats.report()
+    interpreter = Plox.Plox(is_a_test=True, backend='ast', stats=True)
+    interpreter.interpret(interpreter.load("print 1;"))
+    assert interpreter.statistics()['counters']['max depth'] == None
+
+def test_tail_calls_reuse_the_frame() :
+    interpreter = Plox.Plox(is_a_test=True, backend='vm')
+    interpreter.scanner.scan(0, """
+        fun loop(n, acc) {
+            if (n == 0) return acc;
+            return loop(n - 1, acc + 1);
+        }
+        print loop(100000, 0);
+        class Countdown {
+            down(n) {
+                if (n == 0) return "done";
+                return this.down(n - 1);
+            }
+        }
+        print Countdown().down(100000);
+        fun count(n) {
+            if (n == 0) return 0;
+            return 1 + count(n - 1);
+        }
+        print count(50);
+    """)
+    interpreter.parser.parse()
+    interpreter.astResolver.resolve(interpreter.parser.statements)
+    interpreter.interpret(interpreter.parser.statements)
+    assert interpreter.printed == [100000., 'done', 50.]
+    stats = interpreter.executor.frameStats
+    assert stats['tail calls'] == 200000
+    # the script, the first call of each tail recursion and the 51 frames of count
+    assert stats['pushed'] == 1 + 2 + 51
+    assert stats['max depth'] == 52
+
+def test_closure_counter() :
+    ast_str = run_on_both_backends(content="""
+        fun makeCounter() {
+            var i = 0;
+            fun count() {
+                i = i + 1;
+                print i;
+            }
+
+            return count;
+        }
+
+        var counter = makeCounter();
+        counter();
+        counter();
+    """)
+    EXPECTED = [1., 2.]
+    assert ast_str == EXPECTED
+
+def test_closure_captures_each_loop_variable() :
+    ast_str = run_on_both_backends(content="""
+        var fns = Array(3);
+        for (var i = 0; i < 3; i = i + 1) {
+            var j = i;
+            fun f() { return j; }
+            fns.set(i, f);
+        }
+        print fns.get(0)();
+        print fns.get(1)();
+        print fns.get(2)();
+    """)
+    EXPECTED = [0., 1., 2.]
+    assert ast_str == EXPECTED
+
+def test_closure_and_scope() :
+    ast_str = run_on_both_backends(content="""
+        var a = "global";
+        {
+            fun showA() {
+                print a;
+            }
+
+            showA();
+            var a = "block";
+            showA();
+        }
+    """)
+    EXPECTED = ["global", "global"]
+    assert ast_str == EXPECTED
+
+def test_class_initializer_and_methods() :
+    ast_str = run_on_both_backends(content="""
+        class Point {
+            init(x, y) {
+                this.x = x;
+                this.y = y;
+            }
+            sum() {
+                return this.x + this.y;
+            }
+        }
+        var p = Point(1, 2);
+        print p.sum();
+        var sum = p.sum;
+        p.x = 10;
+        print sum();
+        print p;
+    """)
+    EXPECTED = [3., 12.]
+    assert ast_str[:2] == EXPECTED
+    assert str(ast_str[2]) == 'Point instance'
+
+def test_class_inheritance_super() :
+    ast_str = run_on_both_backends(content="""
+        class A {
+            method() {
+                return "A method";
+            }
+        }
+
+        class B < A {
+            method() {
+                fun nested() {
+                    return "B then " + super.method();
+                }
+                return nested();
+            }
+        }
+
+        class C < B {}
+
+        print C().method();
+    """)
+    EXPECTED = ["B then A method"]
+    assert ast_str == EXPECTED
+
+def test_field_holding_a_function() :
+    ast_str = run_on_both_backends(content="""
+        class Box {}
+
+        fun notMethod(argument) {
+            return "called function with " + argument;
+        }
+
+        var box = Box();
+        box.function = notMethod;
+        print box.function("argument");
+    """)
+    EXPECTED = ["called function with argument"]
+    assert ast_str == EXPECTED
+
+def test_native_array() :
+    ast_str = run_on_both_backends(content="""
+        var array = Array(3);
+        print array.length;
+        array.set(1, "new");
+        print array.get(1);
+    """)
+    EXPECTED = [3, 'new']
+    assert ast_str == EXPECTED
+
+def test_runtime_errors() :
+    ast_str = run_on_both_backends(content="""
+        var NotAClass = "I am totally not a class";
+        class Subclass < NotAClass {}
+    """)
+    EXPECTED = ["SuperClass must be a class"]
+    assert [str(s) for s in ast_str] == EXPECTED
+
+def test_call_errors_carry_the_parenthesis() :
+    for content in ("fun f(a) {}\nf(1, 2);", "class A { init(a) {} }\nA();", "class A { m(a) {} }\nA().m();", "var s = 1;\ns();", "\nclock(1);") :
+        on_vm = scan_and_parse_and_run(content, 'vm')
+        on_ast = scan_and_parse_and_run(content, 'ast')
+        paren = on_vm[0].args[0]
+        assert (paren.type, paren.line) == ('RIGHT_PAREN', 2)
+        if 'arguments' in on_vm[0].args[1] :
+            assert (paren.type, paren.line) == (on_ast[0].args[0].type, on_ast[0].args[0].line)
+
+def test_disassemble() :
+    interpreter = Plox.Plox(is_a_test=True, backend='vm')
+    interpreter.scanner.scan(0, 'fun add(a, b) { return a + b; } print add(1, 2);')
+    interpreter.astResolver.resolve(interpreter.parser.parse())
+    listing = disassemble(BytecodeCompiler().compile(interpreter.parser.statements))
+    assert 'CLOSURE' in listing
+    assert '== add ==' in listing
+    assert 'GET_LOCAL' in listing
+
+def test_assignment_statements_store_without_pop() :
+    content = """
+        class Box {}
+        var box = Box();
+        var total = 0;
+        fun add(amount) {
+            var counted = amount;
+            counted = counted + 1;
+            box.last = total = total + counted;
+        }
+        add(1);
+        add(2);
+        print total;
+        print box.last;
+        print (box.first = 5) + (total = 1);
+    """
+    assert run_on_both_backends(content) == [5.0, 5.0, 6.0]
+    interpreter = Plox.Plox(is_a_test=True, backend='vm')
+    listing = disassemble(BytecodeCompiler().compile(interpreter.load(content)))
+    assert 'STORE_LOCAL' in listing and 'STORE_PROPERTY' in listing and 'SET_GLOBAL' in listing
+    assert 'POP' not in listing.split('== add ==')[1]
+
+def test_signed_zero_constants() :
+    # folded by the optimizer, -0 and 0 are two constants of the chunk
+    printed = []
+    for backend in ('ast', 'vm') :
+        interpreter = Plox.Plox(is_a_test=True, backend=backend, optimize=True)
+        interpreter.interpret(interpreter.load("print -0; print 0;"))
+        printed.append([str(value) for value in interpreter.printed])
+    assert printed == [['-0.0', '0.0'], ['-0.0', '0.0']]
\ No newline at end of file